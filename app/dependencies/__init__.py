@@ -2,12 +2,17 @@ from functools import lru_cache
 from fastapi import Depends, HTTPException, Request
 
 from app.settings import Settings
+from domain.repositories.menu_repository import MenuRepository
+from infrastructure.repositories.menu_repository_cached import CachedMenuRepository
 from infrastructure.repositories.menu_repository_mongo import MenuRepositoryMongo
 from infrastructure.repositories.telegram_binding_repository_mongo import TelegramBindingRepositoryMongo
+from infrastructure.repositories.telegram_update_queue_mongo import TelegramUpdateQueueMongo
 from infrastructure.repositories.tenant_repository_mongo import TenantRepositoryMongo
+from services.arrivals_service import ArrivalsService
+from services.display_snapshot import DisplaySnapshotService
+from services.display_stream import DisplayStreamHub
 from services.emt_madrid_service import EmtMadridService
 from services.menu_service import MenuService
-from services.telegram_service import TelegramService
 from services.tenant_service import TenantService
 from services.weather_service import WeatherService
 
@@ -21,8 +26,13 @@ def get_tenant_repository(request: Request) -> TenantRepositoryMongo:
     return TenantRepositoryMongo(request.app.state.db)
 
 
-def get_menu_repository(request: Request) -> MenuRepositoryMongo:
-    return MenuRepositoryMongo(request.app.state.db)
+def get_menu_repository(
+    request: Request,
+    settings: Settings = Depends(get_settings),
+) -> MenuRepository:
+    return CachedMenuRepository(
+        MenuRepositoryMongo(request.app.state.db), request.app.state.shared_cache, settings
+    )
 
 
 def get_binding_repository(request: Request) -> TelegramBindingRepositoryMongo:
@@ -30,41 +40,43 @@ def get_binding_repository(request: Request) -> TelegramBindingRepositoryMongo:
 
 
 def get_tenant_service(
+    request: Request,
     repo: TenantRepositoryMongo = Depends(get_tenant_repository),
     settings: Settings = Depends(get_settings),
 ) -> TenantService:
-    return TenantService(repo, settings)
+    return TenantService(
+        repo, settings, request.app.state.tenant_cache, request.app.state.shared_cache
+    )
 
 
 def get_menu_service(
-    menu_repo: MenuRepositoryMongo = Depends(get_menu_repository),
+    menu_repo: MenuRepository = Depends(get_menu_repository),
     tenant_repo: TenantRepositoryMongo = Depends(get_tenant_repository),
 ) -> MenuService:
     return MenuService(menu_repo, tenant_repo)
 
 
-def get_emt_service(
-    request: Request,
-    settings: Settings = Depends(get_settings),
-) -> EmtMadridService:
-    client = request.app.state.http_client
-    return EmtMadridService(client, settings)
+def get_emt_service(request: Request) -> EmtMadridService:
+    return request.app.state.emt_service
+
+
+def get_arrivals_service(request: Request) -> ArrivalsService:
+    return request.app.state.arrivals_service
 
 
 def get_weather_service(request: Request) -> WeatherService:
     return request.app.state.weather_service
 
 
-def get_telegram_service(
-    request: Request,
-    settings: Settings = Depends(get_settings),
-    tenant_repo: TenantRepositoryMongo = Depends(get_tenant_repository),
-    menu_repo: MenuRepositoryMongo = Depends(get_menu_repository),
-    binding_repo: TelegramBindingRepositoryMongo = Depends(get_binding_repository),
-) -> TelegramService:
-    client = request.app.state.telegram_client
-    if client is None:
+def get_display_snapshot_service(request: Request) -> DisplaySnapshotService:
+    return request.app.state.display_snapshots
+
+
+def get_display_stream_hub(request: Request) -> DisplayStreamHub:
+    return request.app.state.display_stream_hub
+
+
+def get_telegram_update_queue(request: Request) -> TelegramUpdateQueueMongo:
+    if request.app.state.telegram_update_worker is None:
         raise HTTPException(status_code=503, detail="Telegram client not configured")
-    tenant_service = TenantService(tenant_repo, settings)
-    menu_service = MenuService(menu_repo, tenant_repo)
-    return TelegramService(client, tenant_service, menu_service, binding_repo, settings)
+    return TelegramUpdateQueueMongo(request.app.state.db)
@@ -5,80 +5,271 @@ import asyncio
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from app.logging_config import configure_logging
 from app.settings import Settings
 from app.routes.display_routes import router as display_router
 from app.routes.tenant_api_routes import router as tenant_router
 from app.routes.telegram_routes import router as telegram_router
+from app.static_files import ImmutableStaticFiles
+from infrastructure.cache.cache_backend import build_cache_backend
+from infrastructure.clients.circuit_breaker import CircuitBreaker
 from infrastructure.clients.http_client import HttpClient
 from infrastructure.clients.openweather_client import OpenWeatherClient
+from infrastructure.clients.retry_policy import RetryPolicy
 from infrastructure.clients.telegram_client import TelegramClient
 from infrastructure.persistence.mongo import MongoManager
+from infrastructure.repositories.menu_repository_cached import CachedMenuRepository
 from infrastructure.repositories.menu_repository_mongo import MenuRepositoryMongo
 from infrastructure.repositories.telegram_binding_repository_mongo import TelegramBindingRepositoryMongo
+from infrastructure.repositories.telegram_update_queue_mongo import TelegramUpdateQueueMongo
 from infrastructure.repositories.tenant_repository_mongo import TenantRepositoryMongo
+from infrastructure.storage.upload_storage import build_upload_storage, immutable_cache_control
+from services.arrivals_poller import ArrivalsPoller
+from services.arrivals_service import ArrivalsService
+from services.cache_invalidator import CacheInvalidator
+from services.display_snapshot import DisplaySnapshotService
+from services.display_stream import DisplayStreamHub
+from services.emt_madrid_service import EmtMadridService
+from services.emt_token_manager import EmtTokenManager
+from services.image_variants import ImageVariantService
 from services.menu_service import MenuService
+from services.payload_capture import PayloadCapture
+from services.shared_cache import SharedCache
 from services.telegram_service import TelegramService
-from services.tenant_service import TenantService
+from services.telegram_update_worker import TelegramUpdateWorker
+from services.upload_service import IMAGES_PREFIX, UploadService
+from services.tenant_cache import TenantCache
+from services.tenant_service import TenantService, evict_shared_tenant
+from services.weather_refresher import WeatherRefresher
 from services.weather_service import WeatherService
 
 
+def subscribe_shared_invalidation(
+    invalidator: CacheInvalidator,
+    shared_cache: SharedCache,
+    tenant_cache: TenantCache,
+    menu_repo: CachedMenuRepository,
+    snapshots: DisplaySnapshotService,
+) -> None:
+    async def on_tenant_change(tenant_id: str | None) -> None:
+        # Drop the shared entry first so a concurrent miss cannot refill the local cache from it.
+        await evict_shared_tenant(shared_cache, tenant_id)
+        tenant_cache.evict(tenant_id)
+        snapshots.mark_dirty(tenant_id, "config")
+
+    async def on_menu_change(tenant_id: str | None) -> None:
+        await menu_repo.evict(tenant_id)
+        snapshots.mark_dirty(tenant_id, "menu")
+
+    for collection in ("tenants", "tenant_configs"):
+        invalidator.subscribe(collection, on_tenant_change)
+    for collection in ("daily_menus", "menu_images"):
+        invalidator.subscribe(collection, on_menu_change)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = Settings()
+    log_listener = configure_logging(settings)
     Path(settings.TELEGRAM_UPLOADS_DIR).mkdir(parents=True, exist_ok=True)
 
-    mongo = MongoManager(settings.MONGO_URI, settings.MONGO_DB_NAME)
+    mongo = MongoManager(
+        settings.MONGO_URI, settings.MONGO_DB_NAME, settings.TELEGRAM_QUEUE_RETENTION_SECONDS
+    )
     await mongo.init_indexes()
 
     app.state.db = mongo.db
     app.state.mongo_client = mongo.client
     app.state.settings = settings
+    app.state.tenant_cache = TenantCache(
+        settings.TENANT_CACHE_MAX_ENTRIES,
+        settings.TENANT_CACHE_TTL_SECONDS,
+    )
+    app.state.cache_backend = build_cache_backend(settings)
+    app.state.shared_cache = SharedCache(app.state.cache_backend, settings)
+    app.state.cache_invalidator = None
+    app.state.cache_invalidator_task = None
+    if settings.CACHE_INVALIDATION_ENABLED:
+        app.state.cache_invalidator = CacheInvalidator(app.state.db, settings)
     app.state.http_client = HttpClient(
         base_url=settings.EMT_BASE_URL,
         timeout_seconds=settings.EMT_TIMEOUT_SECONDS,
+        max_connections=settings.EMT_MAX_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        http2=settings.EMT_HTTP2,
+        max_concurrency=settings.EMT_MAX_CONCURRENCY,
+        circuit_breaker=CircuitBreaker(
+            "emt",
+            settings.UPSTREAM_CIRCUIT_FAILURE_THRESHOLD,
+            settings.UPSTREAM_CIRCUIT_RESET_SECONDS,
+        ),
+        retry_policy=RetryPolicy(
+            max_attempts=settings.UPSTREAM_RETRY_ATTEMPTS,
+            base_delay_seconds=settings.UPSTREAM_RETRY_BASE_DELAY_SECONDS,
+            deadline_seconds=settings.EMT_REQUEST_DEADLINE_SECONDS,
+        ),
+    )
+    app.state.payload_capture = PayloadCapture(settings.EMT_PAYLOAD_CAPTURE_SIZE)
+    app.state.emt_token_manager = EmtTokenManager(app.state.http_client, settings)
+    app.state.emt_token_task = None
+    if app.state.emt_token_manager.uses_login:
+        app.state.emt_token_task = asyncio.create_task(app.state.emt_token_manager.run())
+    app.state.emt_service = EmtMadridService(
+        app.state.http_client,
+        settings,
+        app.state.shared_cache,
+        app.state.payload_capture,
+        app.state.emt_token_manager,
     )
+    app.state.arrivals_service = ArrivalsService(app.state.emt_service, settings)
     app.state.openweather_http_client = HttpClient(
         base_url=settings.OPENWEATHER_BASE_URL,
         timeout_seconds=settings.WEATHER_TIMEOUT_SECONDS,
+        max_connections=settings.OPENWEATHER_MAX_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        http2=settings.OPENWEATHER_HTTP2,
+        max_concurrency=settings.OPENWEATHER_MAX_CONCURRENCY,
+        circuit_breaker=CircuitBreaker(
+            "openweather",
+            settings.UPSTREAM_CIRCUIT_FAILURE_THRESHOLD,
+            settings.UPSTREAM_CIRCUIT_RESET_SECONDS,
+        ),
+        retry_policy=RetryPolicy(
+            max_attempts=settings.UPSTREAM_RETRY_ATTEMPTS,
+            base_delay_seconds=settings.UPSTREAM_RETRY_BASE_DELAY_SECONDS,
+            deadline_seconds=settings.WEATHER_REQUEST_DEADLINE_SECONDS,
+        ),
+    )
+    menu_repo = CachedMenuRepository(
+        MenuRepositoryMongo(app.state.db), app.state.shared_cache, settings
     )
     app.state.openweather_client = OpenWeatherClient(app.state.openweather_http_client, settings)
-    app.state.weather_service = WeatherService(app.state.openweather_client, settings)
+    app.state.weather_service = WeatherService(
+        app.state.openweather_client, settings, app.state.shared_cache
+    )
+    display_tenant_service = TenantService(
+        TenantRepositoryMongo(app.state.db),
+        settings,
+        app.state.tenant_cache,
+        app.state.shared_cache,
+    )
+    display_menu_service = MenuService(menu_repo, TenantRepositoryMongo(app.state.db))
+    app.state.display_snapshots = DisplaySnapshotService(
+        display_tenant_service, display_menu_service, app.state.weather_service, settings
+    )
+    # Writes from this process refresh snapshots even when change streams are disabled.
+    menu_repo.subscribe(lambda tenant_id: app.state.display_snapshots.mark_dirty(tenant_id, "menu"))
+    app.state.display_stream_hub = DisplayStreamHub(
+        display_tenant_service,
+        app.state.arrivals_service,
+        display_menu_service,
+        app.state.weather_service,
+        settings,
+    )
+    if app.state.cache_invalidator:
+        subscribe_shared_invalidation(
+            app.state.cache_invalidator,
+            app.state.shared_cache,
+            app.state.tenant_cache,
+            menu_repo,
+            app.state.display_snapshots,
+        )
+        app.state.cache_invalidator_task = asyncio.create_task(app.state.cache_invalidator.run())
+    app.state.weather_refresher = None
+    app.state.weather_refresher_task = None
+    if settings.WEATHER_SCHEDULER_ENABLED:
+        app.state.weather_refresher = WeatherRefresher(app.state.weather_service, settings)
+        app.state.weather_refresher_task = asyncio.create_task(app.state.weather_refresher.run())
+    app.state.image_variants = ImageVariantService(settings)
+    app.state.upload_storage = build_upload_storage(settings)
+    app.state.upload_service = UploadService(app.state.upload_storage, app.state.image_variants)
     if settings.TELEGRAM_BOT_TOKEN:
         app.state.telegram_client = TelegramClient(settings.TELEGRAM_BOT_TOKEN)
     else:
         app.state.telegram_client = None
 
+    app.state.arrivals_poller = None
+    app.state.arrivals_poller_task = None
+    if settings.EMT_POLL_ENABLED:
+        app.state.arrivals_poller = ArrivalsPoller(
+            app.state.emt_service,
+            TenantRepositoryMongo(app.state.db),
+            settings,
+        )
+        app.state.arrivals_poller_task = asyncio.create_task(app.state.arrivals_poller.run())
+
     app.state.telegram_service = None
     app.state.telegram_polling_task = None
+    app.state.telegram_update_worker = None
+    app.state.telegram_update_worker_task = None
 
-    if settings.TELEGRAM_MODE == "polling" and app.state.telegram_client:
+    if app.state.telegram_client:
         tenant_repo = TenantRepositoryMongo(app.state.db)
-        menu_repo = MenuRepositoryMongo(app.state.db)
         binding_repo = TelegramBindingRepositoryMongo(app.state.db)
-        tenant_service = TenantService(tenant_repo, settings)
+        tenant_service = TenantService(
+            tenant_repo, settings, app.state.tenant_cache, app.state.shared_cache
+        )
         menu_service = MenuService(menu_repo, tenant_repo)
+        polling = settings.TELEGRAM_MODE == "polling"
+        update_queue = None if polling else TelegramUpdateQueueMongo(app.state.db)
         app.state.telegram_service = TelegramService(
             app.state.telegram_client,
             tenant_service,
             menu_service,
             binding_repo,
             settings,
+            app.state.upload_service,
+            update_queue,
         )
-        app.state.telegram_polling_task = asyncio.create_task(
-            app.state.telegram_service.poll_updates()
-        )
+        if polling:
+            app.state.telegram_polling_task = asyncio.create_task(
+                app.state.telegram_service.poll_updates()
+            )
+        else:
+            app.state.telegram_update_worker = TelegramUpdateWorker(
+                update_queue, app.state.telegram_service, settings
+            )
+            app.state.telegram_update_worker_task = asyncio.create_task(
+                app.state.telegram_update_worker.run()
+            )
 
     yield
 
-    if app.state.telegram_service:
+    if app.state.telegram_polling_task:
         app.state.telegram_service.stop_polling()
         await app.state.telegram_polling_task
 
+    if app.state.telegram_update_worker:
+        app.state.telegram_update_worker.stop()
+        await app.state.telegram_update_worker_task
+
+    if app.state.arrivals_poller:
+        app.state.arrivals_poller.stop()
+        await app.state.arrivals_poller_task
+
+    if app.state.emt_token_task:
+        app.state.emt_token_manager.stop()
+        await app.state.emt_token_task
+
+    if app.state.cache_invalidator:
+        app.state.cache_invalidator.stop()
+        await app.state.cache_invalidator_task
+        await app.state.cache_invalidator.wait_for_callbacks()
+
+    if app.state.weather_refresher:
+        app.state.weather_refresher.stop()
+        await app.state.weather_refresher_task
+    await app.state.weather_service.wait_for_background_refreshes()
+
     await app.state.http_client.close()
     await app.state.openweather_http_client.close()
+    await app.state.cache_backend.close()
     if app.state.telegram_client:
         await app.state.telegram_client.close()
+    app.state.image_variants.close()
+    await app.state.upload_storage.close()
     app.state.mongo_client.close()
+    log_listener.stop()
 
 
 def create_app() -> FastAPI:
@@ -91,7 +282,15 @@ def create_app() -> FastAPI:
     app.include_router(telegram_router)
 
     app.mount("/static", StaticFiles(directory="web"), name="static")
-    app.mount("/uploads", StaticFiles(directory=settings.TELEGRAM_UPLOADS_DIR), name="uploads")
+    app.mount(
+        "/uploads",
+        ImmutableStaticFiles(
+            directory=settings.TELEGRAM_UPLOADS_DIR,
+            immutable_prefix=IMAGES_PREFIX,
+            cache_control=immutable_cache_control(settings),
+        ),
+        name="uploads",
+    )
     return app
 
 
@@ -0,0 +1,22 @@
+from typing import Any
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def dump_json(content: Any) -> bytes:
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, BaseModel):
+        # pydantic-core serializes models in one pass; orjson would need a model_dump() first.
+        return content.model_dump_json(by_alias=True).encode()
+    # orjson only handles plain dicts and lists here.
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
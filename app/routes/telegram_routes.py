@@ -1,10 +1,11 @@
 import logging
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
 
-from app.dependencies import get_settings, get_telegram_service
+from app.dependencies import get_settings, get_telegram_update_queue
 from app.settings import Settings
+from domain.repositories.telegram_update_queue import TelegramUpdateQueue
 from schemas.telegram_schemas import TelegramUpdate
-from services.telegram_service import TelegramService
 
 router = APIRouter()
 logger = logging.getLogger("telegram")
@@ -14,15 +15,17 @@ logger = logging.getLogger("telegram")
 async def telegram_webhook(
     secret: str,
     request: Request,
-    background_tasks: BackgroundTasks,
     settings: Settings = Depends(get_settings),
-    telegram_service: TelegramService = Depends(get_telegram_service),
+    update_queue: TelegramUpdateQueue = Depends(get_telegram_update_queue),
 ) -> dict:
     if not settings.TELEGRAM_WEBHOOK_SECRET or secret != settings.TELEGRAM_WEBHOOK_SECRET:
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     payload = await request.json()
-    update = TelegramUpdate.model_validate(payload)
+    try:
+        update = TelegramUpdate.model_validate(payload)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid update")
     message = update.message or update.edited_message
     if message:
         logger.info(
@@ -32,5 +35,6 @@ async def telegram_webhook(
             message.chat.id,
         )
 
-    await telegram_service.handle_update(update, background_tasks)
+    if not await update_queue.enqueue(update.update_id, payload):
+        logger.info("Ignoring duplicate telegram update_id=%s", update.update_id)
     return {"ok": True}
@@ -1,30 +1,35 @@
-import asyncio
 import logging
-import math
-from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.dependencies import (
-    get_emt_service,
+    get_arrivals_service,
+    get_display_snapshot_service,
+    get_display_stream_hub,
     get_menu_service,
     get_settings,
     get_tenant_service,
     get_weather_service,
 )
+from app.responses import FastJSONResponse, dump_json
 from app.settings import Settings
 from schemas.api_schemas import (
     AdminCreateTenantRequest,
     AdminCreateTenantResponse,
-    ArrivalItem,
+    ArrivalsBatchRequest,
+    ArrivalsBatchResponse,
     ArrivalsResponse,
     MenuResponse,
     TenantConfigResponse,
     WeatherWidgetDto,
 )
-from services.emt_madrid_service import EmtMadridService
+from services.arrivals_service import ArrivalsService
+from services.display_snapshot import DisplaySnapshotService
+from services.display_stream import DisplayStreamHub
+from services.etag_utils import build_etag, etag_matches
 from services.menu_service import MenuService
-from services.tenant_config_utils import normalize_menu_mode
-from services.tenant_service import TenantService
+from services.tenant_config_utils import build_tenant_config_response
+from services.tenant_service import TenantService, normalize_short_code
 from services.weather_service import WeatherService
 from services.youtube_embed import build_youtube_embed_url
 from infrastructure.clients.openweather_client import OpenWeatherClientError
@@ -36,9 +41,10 @@ logger = logging.getLogger(__name__)
 @router.get("/api/tenants/{code}/config", response_model=TenantConfigResponse)
 async def get_tenant_config(
     code: str,
+    if_none_match: str | None = Header(default=None),
     tenant_service: TenantService = Depends(get_tenant_service),
     settings: Settings = Depends(get_settings),
-) -> TenantConfigResponse:
+) -> Response:
     tenant, config = await tenant_service.get_tenant_and_config(code)
     if not tenant or not config:
         raise HTTPException(status_code=404, detail="Tenant not found")
@@ -48,27 +54,18 @@ async def get_tenant_config(
             status_code=400, detail="youtubeUrl is required when showYoutube is true"
         )
 
+    body, etag = tenant_service.get_config_document(
+        tenant, config, lambda: dump_json(build_tenant_config_response(tenant, config, settings))
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
     if config.show_youtube and config.youtube_url:
         if not build_youtube_embed_url(config.youtube_url):
             logger.warning("Invalid YouTube URL for tenant %s: %s", tenant.id, config.youtube_url)
 
-    return TenantConfigResponse(
-        tenant_name=tenant.name,
-        layout=config.layout,
-        refresh_seconds=config.refresh_seconds,
-        swap_seconds=config.swap_seconds,
-        menu_mode=normalize_menu_mode(config),
-        show_youtube=config.show_youtube,
-        youtube_url=config.youtube_url,
-        show_weather=config.show_weather,
-        weather_lang=config.weather_lang,
-        weather_lat=config.weather_lat,
-        weather_lon=config.weather_lon,
-        weather_refresh_seconds=settings.WEATHER_REFRESH_SECONDS,
-        theme=config.theme,
-        board_header_text=config.board_header_text,
-        stops=config.stops,
-    )
+    return FastJSONResponse(body, headers=headers)
 
 
 @router.get(
@@ -80,7 +77,7 @@ async def get_weather(
     code: str,
     tenant_service: TenantService = Depends(get_tenant_service),
     weather_service: WeatherService = Depends(get_weather_service),
-) -> WeatherWidgetDto | Response:
+) -> Response:
     tenant, config = await tenant_service.get_tenant_and_config(code)
     if not tenant or not config:
         raise HTTPException(status_code=404, detail="Tenant not found")
@@ -96,67 +93,106 @@ async def get_weather(
     if not weather:
         return Response(status_code=204)
 
-    return weather
+    return FastJSONResponse(weather)
 
 
 @router.get("/api/tenants/{code}/arrivals", response_model=ArrivalsResponse)
 async def get_arrivals(
     code: str,
     tenant_service: TenantService = Depends(get_tenant_service),
-    emt_service: EmtMadridService = Depends(get_emt_service),
-) -> ArrivalsResponse:
+    arrivals_service: ArrivalsService = Depends(get_arrivals_service),
+) -> Response:
     tenant, config = await tenant_service.get_tenant_and_config(code)
     if not tenant or not config:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
-    line_default = config.line_arrive_default or "0"
-    tasks = [emt_service.get_arrival_bus(stop_id, line_default) for stop_id in config.stops]
-    responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-    items: list[ArrivalItem] = []
-    for response in responses:
-        if isinstance(response, Exception):
-            continue
-        for data_item in response.data:
-            for arrive in data_item.Arrive:
-                eta_seconds = int(arrive.estimateArrive)
-                if eta_seconds < 0:
-                    continue
-                items.append(
-                    ArrivalItem(
-                        stop=arrive.stop,
-                        line=arrive.line,
-                        destination=arrive.destination,
-                        eta_seconds=eta_seconds,
-                        eta_minutes=max(1, math.ceil(eta_seconds / 60)),
-                    )
-                )
-
-    items.sort(key=lambda item: item.eta_seconds)
-    return ArrivalsResponse(updated_at=datetime.now(timezone.utc), items=items)
+    return FastJSONResponse(await arrivals_service.get_arrivals_payload(config))
+
+
+@router.post("/api/arrivals:batch", response_model=ArrivalsBatchResponse)
+async def get_arrivals_batch(
+    payload: ArrivalsBatchRequest,
+    settings: Settings = Depends(get_settings),
+    tenant_service: TenantService = Depends(get_tenant_service),
+    arrivals_service: ArrivalsService = Depends(get_arrivals_service),
+) -> Response:
+    codes = list(dict.fromkeys(normalize_short_code(code) for code in payload.codes if code.strip()))
+    if len(codes) > settings.ARRIVALS_BATCH_MAX_CODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ARRIVALS_BATCH_MAX_CODES} codes per batch",
+        )
+
+    resolved = await tenant_service.get_tenants_and_configs(codes)
+    configs = {code: config for code, (_, config) in resolved.items()}
+    results = await arrivals_service.get_arrivals_many(configs)
+    return FastJSONResponse(
+        ArrivalsBatchResponse(
+            results=results,
+            not_found=[code for code in codes if code not in resolved],
+        )
+    )
 
 
 @router.get("/api/tenants/{code}/menu", response_model=MenuResponse)
 async def get_menu(
     code: str,
+    width: int | None = Query(default=None, ge=1),
+    if_none_match: str | None = Header(default=None),
     tenant_service: TenantService = Depends(get_tenant_service),
     menu_service: MenuService = Depends(get_menu_service),
-) -> MenuResponse:
+) -> Response:
     tenant, config = await tenant_service.get_tenant_and_config(code)
     if not tenant or not config:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
     menu, image = await menu_service.get_menu_with_image(tenant.id, config.timezone)
-    menu_title = menu.title if menu else "Menu of the day"
-    text_raw = menu.text_raw if menu and menu.text_raw else ""
-    sections = menu.sections if menu else None
-
-    return MenuResponse(
-        title=menu_title,
-        sections=sections,
-        text_raw=text_raw,
-        featured_image_url=image.url if image else None,
-        updated_at=(menu.updated_at if menu else datetime.now(timezone.utc)),
+    etag = build_etag(
+        tenant.id,
+        menu.id if menu else None,
+        menu.updated_at if menu else None,
+        image.id if image else None,
+        width,
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return FastJSONResponse(menu_service.build_menu_response(menu, image, width), headers=headers)
+
+
+@router.get("/api/tenants/{code}/snapshot")
+async def get_snapshot(
+    code: str,
+    if_none_match: str | None = Header(default=None),
+    snapshots: DisplaySnapshotService = Depends(get_display_snapshot_service),
+) -> Response:
+    snapshot = await snapshots.get_snapshot(code)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(snapshot.body, headers=headers)
+
+
+@router.get("/api/tenants/{code}/stream")
+async def stream_tenant(
+    code: str,
+    request: Request,
+    width: int | None = Query(default=None, ge=1),
+    tenant_service: TenantService = Depends(get_tenant_service),
+    hub: DisplayStreamHub = Depends(get_display_stream_hub),
+) -> StreamingResponse:
+    tenant, config = await tenant_service.get_tenant_and_config(code)
+    if not tenant or not config:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    return StreamingResponse(
+        hub.stream(code, width).events(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -176,3 +212,38 @@ async def create_tenant(
         tenant_id=tenant.id,
         url=f"/t/{tenant.short_code}",
     )
+
+
+@router.get("/api/admin/metrics")
+async def get_metrics(
+    request: Request,
+    x_admin_secret: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings),
+) -> dict:
+    if x_admin_secret != settings.ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    state = request.app.state
+    return {
+        "http": {
+            "emt": state.http_client.metrics(),
+            "openweather": state.openweather_http_client.metrics(),
+        },
+        "emt_token": state.emt_token_manager.stats(),
+        "tenant_cache": state.tenant_cache.stats(),
+        "shared_cache": state.shared_cache.stats(),
+        "display_snapshots": state.display_snapshots.stats(),
+        "display_streams": state.display_stream_hub.stats(),
+    }
+
+
+@router.get("/api/admin/captures")
+async def get_payload_captures(
+    request: Request,
+    x_admin_secret: str | None = Header(default=None),
+    settings: Settings = Depends(get_settings),
+) -> FastJSONResponse:
+    if x_admin_secret != settings.ADMIN_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    return FastJSONResponse(request.app.state.payload_capture.entries())
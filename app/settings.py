@@ -7,26 +7,99 @@ class Settings(BaseSettings):
     MONGO_URI: str
     MONGO_DB_NAME: str
     EMT_BASE_URL: str
-    EMT_ACCESS_TOKEN: str
+    EMT_ACCESS_TOKEN: str = ""
+    EMT_CLIENT_ID: str | None = None
+    EMT_PASS_KEY: str | None = None
+    EMT_TOKEN_REFRESH_MARGIN_SECONDS: int = 300
+    EMT_TOKEN_RETRY_SECONDS: int = 30
     EMT_TIMEOUT_SECONDS: int = 10
+    EMT_MAX_CONNECTIONS: int = 20
+    EMT_MAX_CONCURRENCY: int = 10
+    EMT_HTTP2: bool = False
+    EMT_REQUEST_DEADLINE_SECONDS: float = 4.0
+    EMT_STALE_MAX_SECONDS: int = 300
+    EMT_ARRIVALS_CACHE_SECONDS: int = 15
+    EMT_FULL_VALIDATION: bool = False
+    EMT_PAYLOAD_CAPTURE_SIZE: int = 0
+    EMT_POLL_ENABLED: bool = True
+    EMT_POLL_INTERVAL_SECONDS: int = 10
+    EMT_POLL_MAX_REQUESTS_PER_SECOND: float = 10.0
+    EMT_BATCH_MAX_CONCURRENCY: int = 8
+    ARRIVALS_BATCH_MAX_CODES: int = 500
+    ARRIVALS_PAYLOAD_CACHE_MAX_ENTRIES: int = 1000
 
     OPENWEATHER_BASE_URL: str = "https://api.openweathermap.org"
     OPENWEATHER_API_KEY: str
     OPENWEATHER_UNITS: str = "metric"
     WEATHER_REFRESH_SECONDS: int = 600
     WEATHER_TIMEOUT_SECONDS: int = 8
+    WEATHER_CELL_SIZE_DEGREES: float = 0.01
+    WEATHER_CACHE_MAX_ENTRIES: int = 2000
+    WEATHER_SCHEDULER_ENABLED: bool = True
+    WEATHER_SCHEDULER_INTERVAL_SECONDS: int = 30
+    WEATHER_REFRESH_LEAD_SECONDS: int = 60
+    WEATHER_BATCH_MAX_CONCURRENCY: int = 4
+    OPENWEATHER_MAX_CONNECTIONS: int = 10
+    OPENWEATHER_MAX_CONCURRENCY: int = 5
+    OPENWEATHER_HTTP2: bool = False
+
+    WEATHER_REQUEST_DEADLINE_SECONDS: float = 4.0
+
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    UPSTREAM_RETRY_ATTEMPTS: int = 2
+    UPSTREAM_RETRY_BASE_DELAY_SECONDS: float = 0.2
+    UPSTREAM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_CIRCUIT_RESET_SECONDS: int = 30
 
     DEFAULT_REFRESH_SECONDS: int = 60
     DEFAULT_SWAP_SECONDS: int = 30
     DEFAULT_LAYOUT: str = "horizontal"
     DEFAULT_THEME: str = "purple"
     DEFAULT_BOARD_HEADER_TEXT: str = "Bus arriving at nearby stops"
+    STREAM_HEARTBEAT_SECONDS: int = 15
+
+    TENANT_CACHE_TTL_SECONDS: int = 300
+    TENANT_CACHE_MAX_ENTRIES: int = 1000
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_POLL_SECONDS: int = 5
+    CACHE_BACKEND: str = "memory"
+    CACHE_MEMORY_MAX_ENTRIES: int = 10000
+    CACHE_KEY_PREFIX: str = "board:"
+    CACHE_LOCK_TTL_SECONDS: float = 10.0
+    CACHE_LOCK_WAIT_SECONDS: float = 3.0
+    REDIS_URL: str = "redis://localhost:6379/0"
+    MENU_CACHE_TTL_SECONDS: int = 300
+    SNAPSHOT_MAX_ENTRIES: int = 1000
 
     ADMIN_SECRET: str = "change-me"
 
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATE: float = 1.0
+
     TELEGRAM_BOT_TOKEN: str | None = None
     TELEGRAM_WEBHOOK_SECRET: str | None = None
     TELEGRAM_ALLOWED_UPDATE_TYPES: str = "message,edited_message"
     TELEGRAM_MAX_IMAGE_MB: int = 5
     TELEGRAM_UPLOADS_DIR: str = "./uploads"
     TELEGRAM_MODE: str = "webhook"
+    TELEGRAM_POLL_TIMEOUT_SECONDS: int = 30
+    TELEGRAM_DISPATCH_WORKERS: int = 8
+    TELEGRAM_RETRY_MAX_ATTEMPTS: int = 5
+    TELEGRAM_RETRY_BASE_SECONDS: float = 1.0
+    TELEGRAM_RETRY_MAX_SECONDS: float = 60.0
+    TELEGRAM_QUEUE_POLL_SECONDS: float = 1.0
+    TELEGRAM_QUEUE_LEASE_SECONDS: int = 300
+    TELEGRAM_QUEUE_RETENTION_SECONDS: int = 604800
+    IMAGE_VARIANT_WIDTHS: str = "1920,480"
+    IMAGE_VARIANT_FORMAT: str = "webp"
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_PROCESS_WORKERS: int = 2
+    UPLOAD_STORAGE: str = "local"
+    UPLOAD_CACHE_MAX_AGE_SECONDS: int = 31536000
+    S3_ENDPOINT_URL: str = "http://localhost:9000"
+    S3_BUCKET: str = "busboard-uploads"
+    S3_ACCESS_KEY: str = ""
+    S3_SECRET_KEY: str = ""
+    S3_REGION: str = "us-east-1"
+    S3_PUBLIC_URL: str | None = None
@@ -0,0 +1,24 @@
+import os
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+
+class ImmutableStaticFiles(StaticFiles):
+    def __init__(self, *, immutable_prefix: str, cache_control: str, **kwargs):
+        super().__init__(**kwargs)
+        self.immutable_prefix = immutable_prefix
+        self.cache_control = cache_control
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if self.get_path(scope).replace(os.sep, "/").startswith(self.immutable_prefix):
+            response.headers["Cache-Control"] = self.cache_control
+        return response
@@ -2,6 +2,13 @@ from datetime import datetime
 from pydantic import BaseModel
 
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
+
 class MenuImage(BaseModel):
     id: str
     tenant_id: str
@@ -9,3 +16,4 @@ class MenuImage(BaseModel):
     caption: str | None
     is_active: bool
     created_at: datetime
+    variants: list[ImageVariant] = []
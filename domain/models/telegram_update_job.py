@@ -0,0 +1,11 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class TelegramUpdateJob(BaseModel):
+    update_id: int
+    payload: dict
+    status: str
+    attempts: int
+    created_at: datetime
+    lease_until: datetime | None = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, model_validator
 
 
@@ -18,6 +19,11 @@ class TenantConfig(BaseModel):
     stops: list[str]
     line_arrive_default: str | None = None
     timezone: str | None = None
+    updated_at: datetime | None = None
+
+    def stop_keys(self) -> list[tuple[str, str]]:
+        line_default = self.line_arrive_default or "0"
+        return [(stop_id, line_default) for stop_id in self.stops]
 
     @model_validator(mode="after")
     def _validate_weather(self):
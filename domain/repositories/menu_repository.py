@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Protocol
 from domain.models.daily_menu import DailyMenu
-from domain.models.menu_image import MenuImage
+from domain.models.menu_image import ImageVariant, MenuImage
 
 
 class MenuRepository(Protocol):
@@ -25,5 +25,12 @@ class MenuRepository(Protocol):
     async def get_active_image(self, tenant_id: str) -> MenuImage | None:
         ...
 
-    async def upsert_image(self, tenant_id: str, url: str, caption: str | None) -> MenuImage:
+    async def upsert_image(
+        self,
+        tenant_id: str,
+        url: str,
+        caption: str | None,
+        variants: list[ImageVariant] | None = None,
+        update_id: int | None = None,
+    ) -> MenuImage:
         ...
@@ -0,0 +1,25 @@
+from typing import Protocol
+from domain.models.telegram_update_job import TelegramUpdateJob
+
+
+class TelegramUpdateQueue(Protocol):
+    async def enqueue(self, update_id: int, payload: dict) -> bool:
+        ...
+
+    async def claim(self, lease_seconds: float, max_attempts: int) -> TelegramUpdateJob | None:
+        ...
+
+    async def extend(self, update_ids: list[int], lease_seconds: float) -> None:
+        ...
+
+    async def has_effect(self, update_id: int, effect: str) -> bool:
+        ...
+
+    async def record_effect(self, update_id: int, effect: str) -> None:
+        ...
+
+    async def complete(self, update_id: int) -> None:
+        ...
+
+    async def fail(self, update_id: int, error: str) -> None:
+        ...
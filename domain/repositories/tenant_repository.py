@@ -7,6 +7,14 @@ class TenantRepository(Protocol):
     async def get_by_code(self, code: str) -> Tenant | None:
         ...
 
+    async def get_with_config_by_code(self, code: str) -> tuple[Tenant | None, TenantConfig | None]:
+        ...
+
+    async def get_many_with_config_by_codes(
+        self, codes: list[str]
+    ) -> list[tuple[Tenant, TenantConfig | None]]:
+        ...
+
     async def get_by_id(self, tenant_id: str) -> Tenant | None:
         ...
 
@@ -16,5 +24,8 @@ class TenantRepository(Protocol):
     async def get_config(self, tenant_id: str) -> TenantConfig | None:
         ...
 
+    async def get_active_stops(self) -> set[tuple[str, str]]:
+        ...
+
     async def create_default_config(self, tenant_id: str, defaults: dict) -> TenantConfig:
         ...
@@ -0,0 +1,36 @@
+from typing import Protocol
+
+
+class CacheBackend(Protocol):
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        ...
+
+    async def delete(self, keys: list[str]) -> None:
+        ...
+
+    async def delete_prefix(self, prefix: str) -> None:
+        ...
+
+    async def acquire_lock(self, key: str, ttl_seconds: float) -> str | None:
+        ...
+
+    async def release_lock(self, key: str, token: str) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+def build_cache_backend(settings) -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        from infrastructure.cache.redis_backend import RedisCacheBackend
+
+        return RedisCacheBackend.from_url(settings.REDIS_URL)
+    if settings.CACHE_BACKEND == "memory":
+        from infrastructure.cache.memory_backend import MemoryCacheBackend
+
+        return MemoryCacheBackend(settings.CACHE_MEMORY_MAX_ENTRIES)
+    raise ValueError(f"Unknown cache backend {settings.CACHE_BACKEND}")
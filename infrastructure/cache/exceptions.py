@@ -0,0 +1,2 @@
+class CacheBackendError(Exception):
+    pass
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+import secrets
+import time
+
+
+class MemoryCacheBackend:
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._values: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._locks: dict[str, tuple[str, float]] = {}
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        now = time.monotonic()
+        values: list[bytes | None] = []
+        for key in keys:
+            item = self._values.get(key)
+            if item and item[1] > now:
+                self._values.move_to_end(key)
+                values.append(item[0])
+            else:
+                if item:
+                    del self._values[key]
+                values.append(None)
+        return values
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._values[key] = (value, time.monotonic() + ttl_seconds)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_entries:
+            self._values.popitem(last=False)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self._values.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._values if key.startswith(prefix)]:
+            del self._values[key]
+
+    async def acquire_lock(self, key: str, ttl_seconds: float) -> str | None:
+        holder = self._locks.get(key)
+        now = time.monotonic()
+        if holder and holder[1] > now:
+            return None
+        token = secrets.token_hex(8)
+        self._locks[key] = (token, now + ttl_seconds)
+        return token
+
+    async def release_lock(self, key: str, token: str) -> None:
+        holder = self._locks.get(key)
+        if holder and holder[0] == token:
+            del self._locks[key]
+
+    async def close(self) -> None:
+        self._values.clear()
+        self._locks.clear()
@@ -0,0 +1,77 @@
+import secrets
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+
+from infrastructure.cache.exceptions import CacheBackendError
+
+
+class RedisCacheBackend:
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        return cls(Redis.from_url(url))
+
+    async def get_many(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        try:
+            return await self._client.mget(keys)
+        except RedisError as exc:
+            raise CacheBackendError(str(exc)) from exc
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        try:
+            await self._client.set(key, value, px=max(1, int(ttl_seconds * 1000)))
+        except RedisError as exc:
+            raise CacheBackendError(str(exc)) from exc
+
+    async def delete(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.delete(*keys)
+        except RedisError as exc:
+            raise CacheBackendError(str(exc)) from exc
+
+    async def delete_prefix(self, prefix: str) -> None:
+        try:
+            batch = []
+            async for key in self._client.scan_iter(match=f"{prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await self._client.delete(*batch)
+                    batch = []
+            if batch:
+                await self._client.delete(*batch)
+        except RedisError as exc:
+            raise CacheBackendError(str(exc)) from exc
+
+    async def acquire_lock(self, key: str, ttl_seconds: float) -> str | None:
+        token = secrets.token_hex(8)
+        try:
+            acquired = await self._client.set(key, token, nx=True, px=max(1, int(ttl_seconds * 1000)))
+        except RedisError as exc:
+            raise CacheBackendError(str(exc)) from exc
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                await pipe.watch(key)
+                holder = await pipe.get(key)
+                if holder is None or holder.decode() != token:
+                    await pipe.unwatch()
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+        except WatchError:
+            return
+        except RedisError as exc:
+            raise CacheBackendError(str(exc)) from exc
+
+    async def close(self) -> None:
+        await self._client.aclose()
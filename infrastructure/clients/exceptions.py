@@ -11,3 +11,7 @@ class HttpClientResponseError(HttpClientError):
         super().__init__(f"HTTP {status_code}: {message}")
         self.status_code = status_code
         self.message = message
+
+
+class CircuitOpenError(HttpClientError):
+    pass
@@ -1,28 +1,149 @@
+import asyncio
+import logging
+import time
+
 import httpx
+from infrastructure.clients.circuit_breaker import CircuitBreaker
 from infrastructure.clients.exceptions import HttpClientError, HttpClientResponseError, HttpClientTimeout
+from infrastructure.clients.retry_policy import RetryPolicy, is_retryable
+
+logger = logging.getLogger("http_client")
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 
 class HttpClient:
-    def __init__(self, base_url: str, timeout_seconds: int, default_headers: dict | None = None):
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: int,
+        default_headers: dict | None = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float = 5.0,
+        http2: bool = False,
+        max_concurrency: int | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requested for %s but h2 is not installed, using HTTP/1.1", base_url)
+            http2 = False
+
         self._client = httpx.AsyncClient(
             base_url=base_url,
             timeout=timeout_seconds,
             headers=default_headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections or max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
         )
+        self.timeout_seconds = timeout_seconds
+        self.circuit_breaker = circuit_breaker
+        self.retry_policy = retry_policy
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests_total = 0
+        self.pool_wait_seconds_total = 0.0
+        self.pool_wait_seconds_max = 0.0
 
     async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        policy = self.retry_policy
+        max_attempts = policy.max_attempts if policy else 1
+        deadline = None
+        if policy and policy.deadline_seconds:
+            deadline = time.monotonic() + policy.deadline_seconds
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                kwargs["timeout"] = max(0.1, min(self.timeout_seconds, deadline - time.monotonic()))
+            if self.circuit_breaker:
+                self.circuit_breaker.before_call()
+            try:
+                response = await self._request_once(method, url, **kwargs)
+            except HttpClientError as exc:
+                retryable = is_retryable(exc)
+                if self.circuit_breaker:
+                    if retryable:
+                        self.circuit_breaker.record_failure()
+                    else:
+                        self.circuit_breaker.record_success()
+                if not retryable or attempt >= max_attempts:
+                    raise
+                delay = policy.backoff(attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                logger.info("Retrying %s %s after %s (attempt %s)", method, url, exc, attempt)
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if self.circuit_breaker:
+                    self.circuit_breaker.release_probe()
+                raise
+
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success()
+            return response
+
+    async def _request_once(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._semaphore is None:
+            return await self._send(method, url, **kwargs)
+
+        self.waiting += 1
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - started
+        self.pool_wait_seconds_total += waited
+        self.pool_wait_seconds_max = max(self.pool_wait_seconds_max, waited)
+        try:
+            return await self._send(method, url, **kwargs)
+        finally:
+            self._semaphore.release()
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        self.in_flight += 1
+        self.requests_total += 1
         try:
             response = await self._client.request(method, url, **kwargs)
         except httpx.TimeoutException as exc:
             raise HttpClientTimeout(str(exc)) from exc
         except httpx.HTTPError as exc:
             raise HttpClientError(str(exc)) from exc
+        finally:
+            self.in_flight -= 1
 
         if response.status_code >= 400:
             raise HttpClientResponseError(response.status_code, response.text)
 
         return response
 
+    def metrics(self) -> dict:
+        return {
+            "circuit": self.circuit_breaker.metrics() if self.circuit_breaker else None,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "requests_total": self.requests_total,
+            "pool_wait_seconds_total": round(self.pool_wait_seconds_total, 6),
+            "pool_wait_seconds_max": round(self.pool_wait_seconds_max, 6),
+        }
+
     async def get(self, url: str, **kwargs) -> httpx.Response:
         return await self.request("GET", url, **kwargs)
 
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from pydantic import ValidationError
 
@@ -41,3 +42,17 @@ class OpenWeatherClient:
         except ValidationError as exc:
             logger.warning("OpenWeather response schema error: %s", exc)
             raise OpenWeatherClientError("Invalid weather response") from exc
+
+    async def get_current_weather_many(
+        self, locations: list[tuple[float, float, str]], max_concurrency: int
+    ) -> list[OpenWeatherResponse | OpenWeatherClientError]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(lat: float, lon: float, lang: str) -> OpenWeatherResponse | OpenWeatherClientError:
+            async with semaphore:
+                try:
+                    return await self.get_current_weather(lat, lon, lang)
+                except OpenWeatherClientError as exc:
+                    return exc
+
+        return await asyncio.gather(*[fetch(lat, lon, lang) for lat, lon, lang in locations])
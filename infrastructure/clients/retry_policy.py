@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+import random
+
+from infrastructure.clients.exceptions import (
+    CircuitOpenError,
+    HttpClientError,
+    HttpClientResponseError,
+)
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.2
+    max_delay_seconds: float = 2.0
+    deadline_seconds: float | None = None
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+def is_retryable(exc: HttpClientError) -> bool:
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, HttpClientResponseError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return True
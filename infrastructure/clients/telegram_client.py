@@ -1,15 +1,28 @@
+from typing import AsyncIterator
+
 import httpx
 from pydantic import BaseModel
 
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class TelegramFileTooLarge(Exception):
+    def __init__(self, size: int, max_bytes: int):
+        super().__init__(f"Telegram file is {size} bytes, limit is {max_bytes}")
+        self.size = size
+        self.max_bytes = max_bytes
+
 
 class TelegramFileInfo(BaseModel):
     file_path: str
+    file_size: int | None = None
 
 
 class TelegramClient:
-    def __init__(self, token: str):
+    def __init__(self, token: str, api_url: str = "https://api.telegram.org"):
         self._token = token
-        self._base_url = f"https://api.telegram.org/bot{token}/"
+        self._api_url = api_url.rstrip("/")
+        self._base_url = f"{self._api_url}/bot{token}/"
         self._client = httpx.AsyncClient(base_url=self._base_url, timeout=20)
 
     async def send_message(self, chat_id: int, text: str) -> None:
@@ -22,17 +35,26 @@ class TelegramClient:
         data = response.json()
         if not data.get("ok"):
             raise RuntimeError("Telegram getFile failed")
-        return TelegramFileInfo(file_path=data["result"]["file_path"])
+        result = data["result"]
+        return TelegramFileInfo(file_path=result["file_path"], file_size=result.get("file_size"))
 
-    async def download_file(self, file_path: str) -> bytes:
-        url = f"https://api.telegram.org/file/bot{self._token}/{file_path}"
-        response = await self._client.get(url)
-        response.raise_for_status()
-        return response.content
+    async def stream_file(self, file_path: str, max_bytes: int) -> AsyncIterator[bytes]:
+        url = f"{self._api_url}/file/bot{self._token}/{file_path}"
+        async with self._client.stream("GET", url) as response:
+            response.raise_for_status()
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > max_bytes:
+                raise TelegramFileTooLarge(int(content_length), max_bytes)
+            received = 0
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise TelegramFileTooLarge(received, max_bytes)
+                yield chunk
 
     async def get_updates(self, offset: int, timeout: int, allowed_updates: list[str]) -> list[dict]:
         payload = {"offset": offset, "timeout": timeout, "allowed_updates": allowed_updates}
-        response = await self._client.post("getUpdates", json=payload)
+        response = await self._client.post("getUpdates", json=payload, timeout=timeout + 10)
         response.raise_for_status()
         data = response.json()
         if not data.get("ok"):
@@ -0,0 +1,59 @@
+"""One-off migration: keep a single tenant_configs document per tenant.
+
+Before the unique index on tenant_id, get_config read the first document in
+natural order, so the document with the lowest _id is the one screens were
+showing. That one is kept; the others are removed and the unique index is
+created. Run it once, from a single process:
+
+    python -m infrastructure.persistence.dedupe_tenant_configs
+"""
+import asyncio
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+logger = logging.getLogger("mongo.migrations")
+
+TENANT_CONFIG_INDEX = "tenant_id_1"
+
+DUPLICATES_PIPELINE = [
+    {"$sort": {"_id": 1}},
+    {"$group": {"_id": "$tenant_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+    {"$match": {"count": {"$gt": 1}}},
+]
+
+
+async def count_duplicate_tenant_configs(db) -> int:
+    return len([group async for group in db["tenant_configs"].aggregate(DUPLICATES_PIPELINE)])
+
+
+async def dedupe_tenant_configs(db) -> int:
+    configs = db["tenant_configs"]
+    removed = 0
+    async for group in configs.aggregate(DUPLICATES_PIPELINE):
+        result = await configs.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+        logger.info("Kept config %s for tenant %s", group["ids"][0], group["_id"])
+
+    index = (await configs.index_information()).get(TENANT_CONFIG_INDEX)
+    if index and not index.get("unique"):
+        await configs.drop_index(TENANT_CONFIG_INDEX)
+    await configs.create_index("tenant_id", unique=True)
+    return removed
+
+
+async def main() -> None:
+    from app.settings import Settings
+
+    settings = Settings()
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    try:
+        removed = await dedupe_tenant_configs(client[settings.MONGO_DB_NAME])
+        logger.info("Removed %s duplicate tenant configs", removed)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
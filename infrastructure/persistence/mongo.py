@@ -1,16 +1,55 @@
+import logging
+
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from infrastructure.persistence.dedupe_tenant_configs import (
+    TENANT_CONFIG_INDEX,
+    count_duplicate_tenant_configs,
+)
+
+logger = logging.getLogger("mongo")
+
 
 class MongoManager:
-    def __init__(self, uri: str, db_name: str):
+    def __init__(self, uri: str, db_name: str, telegram_update_retention_seconds: int = 604800):
         self.client = AsyncIOMotorClient(uri)
         self.db = self.client[db_name]
+        self.telegram_update_retention_seconds = telegram_update_retention_seconds
 
     async def init_indexes(self) -> None:
         await self.db["tenants"].create_index("short_code", unique=True)
-        await self.db["tenant_configs"].create_index("tenant_id")
+        await self._ensure_tenant_config_index()
         await self.db["daily_menus"].create_index(
             [("tenant_id", 1), ("valid_for_date", 1)], unique=True
         )
+        await self.db["menu_images"].create_index(
+            [("tenant_id", 1), ("telegram_update_id", 1)],
+            unique=True,
+            partialFilterExpression={"telegram_update_id": {"$exists": True}},
+        )
+        await self.db["tenants"].create_index("updated_at")
+        await self.db["tenant_configs"].create_index("updated_at")
+        await self.db["daily_menus"].create_index("updated_at")
+        await self.db["menu_images"].create_index("created_at")
         await self.db["telegram_bindings"].create_index("telegram_chat_id", unique=True)
         await self.db["telegram_bindings"].create_index("tenant_id")
+        await self.db["telegram_updates"].create_index("update_id", unique=True)
+        await self.db["telegram_updates"].create_index([("status", 1), ("update_id", 1)])
+        await self.db["telegram_updates"].create_index(
+            "finished_at", expireAfterSeconds=self.telegram_update_retention_seconds
+        )
+
+    async def _ensure_tenant_config_index(self) -> None:
+        configs = self.db["tenant_configs"]
+        index = (await configs.index_information()).get(TENANT_CONFIG_INDEX)
+        if index and index.get("unique"):
+            return
+        duplicates = await count_duplicate_tenant_configs(self.db)
+        if index or duplicates:
+            logger.warning(
+                "tenant_configs has no unique tenant_id index (%s tenants with duplicate configs); "
+                "run python -m infrastructure.persistence.dedupe_tenant_configs once to create it",
+                duplicates,
+            )
+            return
+        await configs.create_index("tenant_id", unique=True)
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from domain.models.daily_menu import DailyMenu
+from domain.models.menu_image import ImageVariant, MenuImage
+from domain.repositories.menu_repository import MenuRepository
+from services.shared_cache import SharedCache
+
+
+class CachedMenuRepository:
+    def __init__(self, inner: MenuRepository, shared_cache: SharedCache, settings):
+        self.inner = inner
+        self.shared_cache = shared_cache
+        self.ttl_seconds = settings.MENU_CACHE_TTL_SECONDS
+        self._listeners: list[Callable[[str], None]] = []
+
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        self._listeners.append(callback)
+
+    @staticmethod
+    def _menu_key(tenant_id: str, date_str: str) -> str:
+        return f"menu:{tenant_id}:menu:{date_str}"
+
+    @staticmethod
+    def _image_key(tenant_id: str) -> str:
+        return f"menu:{tenant_id}:image"
+
+    async def get_menu_for_date(self, tenant_id: str, date_str: str) -> DailyMenu | None:
+        async def fetch() -> dict:
+            menu = await self.inner.get_menu_for_date(tenant_id, date_str)
+            return {"menu": menu.model_dump(mode="json") if menu else None}
+
+        entry = await self.shared_cache.get_or_fetch(
+            self._menu_key(tenant_id, date_str), fetch, ttl_seconds=self.ttl_seconds
+        )
+        menu = entry.data["menu"]
+        return DailyMenu.model_validate(menu) if menu else None
+
+    async def get_active_image(self, tenant_id: str) -> MenuImage | None:
+        async def fetch() -> dict:
+            image = await self.inner.get_active_image(tenant_id)
+            return {"image": image.model_dump(mode="json") if image else None}
+
+        entry = await self.shared_cache.get_or_fetch(
+            self._image_key(tenant_id), fetch, ttl_seconds=self.ttl_seconds
+        )
+        image = entry.data["image"]
+        return MenuImage.model_validate(image) if image else None
+
+    async def upsert_menu(
+        self,
+        tenant_id: str,
+        date_str: str,
+        title: str,
+        text_raw: str,
+        sections: dict | None,
+        published_at: datetime | None,
+    ) -> DailyMenu:
+        try:
+            return await self.inner.upsert_menu(
+                tenant_id, date_str, title, text_raw, sections, published_at
+            )
+        finally:
+            await self._written(tenant_id, self._menu_key(tenant_id, date_str))
+
+    async def publish_menu(self, tenant_id: str, date_str: str) -> DailyMenu | None:
+        try:
+            return await self.inner.publish_menu(tenant_id, date_str)
+        finally:
+            await self._written(tenant_id, self._menu_key(tenant_id, date_str))
+
+    async def upsert_image(
+        self,
+        tenant_id: str,
+        url: str,
+        caption: str | None,
+        variants: list[ImageVariant] | None = None,
+        update_id: int | None = None,
+    ) -> MenuImage:
+        try:
+            return await self.inner.upsert_image(tenant_id, url, caption, variants, update_id)
+        finally:
+            await self._written(tenant_id, self._image_key(tenant_id))
+
+    async def evict(self, tenant_id: str | None) -> None:
+        if tenant_id is None:
+            await self.shared_cache.delete_prefix("menu:")
+            return
+        # "Today" depends on the tenant's timezone, which is always within a day of UTC.
+        today = datetime.now(timezone.utc).date()
+        dates = [(today + timedelta(days=offset)).isoformat() for offset in (-1, 0, 1)]
+        await self.shared_cache.delete(
+            [self._image_key(tenant_id), *(self._menu_key(tenant_id, date_str) for date_str in dates)]
+        )
+
+    async def _written(self, tenant_id: str, key: str) -> None:
+        await self.shared_cache.delete([key])
+        for callback in self._listeners:
+            callback(tenant_id)
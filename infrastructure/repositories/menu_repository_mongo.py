@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 from bson import ObjectId
+from pymongo import ReturnDocument
 from domain.models.daily_menu import DailyMenu
-from domain.models.menu_image import MenuImage
+from domain.models.menu_image import ImageVariant, MenuImage
 
 
 class MenuRepositoryMongo:
@@ -94,27 +95,46 @@ class MenuRepositoryMongo:
             caption=doc.get("caption"),
             is_active=doc.get("is_active", True),
             created_at=doc["created_at"],
+            variants=[ImageVariant.model_validate(item) for item in doc.get("variants", [])],
         )
 
-    async def upsert_image(self, tenant_id: str, url: str, caption: str | None) -> MenuImage:
+    async def upsert_image(
+        self,
+        tenant_id: str,
+        url: str,
+        caption: str | None,
+        variants: list[ImageVariant] | None = None,
+        update_id: int | None = None,
+    ) -> MenuImage:
+        variants = variants or []
         now = datetime.now(timezone.utc)
-        await self._images.update_many(
-            {"tenant_id": ObjectId(tenant_id), "is_active": True},
-            {"$set": {"is_active": False}},
-        )
-        doc = {
-            "tenant_id": ObjectId(tenant_id),
+        fields = {
             "url": url,
             "caption": caption,
             "is_active": True,
-            "created_at": now,
+            "variants": [variant.model_dump() for variant in variants],
         }
-        result = await self._images.insert_one(doc)
+        await self._images.update_many(
+            {"tenant_id": ObjectId(tenant_id), "is_active": True},
+            {"$set": {"is_active": False}},
+        )
+        if update_id is None:
+            doc = {"tenant_id": ObjectId(tenant_id), **fields, "created_at": now}
+            result = await self._images.insert_one(doc)
+            doc["_id"] = result.inserted_id
+        else:
+            doc = await self._images.find_one_and_update(
+                {"tenant_id": ObjectId(tenant_id), "telegram_update_id": update_id},
+                {"$set": fields, "$setOnInsert": {"created_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
         return MenuImage(
-            id=str(result.inserted_id),
+            id=str(doc["_id"]),
             tenant_id=tenant_id,
             url=url,
             caption=caption,
             is_active=True,
-            created_at=now,
+            created_at=doc["created_at"],
+            variants=variants,
         )
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from domain.models.telegram_update_job import TelegramUpdateJob
+
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+FAILED = "failed"
+
+
+class TelegramUpdateQueueMongo:
+    def __init__(self, db):
+        self._updates = db["telegram_updates"]
+
+    async def enqueue(self, update_id: int, payload: dict) -> bool:
+        try:
+            await self._updates.insert_one(
+                {
+                    "update_id": update_id,
+                    "payload": payload,
+                    "status": PENDING,
+                    "attempts": 0,
+                    "created_at": datetime.now(timezone.utc),
+                    "lease_until": None,
+                }
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def claim(self, lease_seconds: float, max_attempts: int) -> TelegramUpdateJob | None:
+        now = datetime.now(timezone.utc)
+        expired = {"status": PROCESSING, "lease_until": {"$lt": now}}
+        await self._updates.update_many(
+            {**expired, "attempts": {"$gte": max_attempts}},
+            {
+                "$set": {
+                    "status": FAILED,
+                    "error": f"Lease expired after {max_attempts} attempts",
+                    "finished_at": now,
+                    "lease_until": None,
+                }
+            },
+        )
+        doc = await self._updates.find_one_and_update(
+            {"$or": [{"status": PENDING}, {**expired, "attempts": {"$lt": max_attempts}}]},
+            {
+                "$set": {"status": PROCESSING, "lease_until": now + timedelta(seconds=lease_seconds)},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("update_id", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if not doc:
+            return None
+        return TelegramUpdateJob(
+            update_id=doc["update_id"],
+            payload=doc["payload"],
+            status=doc["status"],
+            attempts=doc["attempts"],
+            created_at=doc["created_at"],
+            lease_until=doc.get("lease_until"),
+        )
+
+    async def extend(self, update_ids: list[int], lease_seconds: float) -> None:
+        if not update_ids:
+            return
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+        await self._updates.update_many(
+            {"update_id": {"$in": update_ids}, "status": PROCESSING},
+            {"$set": {"lease_until": lease_until}},
+        )
+
+    async def has_effect(self, update_id: int, effect: str) -> bool:
+        doc = await self._updates.find_one({"update_id": update_id, "effects": effect}, {"_id": 1})
+        return doc is not None
+
+    async def record_effect(self, update_id: int, effect: str) -> None:
+        await self._updates.update_one({"update_id": update_id}, {"$addToSet": {"effects": effect}})
+
+    async def complete(self, update_id: int) -> None:
+        await self._updates.update_one(
+            {"update_id": update_id},
+            {"$set": {"status": DONE, "finished_at": datetime.now(timezone.utc), "lease_until": None}},
+        )
+
+    async def fail(self, update_id: int, error: str) -> None:
+        await self._updates.update_one(
+            {"update_id": update_id},
+            {
+                "$set": {
+                    "status": FAILED,
+                    "error": error,
+                    "finished_at": datetime.now(timezone.utc),
+                    "lease_until": None,
+                }
+            },
+        )
@@ -1,5 +1,7 @@
 from datetime import datetime, timezone
 from bson import ObjectId
+from pydantic import ValidationError
+from pymongo import ReturnDocument
 from domain.models.tenant import Tenant
 from domain.models.tenant_config import TenantConfig
 
@@ -9,10 +11,8 @@ class TenantRepositoryMongo:
         self._tenants = db["tenants"]
         self._configs = db["tenant_configs"]
 
-    async def get_by_code(self, code: str) -> Tenant | None:
-        doc = await self._tenants.find_one({"short_code": code})
-        if not doc:
-            return None
+    @staticmethod
+    def _to_tenant(doc: dict) -> Tenant:
         return Tenant(
             id=str(doc["_id"]),
             name=doc["name"],
@@ -22,18 +22,81 @@ class TenantRepositoryMongo:
             updated_at=doc["updated_at"],
         )
 
+    @staticmethod
+    def _to_config(doc: dict) -> TenantConfig:
+        return TenantConfig(
+            tenant_id=str(doc["tenant_id"]),
+            layout=doc["layout"],
+            refresh_seconds=doc["refresh_seconds"],
+            swap_seconds=doc["swap_seconds"],
+            menu_mode=doc["menu_mode"],
+            show_youtube=doc.get("show_youtube", False),
+            youtube_url=doc.get("youtube_url"),
+            show_weather=doc.get("show_weather", False),
+            weather_lang=doc.get("weather_lang", "es"),
+            weather_lat=doc.get("weather_lat"),
+            weather_lon=doc.get("weather_lon"),
+            theme=doc["theme"],
+            board_header_text=doc["board_header_text"],
+            stops=doc.get("stops", []),
+            line_arrive_default=doc.get("line_arrive_default"),
+            timezone=doc.get("timezone"),
+            updated_at=doc.get("updated_at"),
+        )
+
+    async def get_by_code(self, code: str) -> Tenant | None:
+        doc = await self._tenants.find_one({"short_code": code})
+        if not doc:
+            return None
+        return self._to_tenant(doc)
+
+    async def get_with_config_by_code(self, code: str) -> tuple[Tenant | None, TenantConfig | None]:
+        pipeline = [
+            {"$match": {"short_code": code}},
+            {"$limit": 1},
+            {
+                "$lookup": {
+                    "from": "tenant_configs",
+                    "localField": "_id",
+                    "foreignField": "tenant_id",
+                    "as": "configs",
+                }
+            },
+        ]
+        docs = await self._tenants.aggregate(pipeline).to_list(length=1)
+        if not docs:
+            return None, None
+        doc = docs[0]
+        configs = doc.get("configs") or []
+        config = self._to_config(configs[0]) if configs else None
+        return self._to_tenant(doc), config
+
+    async def get_many_with_config_by_codes(
+        self, codes: list[str]
+    ) -> list[tuple[Tenant, TenantConfig | None]]:
+        pipeline = [
+            {"$match": {"short_code": {"$in": codes}}},
+            {
+                "$lookup": {
+                    "from": "tenant_configs",
+                    "localField": "_id",
+                    "foreignField": "tenant_id",
+                    "as": "configs",
+                }
+            },
+        ]
+        results: list[tuple[Tenant, TenantConfig | None]] = []
+        async for doc in self._tenants.aggregate(pipeline):
+            configs = doc.get("configs") or []
+            config = self._to_config(configs[0]) if configs else None
+            results.append((self._to_tenant(doc), config))
+        return results
+
     async def get_by_id(self, tenant_id: str) -> Tenant | None:
         doc = await self._tenants.find_one({"_id": ObjectId(tenant_id)})
         if not doc:
             return None
-        return Tenant(
-            id=str(doc["_id"]),
-            name=doc["name"],
-            short_code=doc["short_code"],
-            is_active=doc.get("is_active", True),
-            created_at=doc["created_at"],
-            updated_at=doc["updated_at"],
-        )
+        return self._to_tenant(doc)
 
     async def create_tenant(self, name: str, code: str) -> Tenant:
         now = datetime.now(timezone.utc)
@@ -58,44 +121,37 @@ class TenantRepositoryMongo:
         doc = await self._configs.find_one({"tenant_id": ObjectId(tenant_id)})
         if not doc:
             return None
-        return TenantConfig(
-            tenant_id=str(doc["tenant_id"]),
-            layout=doc["layout"],
-            refresh_seconds=doc["refresh_seconds"],
-            swap_seconds=doc["swap_seconds"],
-            menu_mode=doc["menu_mode"],
-            show_youtube=doc.get("show_youtube", False),
-            youtube_url=doc.get("youtube_url"),
-            show_weather=doc.get("show_weather", False),
-            weather_lang=doc.get("weather_lang", "es"),
-            weather_lat=doc.get("weather_lat"),
-            weather_lon=doc.get("weather_lon"),
-            theme=doc["theme"],
-            board_header_text=doc["board_header_text"],
-            stops=doc.get("stops", []),
-            line_arrive_default=doc.get("line_arrive_default"),
-            timezone=doc.get("timezone"),
-        )
+        return self._to_config(doc)
+
+    async def get_active_stops(self) -> set[tuple[str, str]]:
+        pipeline = [
+            {"$match": {"stops.0": {"$exists": True}}},
+            {
+                "$lookup": {
+                    "from": "tenants",
+                    "localField": "tenant_id",
+                    "foreignField": "_id",
+                    "as": "tenant",
+                }
+            },
+            {"$match": {"tenant.0": {"$exists": True}, "tenant.is_active": {"$ne": False}}},
+            {"$project": {"tenant": 0}},
+        ]
+        stop_keys: set[tuple[str, str]] = set()
+        async for doc in self._configs.aggregate(pipeline):
+            try:
+                config = self._to_config(doc)
+            except (KeyError, ValidationError):
+                continue
+            stop_keys.update(config.stop_keys())
+        return stop_keys
 
     async def create_default_config(self, tenant_id: str, defaults: dict) -> TenantConfig:
         now = datetime.now(timezone.utc)
-        doc = {"tenant_id": ObjectId(tenant_id), **defaults, "updated_at": now}
-        await self._configs.insert_one(doc)
-        return TenantConfig(
-            tenant_id=str(doc["tenant_id"]),
-            layout=doc["layout"],
-            refresh_seconds=doc["refresh_seconds"],
-            swap_seconds=doc["swap_seconds"],
-            menu_mode=doc["menu_mode"],
-            show_youtube=doc.get("show_youtube", False),
-            youtube_url=doc.get("youtube_url"),
-            show_weather=doc.get("show_weather", False),
-            weather_lang=doc.get("weather_lang", "es"),
-            weather_lat=doc.get("weather_lat"),
-            weather_lon=doc.get("weather_lon"),
-            theme=doc["theme"],
-            board_header_text=doc["board_header_text"],
-            stops=doc.get("stops", []),
-            line_arrive_default=doc.get("line_arrive_default"),
-            timezone=doc.get("timezone"),
+        doc = await self._configs.find_one_and_update(
+            {"tenant_id": ObjectId(tenant_id)},
+            {"$setOnInsert": {**defaults, "updated_at": now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
         )
+        return self._to_config(doc)
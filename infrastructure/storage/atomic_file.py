@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import AsyncIterable
+import asyncio
+import os
+import tempfile
+
+
+def _open_temp(directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False)
+
+
+def _finish(handle, destination: Path) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+    os.replace(handle.name, destination)
+
+
+def _discard(handle) -> None:
+    handle.close()
+    Path(handle.name).unlink(missing_ok=True)
+
+
+async def write_stream_atomic(chunks: AsyncIterable[bytes], destination: Path) -> int:
+    handle = await asyncio.to_thread(_open_temp, destination.parent)
+    written = 0
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(handle.write, chunk)
+            written += len(chunk)
+        await asyncio.to_thread(_finish, handle, destination)
+    except BaseException:
+        await asyncio.to_thread(_discard, handle)
+        raise
+    return written
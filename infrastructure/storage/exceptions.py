@@ -0,0 +1,2 @@
+class UploadStorageError(Exception):
+    pass
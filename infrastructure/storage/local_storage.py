@@ -0,0 +1,41 @@
+from pathlib import Path
+import asyncio
+import os
+import shutil
+import uuid
+
+from infrastructure.storage.exceptions import UploadStorageError
+
+
+class LocalUploadStorage:
+    def __init__(self, root: Path, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> None:
+        try:
+            await asyncio.to_thread(self._copy, source, self._path(key))
+        except OSError as exc:
+            raise UploadStorageError(f"Could not store {key}: {exc}") from exc
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+    async def close(self) -> None:
+        pass
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    @staticmethod
+    def _copy(source: Path, target: Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            shutil.copyfile(source, temp)
+            os.replace(temp, target)
+        finally:
+            temp.unlink(missing_ok=True)
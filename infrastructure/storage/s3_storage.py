@@ -0,0 +1,163 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator
+from urllib.parse import quote
+import asyncio
+import hashlib
+import hmac
+
+import httpx
+
+from infrastructure.storage.exceptions import UploadStorageError
+from infrastructure.storage.upload_storage import immutable_cache_control
+
+EMPTY_PAYLOAD_HASH = hashlib.sha256(b"").hexdigest()
+# Uploads are streamed from disk, so the body is not hashed up front; TLS protects it in transit.
+UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode(), hashlib.sha256).digest()
+
+
+def sign_v4(
+    method: str,
+    host: str,
+    path: str,
+    headers: dict[str, str],
+    payload_hash: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    now: datetime,
+    service: str = "s3",
+) -> dict[str, str]:
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = now.strftime("%Y%m%d")
+    signed = {
+        **{name.lower(): value.strip() for name, value in headers.items()},
+        "host": host,
+        "x-amz-content-sha256": payload_hash,
+        "x-amz-date": amz_date,
+    }
+    names = sorted(signed)
+    canonical_request = "\n".join(
+        [
+            method,
+            quote(path, safe="/~"),
+            "",
+            "".join(f"{name}:{signed[name]}\n" for name in names),
+            ";".join(names),
+            payload_hash,
+        ]
+    )
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join(
+        ["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest()]
+    )
+    signing_key = _hmac(
+        _hmac(_hmac(_hmac(f"AWS4{secret_key}".encode(), date), region), service), "aws4_request"
+    )
+    signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+    signed["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={';'.join(names)}, Signature={signature}"
+    )
+    return signed
+
+
+class S3UploadStorage:
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        public_url: str,
+        cache_control: str,
+        timeout_seconds: float = 20,
+    ):
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self.public_url = public_url.rstrip("/")
+        self.cache_control = cache_control
+        self._client = httpx.AsyncClient(base_url=endpoint_url, timeout=timeout_seconds)
+
+    @classmethod
+    def from_settings(cls, settings) -> "S3UploadStorage":
+        return cls(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.S3_BUCKET,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+            public_url=settings.S3_PUBLIC_URL or f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{settings.S3_BUCKET}",
+            cache_control=immutable_cache_control(settings),
+        )
+
+    async def exists(self, key: str) -> bool:
+        response = await self._send("HEAD", key, b"", {}, EMPTY_PAYLOAD_HASH)
+        if response.status_code == 404:
+            return False
+        self._raise_for_status(key, response)
+        return True
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> None:
+        size = (await asyncio.to_thread(source.stat)).st_size
+        headers = {
+            "Content-Type": content_type,
+            "Cache-Control": self.cache_control,
+            "Content-Length": str(size),
+        }
+        response = await self._send("PUT", key, self._read_chunks(source), headers, UNSIGNED_PAYLOAD)
+        self._raise_for_status(key, response)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def _send(
+        self,
+        method: str,
+        key: str,
+        body: bytes | AsyncIterator[bytes],
+        headers: dict[str, str],
+        payload_hash: str,
+    ) -> httpx.Response:
+        path = f"{self._client.base_url.path.rstrip('/')}/{self.bucket}/{key}"
+        signed = sign_v4(
+            method,
+            self._client.base_url.netloc.decode(),
+            path,
+            headers,
+            payload_hash,
+            self.access_key,
+            self.secret_key,
+            self.region,
+            datetime.now(timezone.utc),
+        )
+        signed.pop("host")
+        try:
+            return await self._client.request(method, quote(path, safe="/~"), content=body, headers=signed)
+        except httpx.HTTPError as exc:
+            raise UploadStorageError(f"{method} {key} failed: {exc}") from exc
+
+    @staticmethod
+    async def _read_chunks(source: Path) -> AsyncIterator[bytes]:
+        handle = await asyncio.to_thread(source.open, "rb")
+        try:
+            while chunk := await asyncio.to_thread(handle.read, UPLOAD_CHUNK_BYTES):
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    @staticmethod
+    def _raise_for_status(key: str, response: httpx.Response) -> None:
+        if response.status_code >= 400:
+            raise UploadStorageError(f"Storing {key} failed with HTTP {response.status_code}")
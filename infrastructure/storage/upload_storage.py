@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Protocol
+
+
+class UploadStorage(Protocol):
+    async def exists(self, key: str) -> bool:
+        ...
+
+    async def put_file(self, key: str, source: Path, content_type: str) -> None:
+        ...
+
+    def url_for(self, key: str) -> str:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+def immutable_cache_control(settings) -> str:
+    return f"public, max-age={settings.UPLOAD_CACHE_MAX_AGE_SECONDS}, immutable"
+
+
+def build_upload_storage(settings) -> UploadStorage:
+    if settings.UPLOAD_STORAGE == "s3":
+        from infrastructure.storage.s3_storage import S3UploadStorage
+
+        return S3UploadStorage.from_settings(settings)
+    if settings.UPLOAD_STORAGE == "local":
+        from infrastructure.storage.local_storage import LocalUploadStorage
+
+        return LocalUploadStorage(Path(settings.TELEGRAM_UPLOADS_DIR), "/uploads")
+    raise ValueError(f"Unknown upload storage {settings.UPLOAD_STORAGE}")
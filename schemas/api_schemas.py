@@ -37,6 +37,18 @@ class ArrivalsResponse(BaseModel):
 
     updated_at: datetime = Field(serialization_alias="updatedAt")
     items: list[ArrivalItem]
+    stale: bool = False
+
+
+class ArrivalsBatchRequest(BaseModel):
+    codes: list[str]
+
+
+class ArrivalsBatchResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    results: dict[str, ArrivalsResponse]
+    not_found: list[str] = Field(serialization_alias="notFound")
 
 
 class MenuResponse(BaseModel):
@@ -0,0 +1,78 @@
+from schemas.emt_schemas import EmtArrivalResponse
+
+
+class EmtPayloadError(ValueError):
+    pass
+
+
+class EmtArrival:
+    __slots__ = ("line", "stop", "destination", "estimate_arrive")
+
+    def __init__(self, line: str, stop: str, destination: str, estimate_arrive: int):
+        self.line = line
+        self.stop = stop
+        self.destination = destination
+        self.estimate_arrive = estimate_arrive
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EmtArrival):
+            return NotImplemented
+        return (self.line, self.stop, self.destination, self.estimate_arrive) == (
+            other.line,
+            other.stop,
+            other.destination,
+            other.estimate_arrive,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"EmtArrival(line={self.line!r}, stop={self.stop!r}, "
+            f"destination={self.destination!r}, estimate_arrive={self.estimate_arrive!r})"
+        )
+
+
+class EmtArrivals:
+    __slots__ = ("code", "arrivals")
+
+    def __init__(self, code: str, arrivals: list[EmtArrival]):
+        self.code = code
+        self.arrivals = arrivals
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "EmtArrivals":
+        try:
+            arrivals = [
+                EmtArrival(
+                    str(arrive["line"]),
+                    str(arrive["stop"]),
+                    str(arrive["destination"]),
+                    int(arrive["estimateArrive"]),
+                )
+                for data_item in payload["data"]
+                for arrive in data_item["Arrive"]
+            ]
+            return cls(str(payload["code"]), arrivals)
+        except (KeyError, TypeError, ValueError) as exc:
+            raise EmtPayloadError(f"Invalid EMT arrivals payload: {exc!r}") from exc
+
+    @classmethod
+    def from_model(cls, response: EmtArrivalResponse) -> "EmtArrivals":
+        arrivals = [
+            EmtArrival(arrive.line, arrive.stop, arrive.destination, arrive.estimateArrive)
+            for data_item in response.data
+            for arrive in data_item.Arrive
+        ]
+        return cls(response.code, arrivals)
+
+    def to_dict(self) -> dict:
+        return {
+            "code": self.code,
+            "arrivals": [
+                [arrive.line, arrive.stop, arrive.destination, arrive.estimate_arrive]
+                for arrive in self.arrivals
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EmtArrivals":
+        return cls(data["code"], [EmtArrival(*values) for values in data["arrivals"]])
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+
+from services.emt_madrid_service import EmtMadridService
+
+logger = logging.getLogger("emt.poller")
+
+
+class ArrivalsPoller:
+    def __init__(self, emt_service: EmtMadridService, tenant_repo, settings):
+        self.emt_service = emt_service
+        self.tenant_repo = tenant_repo
+        self.settings = settings
+        self._min_interval = 1 / settings.EMT_POLL_MAX_REQUESTS_PER_SECOND
+        self._next_slot = 0.0
+        self._stop_event = asyncio.Event()
+
+    async def run(self) -> None:
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                await self.refresh_once()
+            except Exception:
+                logger.exception("Arrivals refresh cycle failed")
+            elapsed = time.monotonic() - started
+            await self._sleep(max(0.0, self.settings.EMT_POLL_INTERVAL_SECONDS - elapsed))
+
+    async def refresh_once(self) -> int:
+        stop_keys = await self.tenant_repo.get_active_stops()
+        tasks = []
+        for stop_id, line_arrive in sorted(stop_keys):
+            if self._stop_event.is_set():
+                break
+            await self._acquire_slot()
+            refresh = self.emt_service.refresh_arrival_bus(
+                stop_id, line_arrive, max_age=self.settings.EMT_POLL_INTERVAL_SECONDS
+            )
+            tasks.append(asyncio.create_task(refresh))
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failures = sum(1 for result in results if isinstance(result, Exception))
+        if failures:
+            logger.warning("Arrivals refresh cycle: %s of %s stops failed", failures, len(results))
+        return len(results) - failures
+
+    async def _acquire_slot(self) -> None:
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._min_interval
+        if slot > now:
+            await self._sleep(slot - now)
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self) -> None:
+        self._stop_event.set()
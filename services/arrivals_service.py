@@ -0,0 +1,95 @@
+import asyncio
+import math
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from schemas.api_schemas import ArrivalItem, ArrivalsResponse
+from services.emt_madrid_service import ArrivalsCacheEntry, EmtMadridService
+
+
+class ArrivalsService:
+    def __init__(self, emt_service: EmtMadridService, settings):
+        self.emt_service = emt_service
+        self.settings = settings
+        self._payloads: OrderedDict[tuple, tuple[tuple, bytes]] = OrderedDict()
+
+    async def get_arrivals(self, config) -> ArrivalsResponse:
+        entries = await self._load_entries(config.stop_keys())
+        return self._build_response(entries)
+
+    async def get_arrivals_payload(self, config) -> bytes:
+        stop_keys = tuple(config.stop_keys())
+        entries = await self._load_entries(stop_keys)
+        signature = tuple(
+            None if isinstance(entry, BaseException) else (entry.fetched_at, entry.stale)
+            for entry in entries
+        )
+        cached = self._payloads.get(stop_keys)
+        if cached and cached[0] == signature:
+            self._payloads.move_to_end(stop_keys)
+            return cached[1]
+
+        payload = self._build_response(entries).model_dump_json(by_alias=True).encode()
+        if signature and None not in signature:
+            self._payloads[stop_keys] = (signature, payload)
+            self._payloads.move_to_end(stop_keys)
+            while len(self._payloads) > self.settings.ARRIVALS_PAYLOAD_CACHE_MAX_ENTRIES:
+                self._payloads.popitem(last=False)
+        return payload
+
+    async def _load_entries(self, stop_keys) -> list[ArrivalsCacheEntry | BaseException]:
+        tasks = [
+            self.emt_service.get_arrival_entry(stop_id, line_arrive)
+            for stop_id, line_arrive in stop_keys
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_arrivals_many(self, configs: dict) -> dict[str, ArrivalsResponse]:
+        stop_keys = sorted(
+            {key for config in configs.values() for key in config.stop_keys()}
+        )
+        semaphore = asyncio.Semaphore(self.settings.EMT_BATCH_MAX_CONCURRENCY)
+
+        async def fetch(stop_id: str, line_arrive: str):
+            async with semaphore:
+                return await self.emt_service.get_arrival_entry(stop_id, line_arrive)
+
+        results = await asyncio.gather(
+            *[fetch(stop_id, line_arrive) for stop_id, line_arrive in stop_keys],
+            return_exceptions=True,
+        )
+        entries_by_key = dict(zip(stop_keys, results))
+        return {
+            code: self._build_response(
+                [entries_by_key[key] for key in config.stop_keys()]
+            )
+            for code, config in configs.items()
+        }
+
+    @staticmethod
+    def _build_response(entries: list[ArrivalsCacheEntry | BaseException]) -> ArrivalsResponse:
+        items: list[ArrivalItem] = []
+        fetched: list[datetime] = []
+        stale = False
+        for entry in entries:
+            if isinstance(entry, BaseException):
+                continue
+            fetched.append(entry.updated_at)
+            stale = stale or entry.stale
+            for arrive in entry.response.arrivals:
+                eta_seconds = arrive.estimate_arrive
+                if eta_seconds < 0:
+                    continue
+                items.append(
+                    ArrivalItem(
+                        stop=arrive.stop,
+                        line=arrive.line,
+                        destination=arrive.destination,
+                        eta_seconds=eta_seconds,
+                        eta_minutes=max(1, math.ceil(eta_seconds / 60)),
+                    )
+                )
+
+        items.sort(key=lambda item: item.eta_seconds)
+        updated_at = min(fetched) if fetched else datetime.now(timezone.utc)
+        return ArrivalsResponse(updated_at=updated_at, items=items, stale=stale)
@@ -0,0 +1,149 @@
+import asyncio
+import inspect
+import logging
+from typing import Awaitable, Callable
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from infrastructure.clients.retry_policy import RetryPolicy
+
+logger = logging.getLogger("cache.invalidator")
+
+WATCHED_COLLECTIONS = {
+    "tenants": "updated_at",
+    "tenant_configs": "updated_at",
+    "daily_menus": "updated_at",
+    "menu_images": "created_at",
+}
+
+CHANGE_STREAMS_UNSUPPORTED = 40573
+WATCH_RETRY_MAX_SECONDS = 60.0
+
+InvalidationCallback = Callable[[str | None], Awaitable[None] | None]
+
+
+class CacheInvalidator:
+    def __init__(self, db, settings):
+        self.db = db
+        self.settings = settings
+        self.mode: str | None = None
+        self._subscribers: dict[str, list[InvalidationCallback]] = {
+            name: [] for name in WATCHED_COLLECTIONS
+        }
+        self._stamps: dict[str, tuple | None] = {}
+        self._pending: set[asyncio.Task] = set()
+        self._stop_event = asyncio.Event()
+
+    def subscribe(self, collection: str, callback: InvalidationCallback) -> None:
+        if collection not in self._subscribers:
+            raise ValueError(f"Collection {collection} is not watched")
+        self._subscribers[collection].append(callback)
+
+    async def run(self) -> None:
+        retry_policy = RetryPolicy(
+            base_delay_seconds=self.settings.CACHE_INVALIDATION_POLL_SECONDS,
+            max_delay_seconds=WATCH_RETRY_MAX_SECONDS,
+        )
+        failures = 0
+        while not self._stop_event.is_set():
+            try:
+                self.mode = "change_stream"
+                await self._watch()
+            except OperationFailure as exc:
+                if exc.code != CHANGE_STREAMS_UNSUPPORTED:
+                    failures += 1
+                    await self._retry_watch(exc, retry_policy.backoff(failures))
+                    continue
+                logger.warning("Change streams unavailable, polling version stamps: %s", exc)
+                self.mode = "poll"
+                await self._poll()
+                return
+            except PyMongoError as exc:
+                failures += 1
+                await self._retry_watch(exc, retry_policy.backoff(failures))
+
+    async def _retry_watch(self, exc: PyMongoError, delay: float) -> None:
+        logger.warning(
+            "Change stream interrupted, invalidating all caches and retrying in %.1fs: %s", delay, exc
+        )
+        self._dispatch_all()
+        await self._sleep(delay)
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": list(WATCHED_COLLECTIONS)}}}]
+        async with self.db.watch(pipeline, full_document="updateLookup") as stream:
+            while not self._stop_event.is_set():
+                change = await stream.try_next()
+                if change is not None:
+                    self.handle_change(change)
+
+    def handle_change(self, change: dict) -> None:
+        collection = change.get("ns", {}).get("coll")
+        if collection not in self._subscribers:
+            return
+        tenant_id = None
+        if collection == "tenants":
+            tenant_id = change.get("documentKey", {}).get("_id")
+        elif change.get("fullDocument"):
+            tenant_id = change["fullDocument"].get("tenant_id")
+        self._dispatch(collection, str(tenant_id) if tenant_id else None)
+
+    async def _poll(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                await self.poll_once()
+            except PyMongoError as exc:
+                logger.warning("Version stamp poll failed: %s", exc)
+            await self._sleep(self.settings.CACHE_INVALIDATION_POLL_SECONDS)
+
+    async def poll_once(self) -> None:
+        for collection, field in WATCHED_COLLECTIONS.items():
+            if not self._subscribers[collection]:
+                continue
+            stamp = await self._version_stamp(collection, field)
+            previous = self._stamps.get(collection)
+            self._stamps[collection] = stamp
+            if previous is not None and previous != stamp:
+                self._dispatch(collection, None)
+
+    async def _version_stamp(self, collection: str, field: str) -> tuple:
+        documents = self.db[collection]
+        latest = await documents.find_one({}, sort=[(field, -1)], projection={field: 1})
+        count = await documents.estimated_document_count()
+        return count, latest.get(field) if latest else None
+
+    def _dispatch(self, collection: str, tenant_id: str | None) -> None:
+        for callback in self._subscribers[collection]:
+            try:
+                result = callback(tenant_id)
+            except Exception:
+                logger.exception("Cache invalidation callback failed for %s", collection)
+                continue
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._pending.add(task)
+                task.add_done_callback(lambda done: self._finish_callback(collection, done))
+
+    def _finish_callback(self, collection: str, task: asyncio.Task) -> None:
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(
+                "Cache invalidation callback failed for %s", collection, exc_info=task.exception()
+            )
+
+    def _dispatch_all(self) -> None:
+        for collection in self._subscribers:
+            self._dispatch(collection, None)
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def wait_for_callbacks(self) -> None:
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -0,0 +1,173 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import time
+
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from infrastructure.clients.openweather_client import OpenWeatherClientError
+from services.etag_utils import build_body_etag
+from services.menu_service import MenuService
+from services.tenant_config_utils import build_tenant_config_response
+from services.tenant_service import TenantService, normalize_short_code
+from services.weather_service import WeatherCellKey, WeatherService
+
+logger = logging.getLogger("display.snapshot")
+
+SECTIONS = ("config", "menu", "weather")
+
+
+@dataclass
+class DisplaySnapshot:
+    tenant: Tenant
+    config: TenantConfig
+    weather_key: WeatherCellKey | None = None
+    sections: dict[str, bytes] = field(default_factory=dict)
+    expires: dict[str, float] = field(default_factory=dict)
+    dirty: set[str] = field(default_factory=set)
+    body: bytes = b""
+    etag: str = ""
+    expires_at: float = 0.0
+
+
+class DisplaySnapshotService:
+    def __init__(
+        self,
+        tenant_service: TenantService,
+        menu_service: MenuService,
+        weather_service: WeatherService,
+        settings,
+    ):
+        self.tenant_service = tenant_service
+        self.menu_service = menu_service
+        self.weather_service = weather_service
+        self.settings = settings
+        self._snapshots: OrderedDict[str, DisplaySnapshot] = OrderedDict()
+        self._code_by_id: dict[str, str] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.rebuilds = 0
+        weather_service.add_listener(self.on_weather_updated)
+
+    async def get_snapshot(self, code: str) -> DisplaySnapshot | None:
+        code = normalize_short_code(code)
+        snapshot = self._snapshots.get(code)
+        if snapshot and not snapshot.dirty and time.monotonic() < snapshot.expires_at:
+            self._snapshots.move_to_end(code)
+            self.hits += 1
+            return snapshot
+
+        task = self._inflight.get(code)
+        if task is None:
+            task = asyncio.create_task(self._rebuild(code))
+            self._inflight[code] = task
+            task.add_done_callback(lambda _: self._inflight.pop(code, None))
+        return await asyncio.shield(task)
+
+    def mark_dirty(self, tenant_id: str | None, *sections: str) -> None:
+        if tenant_id is None:
+            targets = list(self._snapshots.values())
+        else:
+            code = self._code_by_id.get(tenant_id)
+            snapshot = self._snapshots.get(code) if code else None
+            targets = [snapshot] if snapshot else []
+        for snapshot in targets:
+            snapshot.dirty.update(sections)
+
+    def on_weather_updated(self, key: WeatherCellKey) -> None:
+        for snapshot in self._snapshots.values():
+            if snapshot.weather_key == key:
+                snapshot.dirty.add("weather")
+
+    def stats(self) -> dict:
+        return {"entries": len(self._snapshots), "hits": self.hits, "rebuilds": self.rebuilds}
+
+    async def _rebuild(self, code: str) -> DisplaySnapshot | None:
+        self.rebuilds += 1
+        now = time.monotonic()
+        snapshot = self._snapshots.get(code)
+        if snapshot is None or "config" in snapshot.dirty or snapshot.expires.get("config", 0.0) <= now:
+            stale = set(SECTIONS)
+        else:
+            stale = snapshot.dirty | {name for name, expires in snapshot.expires.items() if expires <= now}
+        if snapshot:
+            snapshot.dirty.clear()
+
+        if "config" in stale:
+            tenant, config = await self.tenant_service.get_tenant_and_config(code)
+            if not tenant or not config:
+                self._remove(code)
+                return None
+            if snapshot is None:
+                snapshot = DisplaySnapshot(tenant=tenant, config=config)
+            snapshot.tenant = tenant
+            snapshot.config = config
+            snapshot.weather_key = None
+            if config.show_weather:
+                snapshot.weather_key = self.weather_service.cell_key(
+                    config.weather_lat, config.weather_lon, config.weather_lang
+                )
+
+        names = [name for name in SECTIONS if name in stale]
+        results = await asyncio.gather(
+            *[self._build_section(snapshot, name) for name in names], return_exceptions=True
+        )
+        now = time.monotonic()
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                if name not in snapshot.sections:
+                    raise result
+                logger.warning("Keeping previous %s section for %s: %s", name, code, result)
+                continue
+            snapshot.sections[name] = result
+            snapshot.expires[name] = now + self._section_ttl(name)
+
+        snapshot.body = (
+            b'{"config":' + snapshot.sections["config"]
+            + b',"menu":' + snapshot.sections["menu"]
+            + b',"weather":' + snapshot.sections["weather"]
+            + b"}"
+        )
+        snapshot.etag = build_body_etag(snapshot.body)
+        snapshot.expires_at = min(snapshot.expires.values())
+        self._store(code, snapshot)
+        return snapshot
+
+    async def _build_section(self, snapshot: DisplaySnapshot, name: str) -> bytes:
+        tenant, config = snapshot.tenant, snapshot.config
+        if name == "config":
+            response = build_tenant_config_response(tenant, config, self.settings)
+            return response.model_dump_json(by_alias=True).encode()
+        if name == "menu":
+            menu = await self.menu_service.get_menu_response(tenant.id, config.timezone)
+            return menu.model_dump_json(by_alias=True).encode()
+        if not config.show_weather:
+            return b"null"
+        try:
+            weather = await self.weather_service.get_weather(tenant.short_code, config)
+        except OpenWeatherClientError:
+            return snapshot.sections.get("weather", b"null")
+        return weather.model_dump_json(by_alias=True).encode() if weather else b"null"
+
+    def _section_ttl(self, name: str) -> float:
+        if name == "config":
+            return self.settings.TENANT_CACHE_TTL_SECONDS
+        if name == "menu":
+            return self.settings.MENU_CACHE_TTL_SECONDS
+        return self.settings.WEATHER_REFRESH_SECONDS
+
+    def _store(self, code: str, snapshot: DisplaySnapshot) -> None:
+        previous_code = self._code_by_id.get(snapshot.tenant.id)
+        if previous_code and previous_code != code:
+            self._remove(previous_code)
+        self._snapshots[code] = snapshot
+        self._snapshots.move_to_end(code)
+        self._code_by_id[snapshot.tenant.id] = code
+        while len(self._snapshots) > self.settings.SNAPSHOT_MAX_ENTRIES:
+            self._remove(next(iter(self._snapshots)))
+
+    def _remove(self, code: str) -> None:
+        snapshot = self._snapshots.pop(code, None)
+        if snapshot and self._code_by_id.get(snapshot.tenant.id) == code:
+            del self._code_by_id[snapshot.tenant.id]
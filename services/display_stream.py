@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+import asyncio
+import logging
+import time
+
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from infrastructure.clients.openweather_client import OpenWeatherClientError
+from services.arrivals_service import ArrivalsService
+from services.menu_service import MenuService
+from services.tenant_service import TenantService, normalize_short_code
+from services.weather_service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@dataclass
+class FeedEntry:
+    config: TenantConfig
+    value: Any
+    expires_at: float
+
+
+class DisplayFeed:
+    def __init__(
+        self,
+        code: str,
+        tenant_service: TenantService,
+        arrivals_service: ArrivalsService,
+        menu_service: MenuService,
+        weather_service: WeatherService,
+    ):
+        self.code = code
+        self.tenant_service = tenant_service
+        self.arrivals_service = arrivals_service
+        self.menu_service = menu_service
+        self.weather_service = weather_service
+        self.subscribers = 0
+        self.loads = 0
+        self._entries: dict[str, FeedEntry] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def resolve(self) -> tuple[Tenant | None, TenantConfig | None]:
+        return await self.tenant_service.get_tenant_and_config(self.code)
+
+    async def load(self, name: str, tenant: Tenant, config: TenantConfig, ttl_seconds: float) -> Any:
+        entry = self._entries.get(name)
+        if entry and entry.config == config and time.monotonic() < entry.expires_at:
+            return entry.value
+
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.create_task(self._fetch(name, tenant, config, ttl_seconds))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, name: str, tenant: Tenant, config: TenantConfig, ttl_seconds: float) -> Any:
+        self.loads += 1
+        if name == "arrivals":
+            value = await self.arrivals_service.get_arrivals(config)
+        elif name == "menu":
+            value = await self.menu_service.get_menu_with_image(tenant.id, config.timezone)
+        else:
+            value = await self.weather_service.get_weather(tenant.short_code, config)
+        self._entries[name] = FeedEntry(config, value, time.monotonic() + ttl_seconds)
+        return value
+
+
+class DisplayStreamHub:
+    def __init__(
+        self,
+        tenant_service: TenantService,
+        arrivals_service: ArrivalsService,
+        menu_service: MenuService,
+        weather_service: WeatherService,
+        settings,
+    ):
+        self.tenant_service = tenant_service
+        self.arrivals_service = arrivals_service
+        self.menu_service = menu_service
+        self.weather_service = weather_service
+        self.settings = settings
+        self._feeds: dict[str, DisplayFeed] = {}
+
+    def stream(self, code: str, width: int | None = None) -> "DisplayStream":
+        return DisplayStream(self, normalize_short_code(code), width, self.menu_service, self.settings)
+
+    def acquire(self, code: str) -> DisplayFeed:
+        feed = self._feeds.get(code)
+        if feed is None:
+            feed = DisplayFeed(
+                code,
+                self.tenant_service,
+                self.arrivals_service,
+                self.menu_service,
+                self.weather_service,
+            )
+            self._feeds[code] = feed
+        feed.subscribers += 1
+        return feed
+
+    def release(self, code: str) -> None:
+        feed = self._feeds.get(code)
+        if feed is None:
+            return
+        feed.subscribers -= 1
+        if feed.subscribers <= 0:
+            del self._feeds[code]
+
+    def stats(self) -> dict:
+        return {
+            "feeds": len(self._feeds),
+            "subscribers": sum(feed.subscribers for feed in self._feeds.values()),
+        }
+
+
+class DisplayStream:
+    def __init__(
+        self,
+        hub: DisplayStreamHub,
+        code: str,
+        width: int | None,
+        menu_service: MenuService,
+        settings,
+    ):
+        self.hub = hub
+        self.code = code
+        self.width = width
+        self.menu_service = menu_service
+        self.settings = settings
+
+    def _channels(self, config: TenantConfig) -> list[tuple[str, int]]:
+        channels = [("arrivals", config.refresh_seconds), ("menu", config.refresh_seconds)]
+        if config.show_weather:
+            channels.append(("weather", self.settings.WEATHER_REFRESH_SECONDS))
+        return channels
+
+    async def events(self, is_disconnected: Callable[[], Awaitable[bool]]) -> AsyncIterator[str]:
+        feed = self.hub.acquire(self.code)
+        try:
+            yield "retry: 5000\n\n"
+            last_versions: dict[str, str] = {}
+            next_due: dict[str, float] = {}
+            last_config: TenantConfig | None = None
+            last_sent = time.monotonic()
+
+            while not await is_disconnected():
+                tenant, config = await feed.resolve()
+                if not tenant or not config:
+                    break
+                if config != last_config:
+                    next_due.clear()
+                    last_config = config
+
+                channels = self._channels(config)
+                now = time.monotonic()
+                for name, interval in channels:
+                    if now < next_due.get(name, 0.0):
+                        continue
+                    interval = max(1, interval)
+                    next_due[name] = now + interval
+                    try:
+                        value = await feed.load(name, tenant, config, interval / 2)
+                    except OpenWeatherClientError:
+                        continue
+                    except Exception:
+                        logger.exception("Stream %s update failed for tenant %s", name, tenant.id)
+                        continue
+                    version, payload = self._render(name, value)
+                    if last_versions.get(name) == version:
+                        continue
+                    last_versions[name] = version
+                    last_sent = time.monotonic()
+                    yield format_event(name, payload)
+
+                now = time.monotonic()
+                heartbeat = self.settings.STREAM_HEARTBEAT_SECONDS
+                if now - last_sent >= heartbeat:
+                    last_sent = now
+                    yield ": ping\n\n"
+
+                wake_at = min([*(next_due[name] for name, _ in channels), last_sent + heartbeat])
+                await asyncio.sleep(max(0.05, wake_at - time.monotonic()))
+        finally:
+            self.hub.release(self.code)
+
+    def _render(self, name: str, value: Any) -> tuple[str, str]:
+        if name == "menu":
+            menu, image = value
+            response = self.menu_service.build_menu_response(menu, image, self.width)
+            # updated_at falls back to "now" without a menu, so it is not part of the change check.
+            version = response.model_dump_json(by_alias=True, exclude={"updated_at"})
+            return version, response.model_dump_json(by_alias=True)
+        payload = value.model_dump_json(by_alias=True) if value else "null"
+        return payload, payload
@@ -1,37 +1,175 @@
-from datetime import datetime
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+import asyncio
 import logging
+import time
 
+from infrastructure.clients.exceptions import HttpClientResponseError
+from schemas.emt_compact import EmtArrivals, EmtPayloadError
 from schemas.emt_schemas import EmtArrivalResponse
+from services.emt_token_manager import EmtTokenManager
+from services.payload_capture import PayloadCapture
+from services.shared_cache import SharedCache
 
 logger = logging.getLogger("emt")
 
+TOKEN_REJECTED_STATUSES = (401, 403)
+TOKEN_REJECTED_CODE = "80"
+SUCCESS_CODE = "00"
+
+
+@dataclass
+class ArrivalsCacheEntry:
+    response: EmtArrivals
+    fetched_at: float
+    updated_at: datetime
+    stale: bool = False
+
 
 class EmtMadridService:
-    def __init__(self, http_client, settings):
+    def __init__(
+        self,
+        http_client,
+        settings,
+        shared_cache: SharedCache | None = None,
+        payload_capture: PayloadCapture | None = None,
+        token_manager: EmtTokenManager | None = None,
+    ):
         self.http_client = http_client
         self.settings = settings
+        self.shared_cache = shared_cache
+        self.payload_capture = payload_capture
+        self.token_manager = token_manager
+        self._cache: dict[tuple[str, str], ArrivalsCacheEntry] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def get_arrival_bus(self, stop_id: str, line_arrive: str) -> EmtArrivals:
+        entry = await self.get_arrival_entry(stop_id, line_arrive)
+        return entry.response
+
+    async def get_arrival_entry(self, stop_id: str, line_arrive: str) -> ArrivalsCacheEntry:
+        cache_entry = self._cache.get((stop_id, line_arrive))
+        now = time.monotonic()
+        if cache_entry and (now - cache_entry.fetched_at) < self.settings.EMT_ARRIVALS_CACHE_SECONDS:
+            return cache_entry
+        try:
+            return await self.refresh_arrival_bus(stop_id, line_arrive)
+        except Exception:
+            if cache_entry and (now - cache_entry.fetched_at) < self.settings.EMT_STALE_MAX_SECONDS:
+                return replace(cache_entry, stale=True)
+            raise
+
+    async def refresh_arrival_bus(
+        self, stop_id: str, line_arrive: str, max_age: float | None = None
+    ) -> ArrivalsCacheEntry:
+        key = (stop_id, line_arrive)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(stop_id, line_arrive, max_age))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
 
-    async def get_arrival_bus(self, stop_id: str, line_arrive: str) -> EmtArrivalResponse:
-        
+    async def _fetch_and_store(
+        self, stop_id: str, line_arrive: str, max_age: float | None = None
+    ) -> ArrivalsCacheEntry:
+        if self.shared_cache is None:
+            response = await self._fetch_arrival_bus(stop_id, line_arrive)
+            entry = ArrivalsCacheEntry(
+                response=response,
+                fetched_at=time.monotonic(),
+                updated_at=datetime.now(timezone.utc),
+            )
+        else:
+            entry = await self._load_shared(stop_id, line_arrive, max_age)
+        self._cache[(stop_id, line_arrive)] = entry
+        return entry
+
+    async def _load_shared(
+        self, stop_id: str, line_arrive: str, max_age: float | None
+    ) -> ArrivalsCacheEntry:
+        async def fetch() -> dict:
+            response = await self._fetch_arrival_bus(stop_id, line_arrive)
+            return response.to_dict()
+
+        shared = await self.shared_cache.get_or_fetch(
+            f"arrivals:{stop_id}:{line_arrive}",
+            fetch,
+            ttl_seconds=self.settings.EMT_ARRIVALS_CACHE_SECONDS,
+            max_age=max_age or self.settings.EMT_ARRIVALS_CACHE_SECONDS,
+        )
+        return ArrivalsCacheEntry(
+            response=EmtArrivals.from_dict(shared.data),
+            fetched_at=shared.monotonic_fetched_at,
+            updated_at=datetime.fromtimestamp(shared.fetched_at, tz=timezone.utc),
+        )
+
+    def parse_payload(self, payload: dict) -> EmtArrivals:
+        if self.settings.EMT_FULL_VALIDATION:
+            return EmtArrivals.from_model(EmtArrivalResponse.model_validate(payload))
+        return EmtArrivals.from_payload(payload)
+
+    async def _fetch_arrival_bus(self, stop_id: str, line_arrive: str) -> EmtArrivals:
+        path = f"/v2/transport/busemtmad/stops/{stop_id}/arrives/{line_arrive}/"
+        body = {
+            "cultureInfo": "ES",
+            "Text_StopRequired_YN": "N",
+            "Text_EstimationsRequired_YN": "Y",
+            "Text_IncidencesRequired_YN": "N",
+            "DateTime_Referenced_Incidencies_YYYYMMDD": "year-month-day",
+        }
+        started = time.perf_counter()
+        status = None
         try:
-            line_arrive = "131"
-            #path = f"/v2/transport/busemtmad/stops/{stop_id}/arrives/{line_arrive}/"
-            path = f"/v2/transport/busemtmad/stops/{stop_id}/arrives/:lineArrive/"
+            status, payload = await self._post_with_token(path, body)
+            if self.payload_capture:
+                self.payload_capture.record("emt", f"{stop_id}:{line_arrive}", status, payload)
+            code = payload.get("code") if isinstance(payload, dict) else None
+            if code != SUCCESS_CODE:
+                # Error payloads parse as empty arrivals; raising keeps the last good entry as a stale fallback.
+                raise EmtPayloadError(f"EMT returned code {code}")
+            arrivals = self.parse_payload(payload)
+        except Exception as exc:
+            logger.warning(
+                "emt arrivals failed",
+                extra={
+                    "stop": stop_id,
+                    "line": line_arrive,
+                    "status": status,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "error": repr(exc),
+                },
+            )
+            raise
+        logger.info(
+            "emt arrivals fetched",
+            extra={
+                "stop": stop_id,
+                "line": line_arrive,
+                "status": status,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                "items": len(arrivals.arrivals),
+            },
+        )
+        return arrivals
+
+    async def _post_with_token(self, path: str, body: dict) -> tuple[int, dict]:
+        if self.token_manager is None or not self.token_manager.uses_login:
             headers = {"accessToken": self.settings.EMT_ACCESS_TOKEN}
-            body = {
-                "cultureInfo": "ES",
-                "Text_StopRequired_YN": "N",
-                "Text_EstimationsRequired_YN": "Y",
-                "Text_IncidencesRequired_YN": "N",
-                "DateTime_Referenced_Incidencies_YYYYMMDD": "year-month-day",
-            }
             response = await self.http_client.post(path, headers=headers, json=body)
+            return response.status_code, response.json()
+
+        for attempt in (1, 2):
+            token = await self.token_manager.get_token()
+            try:
+                response = await self.http_client.post(path, headers={"accessToken": token}, json=body)
+            except HttpClientResponseError as exc:
+                if attempt == 2 or exc.status_code not in TOKEN_REJECTED_STATUSES:
+                    raise
+                self.token_manager.invalidate(token)
+                continue
             payload = response.json()
-            logger.info("emt response stop=%s line=%s status=%s payload=%s", stop_id, line_arrive, response.status_code, payload)
-            print("emt response stop=%s line=%s status=%s payload=%s", stop_id, line_arrive, response.status_code, payload)
-            #print(datetime.now().strftime("%Y-%m-%d"))
-            return EmtArrivalResponse.model_validate(payload)
-        except Exception as e:
-            logger.error("Error fetching EMT arrivals for stop=%s line=%s: %s", stop_id, line_arrive, str(e))
-            print("Error fetching EMT arrivals for stop=%s line=%s: %s", stop_id, line_arrive, str(e))
-            raise
+            if attempt == 1 and isinstance(payload, dict) and payload.get("code") == TOKEN_REJECTED_CODE:
+                self.token_manager.invalidate(token)
+                continue
+            return response.status_code, payload
@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+import asyncio
+import logging
+import time
+
+from infrastructure.clients.exceptions import HttpClientError
+
+logger = logging.getLogger("emt.token")
+
+LOGIN_PATH = "/v1/mobilitylabs/user/login/"
+LOGIN_OK_CODES = ("00", "01")
+
+
+class EmtAuthError(Exception):
+    pass
+
+
+@dataclass
+class EmtToken:
+    value: str
+    expires_at: float
+    refresh_at: float
+
+
+class EmtTokenManager:
+    def __init__(self, http_client, settings):
+        self.http_client = http_client
+        self.settings = settings
+        self._token: EmtToken | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._stop_event = asyncio.Event()
+        self.logins = 0
+        self.failures = 0
+
+    @property
+    def uses_login(self) -> bool:
+        return bool(self.settings.EMT_CLIENT_ID and self.settings.EMT_PASS_KEY)
+
+    async def get_token(self) -> str:
+        if not self.uses_login:
+            return self.settings.EMT_ACCESS_TOKEN
+        token = self._token
+        now = time.monotonic()
+        if token and now < token.expires_at:
+            if now >= token.refresh_at:
+                self._start_refresh()
+            return token.value
+        token = await asyncio.shield(self._start_refresh())
+        return token.value
+
+    def invalidate(self, value: str) -> None:
+        if self._token and self._token.value == value:
+            logger.info("EMT rejected the access token, logging in again")
+            self._token = None
+
+    async def run(self) -> None:
+        if not self.uses_login:
+            return
+        while not self._stop_event.is_set():
+            token = self._token
+            if token and time.monotonic() < token.refresh_at:
+                await self._sleep(token.refresh_at - time.monotonic())
+                continue
+            try:
+                await asyncio.shield(self._start_refresh())
+            except Exception as exc:
+                logger.warning("EMT token refresh failed: %s", exc)
+                await self._sleep(self.settings.EMT_TOKEN_RETRY_SECONDS)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def stats(self) -> dict:
+        token = self._token
+        return {
+            "mode": "login" if self.uses_login else "static",
+            "logins": self.logins,
+            "failures": self.failures,
+            "expires_in": round(token.expires_at - time.monotonic(), 1) if token else None,
+        }
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._login())
+            self._refresh_task.add_done_callback(self._on_refresh_done)
+        return self._refresh_task
+
+    def _on_refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_task = None
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    async def _login(self) -> EmtToken:
+        headers = {"X-ClientId": self.settings.EMT_CLIENT_ID, "passKey": self.settings.EMT_PASS_KEY}
+        try:
+            response = await self.http_client.get(LOGIN_PATH, headers=headers)
+            payload = response.json()
+        except (HttpClientError, ValueError) as exc:
+            raise EmtAuthError(f"EMT login request failed: {exc}") from exc
+
+        code = payload.get("code") if isinstance(payload, dict) else None
+        if code not in LOGIN_OK_CODES:
+            raise EmtAuthError(f"EMT login rejected with code {code}")
+        try:
+            data = payload["data"][0]
+            value = str(data["accessToken"])
+            lifetime = float(data["tokenSecExpiration"])
+        except (KeyError, IndexError, TypeError, ValueError) as exc:
+            raise EmtAuthError(f"Invalid EMT login payload: {exc!r}") from exc
+        if lifetime <= 0:
+            raise EmtAuthError(f"EMT login returned a token that expires in {lifetime}s")
+
+        now = time.monotonic()
+        margin = min(self.settings.EMT_TOKEN_REFRESH_MARGIN_SECONDS, lifetime / 2)
+        refresh_at = max(now + lifetime - margin, now + self.settings.EMT_TOKEN_RETRY_SECONDS)
+        self._token = EmtToken(value=value, expires_at=now + lifetime, refresh_at=refresh_at)
+        self.logins += 1
+        logger.info("EMT token refreshed", extra={"expires_in": lifetime})
+        return self._token
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
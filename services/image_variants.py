@@ -0,0 +1,132 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import asyncio
+import logging
+import multiprocessing
+import os
+
+from domain.models.menu_image import ImageVariant, MenuImage
+
+logger = logging.getLogger("images.variants")
+
+
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+EXIF_ORIENTATION = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def variant_sizes(width: int, height: int, widths: list[int]) -> list[tuple[int, int]]:
+    return [
+        (target, max(1, round(height * target / width)))
+        for target in sorted({min(target, width) for target in widths}, reverse=True)
+    ]
+
+
+def variant_name(source: Path, width: int, image_format: str) -> str:
+    return f"{source.stem}_w{width}.{image_format}"
+
+
+def render_variants(source: str, widths: list[int], image_format: str, quality: int) -> list[dict]:
+    from PIL import Image, ImageOps
+
+    source_path = Path(source)
+    with Image.open(source_path) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    rendered = []
+    for width, height in variant_sizes(image.width, image.height, widths):
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        target = source_path.with_name(variant_name(source_path, width, image_format))
+        temp = target.with_name(f".{target.name}.tmp")
+        resized.save(temp, format=image_format.upper(), quality=quality, method=4)
+        os.replace(temp, target)
+        rendered.append({"name": target.name, "width": width, "height": height, "format": image_format})
+    return rendered
+
+
+def describe_variants(source: str, widths: list[int], image_format: str) -> list[dict]:
+    from PIL import Image
+
+    source_path = Path(source)
+    with Image.open(source_path) as opened:
+        width, height = opened.size
+        if opened.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+            width, height = height, width
+    return [
+        {"name": variant_name(source_path, target, image_format), "width": target, "height": target_height, "format": image_format}
+        for target, target_height in variant_sizes(width, height, widths)
+    ]
+
+
+def select_image_url(image: MenuImage | None, width: int | None = None) -> str | None:
+    if image is None:
+        return None
+    # Without a screen width there is nothing to size against, so serve the original as uploaded.
+    if not image.variants or not width:
+        return image.url
+    variants = sorted(image.variants, key=lambda variant: variant.width)
+    for variant in variants:
+        if variant.width >= width:
+            return variant.url
+    return variants[-1].url
+
+
+class ImageVariantService:
+    def __init__(self, settings, executor: ProcessPoolExecutor | None = None):
+        self.widths = [
+            int(item) for item in settings.IMAGE_VARIANT_WIDTHS.split(",") if item.strip()
+        ]
+        self.image_format = settings.IMAGE_VARIANT_FORMAT
+        self.quality = settings.IMAGE_VARIANT_QUALITY
+        self.max_workers = settings.IMAGE_PROCESS_WORKERS
+        self.enabled = bool(self.widths) and pillow_available()
+        if self.widths and not self.enabled:
+            logger.warning("Pillow is not installed, menu images are served without variants")
+        self._executor = executor
+
+    async def generate(self, source: Path, base_url: str) -> list[ImageVariant]:
+        if not self.enabled:
+            return []
+        if self._executor is None:
+            # The app process already runs threads (log listener, motor), so forking it is unsafe.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        loop = asyncio.get_running_loop()
+        rendered = await loop.run_in_executor(
+            self._executor, render_variants, str(source), self.widths, self.image_format, self.quality
+        )
+        return self._to_variants(rendered, base_url)
+
+    async def describe(self, source: Path, base_url: str) -> list[ImageVariant]:
+        if not self.enabled:
+            return []
+        described = await asyncio.to_thread(
+            describe_variants, str(source), self.widths, self.image_format
+        )
+        return self._to_variants(described, base_url)
+
+    @staticmethod
+    def _to_variants(items: list[dict], base_url: str) -> list[ImageVariant]:
+        return [
+            ImageVariant(
+                url=f"{base_url.rstrip('/')}/{item['name']}",
+                width=item["width"],
+                height=item["height"],
+                format=item["format"],
+            )
+            for item in items
+        ]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
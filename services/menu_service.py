@@ -1,6 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
 from zoneinfo import ZoneInfo
 
+from domain.models.menu_image import ImageVariant
+from schemas.api_schemas import MenuResponse
+from services.image_variants import select_image_url
+
 
 class MenuService:
     def __init__(self, menu_repo, tenant_repo):
@@ -15,10 +20,32 @@ class MenuService:
 
     async def get_menu_with_image(self, tenant_id: str, timezone_name: str | None):
         date_str = self._today_str(timezone_name)
-        menu = await self.menu_repo.get_menu_for_date(tenant_id, date_str)
-        image = await self.menu_repo.get_active_image(tenant_id)
+        menu, image = await asyncio.gather(
+            self.menu_repo.get_menu_for_date(tenant_id, date_str),
+            self.menu_repo.get_active_image(tenant_id),
+        )
         return menu, image
 
+    async def get_menu_response(
+        self, tenant_id: str, timezone_name: str | None, width: int | None = None
+    ) -> MenuResponse:
+        menu, image = await self.get_menu_with_image(tenant_id, timezone_name)
+        return self.build_menu_response(menu, image, width)
+
+    @staticmethod
+    def build_menu_response(menu, image, width: int | None = None) -> MenuResponse:
+        menu_title = menu.title if menu else "Menu of the day"
+        text_raw = menu.text_raw if menu and menu.text_raw else ""
+        sections = menu.sections if menu else None
+
+        return MenuResponse(
+            title=menu_title,
+            sections=sections,
+            text_raw=text_raw,
+            featured_image_url=select_image_url(image, width),
+            updated_at=(menu.updated_at if menu else datetime.now(timezone.utc)),
+        )
+
     async def update_menu_text(
         self, tenant_id: str, text_raw: str, title: str, timezone_name: str | None
     ):
@@ -35,5 +62,12 @@ class MenuService:
         date_str = self._today_str(timezone_name)
         return await self.menu_repo.get_menu_for_date(tenant_id, date_str)
 
-    async def update_featured_image(self, tenant_id: str, url: str, caption: str | None):
-        return await self.menu_repo.upsert_image(tenant_id, url, caption)
+    async def update_featured_image(
+        self,
+        tenant_id: str,
+        url: str,
+        caption: str | None,
+        variants: list[ImageVariant] | None = None,
+        update_id: int | None = None,
+    ):
+        return await self.menu_repo.upsert_image(tenant_id, url, caption, variants, update_id)
@@ -0,0 +1,36 @@
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+
+@dataclass
+class CapturedPayload:
+    source: str
+    key: str
+    status: int
+    captured_at: datetime
+    payload: Any
+
+
+class PayloadCapture:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: deque[CapturedPayload] = deque(maxlen=max(max_entries, 1))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def record(self, source: str, key: str, status: int, payload: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries.append(
+            CapturedPayload(source, key, status, datetime.now(timezone.utc), payload)
+        )
+
+    def entries(self) -> list[dict]:
+        return [asdict(entry) for entry in self._entries]
+
+    def clear(self) -> None:
+        self._entries.clear()
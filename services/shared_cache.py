@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+import asyncio
+import json
+import logging
+import time
+
+from infrastructure.cache.cache_backend import CacheBackend
+from infrastructure.cache.exceptions import CacheBackendError
+
+logger = logging.getLogger("cache.shared")
+
+FetchMany = Callable[[list[str]], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class SharedEntry:
+    data: Any
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    @property
+    def monotonic_fetched_at(self) -> float:
+        return time.monotonic() - self.age
+
+
+class SharedCache:
+    def __init__(self, backend: CacheBackend, settings):
+        self.backend = backend
+        self.prefix = settings.CACHE_KEY_PREFIX
+        self.lock_ttl_seconds = settings.CACHE_LOCK_TTL_SECONDS
+        self.lock_wait_seconds = settings.CACHE_LOCK_WAIT_SECONDS
+        self.lock_poll_seconds = 0.05
+        self.hits = 0
+        self.misses = 0
+        self.lock_waits = 0
+        self.errors = 0
+
+    async def get(self, key: str, max_age: float | None = None) -> SharedEntry | None:
+        return (await self.get_many([key], max_age)).get(key)
+
+    async def get_many(self, keys: list[str], max_age: float | None = None) -> dict[str, SharedEntry]:
+        try:
+            raw_values = await self.backend.get_many([self.prefix + key for key in keys])
+        except CacheBackendError as exc:
+            self._record_error("read", exc)
+            return {}
+
+        entries: dict[str, SharedEntry] = {}
+        for key, raw in zip(keys, raw_values):
+            entry = self._decode(raw) if raw is not None else None
+            if entry is None or (max_age is not None and entry.age >= max_age):
+                continue
+            entries[key] = entry
+        return entries
+
+    async def set(self, key: str, data: Any, ttl_seconds: float) -> SharedEntry:
+        entry = SharedEntry(data=data, fetched_at=time.time())
+        try:
+            await self.backend.set(self.prefix + key, self._encode(entry), ttl_seconds)
+        except CacheBackendError as exc:
+            self._record_error("write", exc)
+        return entry
+
+    async def delete(self, keys: list[str]) -> None:
+        try:
+            await self.backend.delete([self.prefix + key for key in keys])
+        except CacheBackendError as exc:
+            self._record_error("delete", exc)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        try:
+            await self.backend.delete_prefix(self.prefix + prefix)
+        except CacheBackendError as exc:
+            self._record_error("delete", exc)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl_seconds: float,
+        max_age: float | None = None,
+    ) -> SharedEntry | None:
+        async def fetch_many(keys: list[str]) -> dict[str, Any]:
+            data = await fetch()
+            return {} if data is None else {key: data}
+
+        entries = await self.get_or_fetch_many([key], fetch_many, ttl_seconds, max_age)
+        return entries.get(key)
+
+    async def get_or_fetch_many(
+        self,
+        keys: list[str],
+        fetch_many: FetchMany,
+        ttl_seconds: float,
+        max_age: float | None = None,
+    ) -> dict[str, SharedEntry]:
+        entries = await self.get_many(keys, max_age)
+        self.hits += len(entries)
+        pending = [key for key in keys if key not in entries]
+        deadline = time.monotonic() + self.lock_wait_seconds
+        while pending:
+            if time.monotonic() >= deadline:
+                logger.warning("Timed out waiting for shared cache locks on %s", pending)
+                entries.update(await self._fetch_and_store(pending, fetch_many, ttl_seconds))
+                break
+
+            tokens = {key: await self._acquire_lock(key) for key in pending}
+            owned = [key for key in pending if tokens[key] is not None]
+            if owned:
+                try:
+                    entries.update(await self._fetch_and_store(owned, fetch_many, ttl_seconds))
+                finally:
+                    for key in owned:
+                        await self._release_lock(key, tokens[key])
+                pending = [key for key in pending if tokens[key] is None]
+                if not pending:
+                    break
+
+            self.lock_waits += 1
+            await asyncio.sleep(self.lock_poll_seconds)
+            found = await self.get_many(pending, max_age)
+            self.hits += len(found)
+            entries.update(found)
+            pending = [key for key in pending if key not in found]
+        return entries
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "lock_waits": self.lock_waits,
+            "errors": self.errors,
+        }
+
+    async def _fetch_and_store(
+        self, keys: list[str], fetch_many: FetchMany, ttl_seconds: float
+    ) -> dict[str, SharedEntry]:
+        self.misses += len(keys)
+        fetched = await fetch_many(keys)
+        return {key: await self.set(key, data, ttl_seconds) for key, data in fetched.items()}
+
+    async def _acquire_lock(self, key: str) -> str | None:
+        try:
+            return await self.backend.acquire_lock(f"{self.prefix}lock:{key}", self.lock_ttl_seconds)
+        except CacheBackendError as exc:
+            self._record_error("lock", exc)
+            return ""
+
+    async def _release_lock(self, key: str, token: str) -> None:
+        if not token:
+            return
+        try:
+            await self.backend.release_lock(f"{self.prefix}lock:{key}", token)
+        except CacheBackendError as exc:
+            self._record_error("unlock", exc)
+
+    def _record_error(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        logger.warning("Shared cache %s failed: %s", operation, exc)
+
+    @staticmethod
+    def _encode(entry: SharedEntry) -> bytes:
+        return json.dumps(
+            {"fetched_at": entry.fetched_at, "data": entry.data}, separators=(",", ":")
+        ).encode()
+
+    @staticmethod
+    def _decode(raw: bytes) -> SharedEntry | None:
+        try:
+            payload = json.loads(raw)
+            return SharedEntry(data=payload["data"], fetched_at=float(payload["fetched_at"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Discarding undecodable shared cache entry")
+            return None
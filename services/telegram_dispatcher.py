@@ -0,0 +1,142 @@
+from collections import deque
+from typing import Awaitable, Callable
+import asyncio
+import logging
+
+from infrastructure.clients.retry_policy import RetryPolicy
+from schemas.telegram_schemas import TelegramUpdate
+
+logger = logging.getLogger("telegram.dispatcher")
+
+UpdateHandler = Callable[[TelegramUpdate], Awaitable[None]]
+DropHandler = Callable[[TelegramUpdate, Exception], Awaitable[None]]
+
+
+def update_chat_key(update: TelegramUpdate) -> int | str:
+    message = update.message or update.edited_message
+    return message.chat.id if message else f"update:{update.update_id}"
+
+
+class TelegramDispatcher:
+    def __init__(
+        self,
+        handle: UpdateHandler,
+        max_workers: int,
+        retry_policy: RetryPolicy,
+        on_drop: DropHandler | None = None,
+        track_offsets: bool = True,
+    ):
+        self.handle = handle
+        self.retry_policy = retry_policy
+        self.on_drop = on_drop
+        self.track_offsets = track_offsets
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._queues: dict[int | str, deque[TelegramUpdate]] = {}
+        self._runners: dict[int | str, asyncio.Task] = {}
+        self._pending: set[int] = set()
+        self._done: set[int] = set()
+        self._max_seen = -1
+        self._progress = asyncio.Event()
+        self.handled = 0
+        self.dropped = 0
+
+    @property
+    def next_offset(self) -> int:
+        return min(self._pending) if self._pending else self._max_seen + 1
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    @property
+    def pending_ids(self) -> list[int]:
+        return sorted(self._pending)
+
+    def submit(self, update: TelegramUpdate) -> bool:
+        update_id = update.update_id
+        if update_id in self._pending:
+            return False
+        if self.track_offsets and (update_id < self.next_offset or update_id in self._done):
+            return False
+        self._pending.add(update_id)
+        self._max_seen = max(self._max_seen, update_id)
+
+        key = update_chat_key(update)
+        self._queues.setdefault(key, deque()).append(update)
+        if key not in self._runners:
+            self._runners[key] = asyncio.create_task(self._run_chat(key))
+        return True
+
+    @property
+    def completed(self) -> int:
+        return self.handled + self.dropped
+
+    async def wait_for_progress(self, completed: int, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.completed == completed and loop.time() < deadline:
+            self._progress.clear()
+            try:
+                await asyncio.wait_for(self._progress.wait(), timeout=deadline - loop.time())
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self, grace_seconds: float) -> None:
+        runners = list(self._runners.values())
+        if runners:
+            await asyncio.wait(runners, timeout=grace_seconds)
+        for runner in runners:
+            runner.cancel()
+        await asyncio.gather(*runners, return_exceptions=True)
+
+    async def _run_chat(self, key: int | str) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                update = queue[0]
+                await self._process(update)
+                queue.popleft()
+                self._finish(update.update_id)
+        finally:
+            del self._queues[key]
+            del self._runners[key]
+
+    async def _process(self, update: TelegramUpdate) -> None:
+        max_attempts = self.retry_policy.max_attempts
+        for attempt in range(1, max_attempts + 1):
+            async with self._semaphore:
+                try:
+                    await self.handle(update)
+                    self.handled += 1
+                    return
+                except Exception as exc:
+                    error = exc
+            if attempt == max_attempts:
+                break
+            delay = self.retry_policy.backoff(attempt)
+            logger.warning(
+                "Telegram update %s failed (attempt %s), retrying in %.1fs: %s",
+                update.update_id,
+                attempt,
+                delay,
+                error,
+            )
+            await asyncio.sleep(delay)
+        self.dropped += 1
+        logger.error(
+            "Dropping telegram update %s after %s attempts: %s", update.update_id, max_attempts, error
+        )
+        if self.on_drop:
+            await self.on_drop(update, error)
+
+    def _finish(self, update_id: int) -> None:
+        self._pending.discard(update_id)
+        if self.track_offsets:
+            self._done.add(update_id)
+            offset = self.next_offset
+            self._done = {done_id for done_id in self._done if done_id >= offset}
+        self._progress.set()
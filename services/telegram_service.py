@@ -1,17 +1,43 @@
-import asyncio
+from contextlib import aclosing
 from pathlib import Path
+import asyncio
+import logging
+
+from pydantic import ValidationError
+
+from domain.repositories.telegram_update_queue import TelegramUpdateQueue
+from infrastructure.clients.retry_policy import RetryPolicy
+from infrastructure.clients.telegram_client import TelegramFileTooLarge
 from services.menu_service import MenuService
+from services.telegram_dispatcher import TelegramDispatcher
 from services.tenant_service import TenantService
+from services.upload_service import UploadService
 from schemas.telegram_schemas import TelegramMessage, TelegramUpdate
 
+logger = logging.getLogger("telegram")
+
+POLL_IDLE_SECONDS = 1.0
+SHUTDOWN_GRACE_SECONDS = 5.0
+
 
 class TelegramService:
-    def __init__(self, client, tenant_service: TenantService, menu_service: MenuService, binding_repo, settings):
+    def __init__(
+        self,
+        client,
+        tenant_service: TenantService,
+        menu_service: MenuService,
+        binding_repo,
+        settings,
+        upload_service: UploadService,
+        update_queue: TelegramUpdateQueue | None = None,
+    ):
         self.client = client
         self.tenant_service = tenant_service
         self.menu_service = menu_service
         self.binding_repo = binding_repo
         self.settings = settings
+        self.upload_service = upload_service
+        self.update_queue = update_queue
         self.allowed_updates = {
             item.strip()
             for item in settings.TELEGRAM_ALLOWED_UPDATE_TYPES.split(",")
@@ -20,7 +46,7 @@ class TelegramService:
         self.max_image_bytes = settings.TELEGRAM_MAX_IMAGE_MB * 1024 * 1024
         self._stop_event = asyncio.Event()
 
-    async def handle_update(self, update: TelegramUpdate, background_tasks=None) -> None:
+    async def handle_update(self, update: TelegramUpdate) -> None:
         if update.message and "message" not in self.allowed_updates:
             return
         if update.edited_message and "edited_message" not in self.allowed_updates:
@@ -30,56 +56,53 @@ class TelegramService:
         if not message:
             return
 
+        update_id = update.update_id
         chat_id = message.chat.id
         text = message.text.strip() if message.text else None
 
         binding = await self.binding_repo.get_by_chat_id(chat_id)
 
         if text and text.startswith("/link"):
-            await self._handle_link(message, text, binding)
+            await self._handle_link(update_id, message, text, binding)
             return
 
         if not binding or not binding.is_active:
-            await self.client.send_message(chat_id, "Please link this chat with /link <TENANT_CODE> first.")
+            await self._reply(update_id, chat_id, "Please link this chat with /link <TENANT_CODE> first.")
             return
 
         if text:
-            await self._handle_text(message, text, binding)
+            await self._handle_text(update_id, message, text, binding)
             return
 
         if message.photo:
-            if background_tasks:
-                background_tasks.add_task(self._handle_photo, message, binding)
-            else:
-                await self._handle_photo(message, binding)
+            await self._handle_photo(update_id, message, binding)
 
-    async def _handle_link(self, message: TelegramMessage, text: str, binding) -> None:
+    async def _handle_link(self, update_id: int, message: TelegramMessage, text: str, binding) -> None:
         chat_id = message.chat.id
         parts = text.split()
         if len(parts) < 2:
-            await self.client.send_message(chat_id, "Usage: /link <TENANT_CODE>")
+            await self._reply(update_id, chat_id, "Usage: /link <TENANT_CODE>")
             return
 
-        code = parts[1].strip().upper()
-        tenant, _ = await self.tenant_service.get_tenant_and_config(code)
+        tenant, _ = await self.tenant_service.get_tenant_and_config(parts[1])
         if not tenant:
-            await self.client.send_message(chat_id, "Invalid tenant code.")
+            await self._reply(update_id, chat_id, "Invalid tenant code.")
             return
 
         if binding and binding.tenant_id == tenant.id:
-            await self.client.send_message(chat_id, "Already linked to this tenant.")
+            await self._reply(update_id, chat_id, "Already linked to this tenant.")
             return
         if binding and binding.tenant_id != tenant.id:
-            await self.client.send_message(chat_id, "This chat is already linked to another tenant.")
+            await self._reply(update_id, chat_id, "This chat is already linked to another tenant.")
             return
 
         username = message.from_.username if message.from_ else None
         await self.binding_repo.upsert_binding(tenant.id, chat_id, username)
-        await self.client.send_message(
-            chat_id, f"✅ Linked to tenant: {tenant.name}. You can now update the menu."
+        await self._reply(
+            update_id, chat_id, f"✅ Linked to tenant: {tenant.name}. You can now update the menu."
         )
 
-    async def _handle_text(self, message: TelegramMessage, text: str, binding) -> None:
+    async def _handle_text(self, update_id: int, message: TelegramMessage, text: str, binding) -> None:
         chat_id = message.chat.id
         config = await self.tenant_service.get_config_for_tenant(binding.tenant_id)
         timezone_name = config.timezone if config else None
@@ -87,7 +110,8 @@ class TelegramService:
         if text.startswith("/menu"):
             payload = text[5:].strip()
             if not payload:
-                await self.client.send_message(
+                await self._reply(
+                    update_id,
                     chat_id,
                     "Send /menu <text> or just send a menu text message to update today.",
                 )
@@ -95,71 +119,126 @@ class TelegramService:
             await self.menu_service.update_menu_text(
                 binding.tenant_id, payload, "Menu of the day", timezone_name
             )
-            await self.client.send_message(chat_id, "📋 Menu updated ✅")
+            await self._reply(update_id, chat_id, "📋 Menu updated ✅")
             return
 
         if text.startswith("/publish"):
             await self.menu_service.publish_today(binding.tenant_id, timezone_name)
-            await self.client.send_message(chat_id, "📋 Menu updated ✅")
+            await self._reply(update_id, chat_id, "📋 Menu updated ✅")
             return
 
         if text.startswith("/status"):
             menu = await self.menu_service.get_status(binding.tenant_id, timezone_name)
             if not menu:
-                await self.client.send_message(chat_id, "No menu published yet.")
+                await self._reply(update_id, chat_id, "No menu published yet.")
                 return
-            await self.client.send_message(
+            await self._reply(
+                update_id,
                 chat_id,
                 f"Current menu: {menu.title}. Last update: {menu.updated_at.isoformat()}",
             )
             return
 
         if text.startswith("/"):
-            await self.client.send_message(chat_id, "Unknown command.")
+            await self._reply(update_id, chat_id, "Unknown command.")
             return
 
         await self.menu_service.update_menu_text(
             binding.tenant_id, text, "Menu of the day", timezone_name
         )
-        await self.client.send_message(chat_id, "📋 Menu updated ✅")
+        await self._reply(update_id, chat_id, "📋 Menu updated ✅")
 
-    async def _handle_photo(self, message: TelegramMessage, binding) -> None:
+    async def _handle_photo(self, update_id: int, message: TelegramMessage, binding) -> None:
         chat_id = message.chat.id
-        photos = message.photo or []
+        photos = [
+            photo
+            for photo in message.photo or []
+            if (photo.file_size or 0) <= self.max_image_bytes
+        ]
         if not photos:
+            if message.photo:
+                await self._reply(update_id, chat_id, "Image too large.")
+            return
+
+        tenant = await self.tenant_service.get_tenant_by_id(binding.tenant_id)
+        if not tenant:
+            await self._reply(update_id, chat_id, "Tenant not found.")
             return
 
         best = max(photos, key=lambda photo: photo.file_size or 0)
         file_info = await self.client.get_file(best.file_id)
-        data = await self.client.download_file(file_info.file_path)
-
-        if len(data) > self.max_image_bytes:
-            await self.client.send_message(chat_id, "Image too large.")
+        if (file_info.file_size or 0) > self.max_image_bytes:
+            await self._reply(update_id, chat_id, "Image too large.")
             return
 
-        tenant = await self.tenant_service.get_tenant_by_id(binding.tenant_id)
-        if not tenant:
-            await self.client.send_message(chat_id, "Tenant not found.")
+        extension = Path(file_info.file_path).suffix or ".jpg"
+        try:
+            async with aclosing(
+                self.client.stream_file(file_info.file_path, self.max_image_bytes)
+            ) as chunks:
+                stored = await self.upload_service.store_image(chunks, extension)
+        except TelegramFileTooLarge:
+            await self._reply(update_id, chat_id, "Image too large.")
             return
 
-        uploads_dir = Path(self.settings.TELEGRAM_UPLOADS_DIR) / tenant.short_code
-        uploads_dir.mkdir(parents=True, exist_ok=True)
-        filename = f"{message.message_id}_{best.file_unique_id}.jpg"
-        file_path = uploads_dir / filename
-        file_path.write_bytes(data)
+        await self.menu_service.update_featured_image(
+            binding.tenant_id, stored.url, message.caption, stored.variants, update_id
+        )
+        await self._reply(update_id, chat_id, "🖼 Image received and will be displayed ✅")
 
-        url = f"/uploads/{tenant.short_code}/{filename}"
-        await self.menu_service.update_featured_image(binding.tenant_id, url, message.caption)
-        await self.client.send_message(chat_id, "🖼 Image received and will be displayed ✅")
+    async def _reply(self, update_id: int, chat_id: int, text: str) -> None:
+        if self.update_queue and await self.update_queue.has_effect(update_id, "reply"):
+            return
+        await self.client.send_message(chat_id, text)
+        if self.update_queue:
+            await self.update_queue.record_effect(update_id, "reply")
 
     async def poll_updates(self) -> None:
-        offset = 0
-        while not self._stop_event.is_set():
-            updates = await self.client.get_updates(offset, 10, list(self.allowed_updates))
-            for raw in updates:
-                update = TelegramUpdate.model_validate(raw)
-                await self.handle_update(update)
-                offset = update.update_id + 1
+        poll_timeout = self.settings.TELEGRAM_POLL_TIMEOUT_SECONDS
+        retry_policy = RetryPolicy(
+            max_attempts=self.settings.TELEGRAM_RETRY_MAX_ATTEMPTS,
+            base_delay_seconds=self.settings.TELEGRAM_RETRY_BASE_SECONDS,
+            max_delay_seconds=self.settings.TELEGRAM_RETRY_MAX_SECONDS,
+        )
+        dispatcher = TelegramDispatcher(
+            self.handle_update, self.settings.TELEGRAM_DISPATCH_WORKERS, retry_policy
+        )
+        failures = 0
+        try:
+            while not self._stop_event.is_set():
+                completed = dispatcher.completed
+                try:
+                    updates = await self.client.get_updates(
+                        dispatcher.next_offset,
+                        0 if dispatcher.busy else poll_timeout,
+                        list(self.allowed_updates),
+                    )
+                except Exception as exc:
+                    failures += 1
+                    delay = retry_policy.backoff(failures)
+                    logger.warning("Telegram getUpdates failed, retrying in %.1fs: %s", delay, exc)
+                    await self._sleep(delay)
+                    continue
+                failures = 0
+
+                submitted = 0
+                for raw in updates:
+                    try:
+                        update = TelegramUpdate.model_validate(raw)
+                    except ValidationError as exc:
+                        logger.warning("Skipping invalid telegram update: %s", exc)
+                        continue
+                    submitted += dispatcher.submit(update)
+                if not submitted and dispatcher.busy:
+                    await dispatcher.wait_for_progress(completed, POLL_IDLE_SECONDS)
+        finally:
+            await dispatcher.close(SHUTDOWN_GRACE_SECONDS)
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
 
     def stop_polling(self) -> None:
         self._stop_event.set()
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+
+from pydantic import ValidationError
+
+from domain.repositories.telegram_update_queue import TelegramUpdateQueue
+from infrastructure.clients.retry_policy import RetryPolicy
+from schemas.telegram_schemas import TelegramUpdate
+from services.telegram_dispatcher import TelegramDispatcher
+from services.telegram_service import SHUTDOWN_GRACE_SECONDS, TelegramService
+
+logger = logging.getLogger("telegram.queue")
+
+
+class TelegramUpdateWorker:
+    def __init__(self, queue: TelegramUpdateQueue, telegram_service: TelegramService, settings):
+        self.queue = queue
+        self.telegram_service = telegram_service
+        self.settings = settings
+        self.max_in_flight = settings.TELEGRAM_DISPATCH_WORKERS
+        self.lease_seconds = settings.TELEGRAM_QUEUE_LEASE_SECONDS
+        self.renew_interval = self.lease_seconds / 3
+        self.dispatcher = TelegramDispatcher(
+            self._handle,
+            settings.TELEGRAM_DISPATCH_WORKERS,
+            RetryPolicy(
+                max_attempts=settings.TELEGRAM_RETRY_MAX_ATTEMPTS,
+                base_delay_seconds=settings.TELEGRAM_RETRY_BASE_SECONDS,
+                max_delay_seconds=settings.TELEGRAM_RETRY_MAX_SECONDS,
+            ),
+            on_drop=self._drop,
+            track_offsets=False,
+        )
+        self._stop_event = asyncio.Event()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        renew_at = loop.time() + self.renew_interval
+        try:
+            while not self._stop_event.is_set():
+                if loop.time() >= renew_at:
+                    await self.renew_leases()
+                    renew_at = loop.time() + self.renew_interval
+                try:
+                    claimed = await self.claim_available()
+                except Exception:
+                    logger.exception("Claiming telegram updates failed")
+                    claimed = 0
+                if not claimed:
+                    await self._sleep(
+                        min(self.settings.TELEGRAM_QUEUE_POLL_SECONDS, renew_at - loop.time())
+                    )
+        finally:
+            await self.dispatcher.close(SHUTDOWN_GRACE_SECONDS)
+
+    async def claim_available(self) -> int:
+        claimed = 0
+        while self.dispatcher.in_flight < self.max_in_flight and not self._stop_event.is_set():
+            job = await self.queue.claim(
+                self.lease_seconds, self.settings.TELEGRAM_RETRY_MAX_ATTEMPTS
+            )
+            if job is None:
+                break
+            claimed += 1
+            try:
+                update = TelegramUpdate.model_validate(job.payload)
+            except ValidationError as exc:
+                await self._mark(self.queue.fail, job.update_id, str(exc))
+                continue
+            self.dispatcher.submit(update)
+        return claimed
+
+    async def renew_leases(self) -> None:
+        update_ids = self.dispatcher.pending_ids
+        if not update_ids:
+            return
+        try:
+            await self.queue.extend(update_ids, self.lease_seconds)
+        except Exception:
+            logger.exception("Renewing telegram update leases failed")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    async def _handle(self, update: TelegramUpdate) -> None:
+        await self.telegram_service.handle_update(update)
+        await self._mark(self.queue.complete, update.update_id)
+
+    async def _drop(self, update: TelegramUpdate, error: Exception) -> None:
+        await self._mark(self.queue.fail, update.update_id, repr(error))
+
+    @staticmethod
+    async def _mark(operation, *args) -> None:
+        try:
+            await operation(*args)
+        except Exception:
+            logger.exception("Updating telegram update %s in the queue failed", args[0])
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+
+
+@dataclass
+class TenantCacheEntry:
+    tenant: Tenant
+    config: TenantConfig
+    fetched_at: float
+    config_document: tuple[bytes, str] | None = None
+
+
+class TenantCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, TenantCacheEntry] = OrderedDict()
+        self._code_by_id: dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_by_code(self, code: str) -> TenantCacheEntry | None:
+        entry = self._entries.get(code)
+        if entry and (time.monotonic() - entry.fetched_at) < self.ttl_seconds:
+            self._entries.move_to_end(code)
+            self.hits += 1
+            return entry
+        if entry:
+            self._remove(code)
+        self.misses += 1
+        return None
+
+    def get_by_id(self, tenant_id: str) -> TenantCacheEntry | None:
+        code = self._code_by_id.get(tenant_id)
+        if code is None:
+            self.misses += 1
+            return None
+        return self.get_by_code(code)
+
+    def get_config_document(self, tenant_id: str, config: TenantConfig) -> tuple[bytes, str] | None:
+        entry = self._entries.get(self._code_by_id.get(tenant_id, ""))
+        if entry is None or entry.config is not config:
+            return None
+        return entry.config_document
+
+    def set_config_document(self, tenant_id: str, config: TenantConfig, document: tuple[bytes, str]) -> None:
+        entry = self._entries.get(self._code_by_id.get(tenant_id, ""))
+        if entry is not None and entry.config is config:
+            entry.config_document = document
+
+    def put(self, tenant: Tenant, config: TenantConfig) -> None:
+        previous_code = self._code_by_id.get(tenant.id)
+        if previous_code and previous_code != tenant.short_code:
+            self._remove(previous_code)
+        self._entries[tenant.short_code] = TenantCacheEntry(
+            tenant=tenant,
+            config=config,
+            fetched_at=time.monotonic(),
+        )
+        self._entries.move_to_end(tenant.short_code)
+        self._code_by_id[tenant.id] = tenant.short_code
+        while len(self._entries) > self.max_entries:
+            oldest_code = next(iter(self._entries))
+            self._remove(oldest_code)
+
+    def evict(self, tenant_id: str | None) -> None:
+        if tenant_id is None:
+            self.clear()
+            return
+        code = self._code_by_id.get(tenant_id)
+        if code:
+            self._remove(code)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._code_by_id.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remove(self, code: str) -> None:
+        entry = self._entries.pop(code, None)
+        if entry and self._code_by_id.get(entry.tenant.id) == code:
+            del self._code_by_id[entry.tenant.id]
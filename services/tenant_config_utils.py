@@ -1,7 +1,29 @@
+from domain.models.tenant import Tenant
 from domain.models.tenant_config import TenantConfig
+from schemas.api_schemas import TenantConfigResponse
 
 
 def normalize_menu_mode(config: TenantConfig) -> str:
     if config.show_youtube:
         return "menuOnly"
     return config.menu_mode
+
+
+def build_tenant_config_response(tenant: Tenant, config: TenantConfig, settings) -> TenantConfigResponse:
+    return TenantConfigResponse(
+        tenant_name=tenant.name,
+        layout=config.layout,
+        refresh_seconds=config.refresh_seconds,
+        swap_seconds=config.swap_seconds,
+        menu_mode=normalize_menu_mode(config),
+        show_youtube=config.show_youtube,
+        youtube_url=config.youtube_url,
+        show_weather=config.show_weather,
+        weather_lang=config.weather_lang,
+        weather_lat=config.weather_lat,
+        weather_lon=config.weather_lon,
+        weather_refresh_seconds=settings.WEATHER_REFRESH_SECONDS,
+        theme=config.theme,
+        board_header_text=config.board_header_text,
+        stops=config.stops,
+    )
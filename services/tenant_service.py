@@ -1,11 +1,45 @@
+from typing import Callable
 import secrets
 from pymongo.errors import DuplicateKeyError
 
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from services.etag_utils import build_body_etag
+from services.shared_cache import SharedCache
+from services.tenant_cache import TenantCache
+
+
+def normalize_short_code(code: str) -> str:
+    return code.strip().upper()
+
+
+def shared_tenant_key(code: str) -> str:
+    return f"tenant:code:{code}"
+
+
+def shared_tenant_id_key(tenant_id: str) -> str:
+    return f"tenant:id:{tenant_id}"
+
+
+async def evict_shared_tenant(shared_cache: SharedCache, tenant_id: str | None) -> None:
+    if tenant_id is None:
+        await shared_cache.delete_prefix("tenant:")
+        return
+    await shared_cache.delete([shared_tenant_id_key(tenant_id)])
+
 
 class TenantService:
-    def __init__(self, repo, settings):
+    def __init__(
+        self,
+        repo,
+        settings,
+        cache: TenantCache | None = None,
+        shared_cache: SharedCache | None = None,
+    ):
         self.repo = repo
         self.settings = settings
+        self.cache = cache
+        self.shared_cache = shared_cache
         self._alphabet = "23456789ABCDEFGHJKLMNPQRSTUVWXYZ"
 
     def _generate_code(self) -> str:
@@ -31,26 +65,159 @@ class TenantService:
         }
 
     async def get_tenant_and_config(self, code: str):
-        tenant = await self.repo.get_by_code(code)
+        code = normalize_short_code(code)
+        if self.cache:
+            entry = self.cache.get_by_code(code)
+            if entry:
+                return entry.tenant, entry.config
+
+        if self.shared_cache:
+            tenant, config = await self._get_shared_tenant_and_config(code)
+        else:
+            tenant, config = await self._load_tenant_and_config(code)
+        if tenant and self.cache:
+            self.cache.put(tenant, config)
+        return tenant, config
+
+    async def _load_tenant_and_config(self, code: str):
+        tenant, config = await self.repo.get_with_config_by_code(code)
         if not tenant or not tenant.is_active:
             return None, None
-        config = await self.repo.get_config(tenant.id)
         if not config:
             config = await self.repo.create_default_config(tenant.id, self._default_config())
         return tenant, config
 
+    async def _get_shared_tenant_and_config(self, code: str):
+        resolved, stale = await self._read_shared([code])
+        if code in resolved:
+            return resolved[code]
+        if stale:
+            await self.shared_cache.delete([shared_tenant_key(code)])
+
+        loaded = {}
+
+        async def fetch() -> dict | None:
+            tenant, config = await self._load_tenant_and_config(code)
+            if not tenant:
+                return None
+            loaded[code] = (tenant, config)
+            await self.shared_cache.set(
+                shared_tenant_id_key(tenant.id),
+                self._shared_payload(tenant, config),
+                self.settings.TENANT_CACHE_TTL_SECONDS,
+            )
+            return {"id": tenant.id}
+
+        entry = await self.shared_cache.get_or_fetch(
+            shared_tenant_key(code), fetch, ttl_seconds=self.settings.TENANT_CACHE_TTL_SECONDS
+        )
+        if code in loaded:
+            return loaded[code]
+        if entry is None:
+            return None, None
+        resolved, _ = await self._read_shared([code])
+        return resolved.get(code, (None, None))
+
+    async def _read_shared(self, codes: list[str]) -> tuple[dict, list[str]]:
+        pointers = await self.shared_cache.get_many([shared_tenant_key(code) for code in codes])
+        tenant_ids = {
+            code: pointers[shared_tenant_key(code)].data["id"]
+            for code in codes
+            if shared_tenant_key(code) in pointers
+        }
+        if not tenant_ids:
+            return {}, []
+        payloads = await self.shared_cache.get_many(
+            [shared_tenant_id_key(tenant_id) for tenant_id in tenant_ids.values()]
+        )
+        resolved = {}
+        for code, tenant_id in tenant_ids.items():
+            entry = payloads.get(shared_tenant_id_key(tenant_id))
+            if entry is None:
+                continue
+            tenant, config = self._from_shared_payload(entry.data)
+            if tenant.short_code == code:
+                resolved[code] = (tenant, config)
+        return resolved, [code for code in tenant_ids if code not in resolved]
+
+    @staticmethod
+    def _shared_payload(tenant: Tenant, config: TenantConfig) -> dict:
+        return {"tenant": tenant.model_dump(mode="json"), "config": config.model_dump(mode="json")}
+
+    @staticmethod
+    def _from_shared_payload(data: dict) -> tuple[Tenant, TenantConfig]:
+        return Tenant.model_validate(data["tenant"]), TenantConfig.model_validate(data["config"])
+
+    async def get_tenants_and_configs(self, codes: list[str]) -> dict:
+        resolved = {}
+        missing = []
+        for code in codes:
+            entry = self.cache.get_by_code(code) if self.cache else None
+            if entry:
+                resolved[code] = (entry.tenant, entry.config)
+            else:
+                missing.append(code)
+
+        if missing and self.shared_cache:
+            shared, _ = await self._read_shared(missing)
+            for code, (tenant, config) in shared.items():
+                if self.cache:
+                    self.cache.put(tenant, config)
+                resolved[code] = (tenant, config)
+                missing.remove(code)
+
+        if missing:
+            for tenant, config in await self.repo.get_many_with_config_by_codes(missing):
+                if not tenant.is_active:
+                    continue
+                if not config:
+                    config = await self.repo.create_default_config(tenant.id, self._default_config())
+                if self.cache:
+                    self.cache.put(tenant, config)
+                if self.shared_cache:
+                    await self._store_shared(tenant, config)
+                resolved[tenant.short_code] = (tenant, config)
+        return resolved
+
     async def get_tenant_by_id(self, tenant_id: str):
+        if self.cache:
+            entry = self.cache.get_by_id(tenant_id)
+            if entry:
+                return entry.tenant
         return await self.repo.get_by_id(tenant_id)
 
     async def get_config_for_tenant(self, tenant_id: str):
+        if self.cache:
+            entry = self.cache.get_by_id(tenant_id)
+            if entry:
+                return entry.config
         return await self.repo.get_config(tenant_id)
 
+    async def _store_shared(self, tenant: Tenant, config: TenantConfig) -> None:
+        ttl_seconds = self.settings.TENANT_CACHE_TTL_SECONDS
+        await self.shared_cache.set(
+            shared_tenant_id_key(tenant.id), self._shared_payload(tenant, config), ttl_seconds
+        )
+        await self.shared_cache.set(shared_tenant_key(tenant.short_code), {"id": tenant.id}, ttl_seconds)
+
+    def get_config_document(
+        self, tenant: Tenant, config: TenantConfig, build: Callable[[], bytes]
+    ) -> tuple[bytes, str]:
+        document = self.cache.get_config_document(tenant.id, config) if self.cache else None
+        if document is None:
+            body = build()
+            document = (body, build_body_etag(body))
+            if self.cache:
+                self.cache.set_config_document(tenant.id, config, document)
+        return document
+
     async def create_tenant(self, name: str):
         for _ in range(10):
             code = self._generate_code()
             try:
                 tenant = await self.repo.create_tenant(name, code)
                 await self.repo.create_default_config(tenant.id, self._default_config())
+                # Lookup misses are never cached, so a new tenant has nothing to invalidate.
                 return tenant
             except DuplicateKeyError:
                 continue
@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import shutil
+import tempfile
+
+from domain.models.menu_image import ImageVariant
+from infrastructure.storage.atomic_file import write_stream_atomic
+from infrastructure.storage.upload_storage import UploadStorage
+from services.image_variants import ImageVariantService
+
+logger = logging.getLogger("uploads")
+
+IMAGES_PREFIX = "images/"
+
+
+@dataclass
+class StoredImage:
+    url: str
+    digest: str
+    variants: list[ImageVariant] = field(default_factory=list)
+    deduplicated: bool = False
+
+
+class UploadService:
+    def __init__(self, storage: UploadStorage, image_variants: ImageVariantService | None = None):
+        self.storage = storage
+        self.image_variants = image_variants
+
+    async def store_image(self, chunks: AsyncIterable[bytes], extension: str = ".jpg") -> StoredImage:
+        staging = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix="upload-"))
+        try:
+            digest = hashlib.sha256()
+            await write_stream_atomic(self._hashed(chunks, digest), staging / "original")
+            name = f"{digest.hexdigest()}{extension}"
+            source = staging / name
+            await asyncio.to_thread((staging / "original").replace, source)
+            return await self._publish(source, digest.hexdigest())
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging, True)
+
+    async def _publish(self, source: Path, digest: str) -> StoredImage:
+        key_prefix = f"{IMAGES_PREFIX}{digest[:2]}"
+        key = f"{key_prefix}/{source.name}"
+        deduplicated = not await self._put(key, source)
+
+        variants: list[ImageVariant] = []
+        if self.image_variants:
+            try:
+                variants = await self._variants(source, key_prefix, deduplicated)
+            except Exception:
+                logger.exception("Generating variants for %s failed, serving the original", key)
+        return StoredImage(
+            url=self.storage.url_for(key), digest=digest, variants=variants, deduplicated=deduplicated
+        )
+
+    async def _variants(self, source: Path, key_prefix: str, deduplicated: bool) -> list[ImageVariant]:
+        base_url = self.storage.url_for(key_prefix)
+        if deduplicated:
+            # The same digest was published before, so its variants only need re-rendering if one is missing.
+            expected = await self.image_variants.describe(source, base_url)
+            keys = [f"{key_prefix}/{variant.url.rsplit('/', 1)[-1]}" for variant in expected]
+            if expected and all(await asyncio.gather(*(self.storage.exists(key) for key in keys))):
+                return expected
+
+        rendered = await self.image_variants.generate(source, base_url)
+        for variant in rendered:
+            filename = variant.url.rsplit("/", 1)[-1]
+            await self._put(f"{key_prefix}/{filename}", source.with_name(filename))
+        return rendered
+
+    async def _put(self, key: str, source: Path) -> bool:
+        if await self.storage.exists(key):
+            return False
+        content_type = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+        await self.storage.put_file(key, source, content_type)
+        return True
+
+    @staticmethod
+    async def _hashed(chunks: AsyncIterable[bytes], digest) -> AsyncIterator[bytes]:
+        async for chunk in chunks:
+            digest.update(chunk)
+            yield chunk
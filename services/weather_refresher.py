@@ -0,0 +1,32 @@
+import asyncio
+import logging
+
+from services.weather_service import WeatherService
+
+logger = logging.getLogger("weather.refresher")
+
+
+class WeatherRefresher:
+    def __init__(self, weather_service: WeatherService, settings):
+        self.weather_service = weather_service
+        self.settings = settings
+        self._stop_event = asyncio.Event()
+
+    async def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                refreshed = await self.weather_service.refresh_due()
+                if refreshed:
+                    logger.info("Refreshed %s weather cells ahead of expiry", refreshed)
+            except Exception:
+                logger.exception("Weather refresh cycle failed")
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(),
+                    timeout=self.settings.WEATHER_SCHEDULER_INTERVAL_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self) -> None:
+        self._stop_event.set()
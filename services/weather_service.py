@@ -1,10 +1,21 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import asyncio
+import logging
+import math
 import time
+from typing import Callable
 
 from schemas.api_schemas import WeatherWidgetDto
 from schemas.openweather_schemas import OpenWeatherResponse
 from infrastructure.clients.openweather_client import OpenWeatherClient, OpenWeatherClientError
+from services.shared_cache import SharedCache
+
+logger = logging.getLogger("weather")
+
+
+WeatherCellKey = tuple[int, int, str]
 
 
 @dataclass
@@ -14,53 +25,236 @@ class WeatherCacheEntry:
     lat: float
     lon: float
     lang: str
+    last_access: float = 0.0
 
 
 class WeatherService:
-    def __init__(self, client: OpenWeatherClient, settings):
+    def __init__(self, client: OpenWeatherClient, settings, shared_cache: SharedCache | None = None):
         self.client = client
         self.settings = settings
-        self._cache: dict[str, WeatherCacheEntry] = {}
+        self.shared_cache = shared_cache
+        self._cache: OrderedDict[WeatherCellKey, WeatherCacheEntry] = OrderedDict()
+        self._inflight: dict[WeatherCellKey, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+        self._listeners: list[Callable[[WeatherCellKey], None]] = []
+
+    def cell_key(self, lat: float, lon: float, lang: str) -> WeatherCellKey:
+        size = self.settings.WEATHER_CELL_SIZE_DEGREES
+        return math.floor(lat / size), math.floor(lon / size), lang
+
+    def cell_center(self, key: WeatherCellKey) -> tuple[float, float]:
+        size = self.settings.WEATHER_CELL_SIZE_DEGREES
+        lat_index, lon_index, _ = key
+        return round((lat_index + 0.5) * size, 6), round((lon_index + 0.5) * size, 6)
+
+    def add_listener(self, listener: Callable[[WeatherCellKey], None]) -> None:
+        self._listeners.append(listener)
 
     async def get_weather(self, tenant_code: str, config) -> WeatherWidgetDto | None:
         if not config.show_weather:
             return None
 
-        cache_entry = self._cache.get(tenant_code)
-        coords_match = False
-        if cache_entry:
-            coords_match = (
-                cache_entry.lat == config.weather_lat
-                and cache_entry.lon == config.weather_lon
-                and cache_entry.lang == config.weather_lang
-            )
+        key = self.cell_key(config.weather_lat, config.weather_lon, config.weather_lang)
+        cache_entry = self._cache.get(key)
         now = time.monotonic()
-        if (
-            cache_entry
-            and coords_match
-            and (now - cache_entry.fetched_at) < self.settings.WEATHER_REFRESH_SECONDS
-        ):
+        if cache_entry:
+            self._cache.move_to_end(key)
+            cache_entry.last_access = now
+            if (now - cache_entry.fetched_at) >= self.settings.WEATHER_REFRESH_SECONDS:
+                self._schedule_revalidation(key)
             return cache_entry.dto
 
+        entry = await self._refresh_cell(key)
+        entry.last_access = now
+        return entry.dto
+
+    async def get_weather_many(
+        self, locations: set[tuple[float, float, str]]
+    ) -> dict[tuple[float, float, str], WeatherWidgetDto | None]:
+        now = time.monotonic()
+        keys = {location: self.cell_key(*location) for location in locations}
+        due = []
+        for key in set(keys.values()):
+            entry = self._cache.get(key)
+            if not entry or (now - entry.fetched_at) >= self.settings.WEATHER_REFRESH_SECONDS:
+                due.append(key)
+        if due:
+            await self._refresh_cells(due)
+
+        results: dict[tuple[float, float, str], WeatherWidgetDto | None] = {}
+        for location, key in keys.items():
+            entry = self._cache.get(key)
+            if entry:
+                entry.last_access = now
+            results[location] = entry.dto if entry else None
+        return results
+
+    async def refresh_due(self) -> int:
+        now = time.monotonic()
+        refresh_after = self.settings.WEATHER_REFRESH_SECONDS - self.settings.WEATHER_REFRESH_LEAD_SECONDS
+        active_window = self.settings.WEATHER_REFRESH_SECONDS * 2
+        due = [
+            key
+            for key, entry in self._cache.items()
+            if (now - entry.fetched_at) >= refresh_after and (now - entry.last_access) < active_window
+        ]
+        if not due:
+            return 0
+        return await self._refresh_cells(due, max_age=refresh_after)
+
+    async def wait_for_background_refreshes(self) -> None:
+        while self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
+
+    def _schedule_revalidation(self, key: WeatherCellKey) -> None:
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._revalidate(key))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _revalidate(self, key: WeatherCellKey) -> None:
         try:
-            response = await self.client.get_current_weather(
-                config.weather_lat,
-                config.weather_lon,
-                config.weather_lang,
-            )
-            dto = self._to_widget_dto(response)
-            self._cache[tenant_code] = WeatherCacheEntry(
-                dto=dto,
-                fetched_at=now,
-                lat=config.weather_lat,
-                lon=config.weather_lon,
-                lang=config.weather_lang,
+            await self._refresh_cell(key)
+        except OpenWeatherClientError as exc:
+            self._mark_stale(key, exc)
+
+    def _mark_stale(self, key: WeatherCellKey, exc: Exception) -> None:
+        logger.warning("Weather refresh failed for cell %s: %s", key, exc)
+        entry = self._cache.get(key)
+        if entry and not entry.dto.stale:
+            entry.dto = entry.dto.model_copy(update={"stale": True})
+            self._notify(key)
+
+    def _register_inflight(self, key: WeatherCellKey, task: asyncio.Task) -> None:
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+    async def _refresh_cell(self, key: WeatherCellKey) -> WeatherCacheEntry:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_cell(key))
+            self._register_inflight(key, task)
+        return await asyncio.shield(task)
+
+    async def _refresh_cells(self, keys: list[WeatherCellKey], max_age: float | None = None) -> int:
+        pending = [key for key in keys if key not in self._inflight]
+        if pending:
+            batch = asyncio.create_task(self._fetch_cells(pending, max_age))
+            for key in pending:
+                self._register_inflight(key, asyncio.create_task(self._batch_member(batch, key)))
+
+        tasks = {key: self._inflight[key] for key in keys}
+        results = await asyncio.gather(
+            *[asyncio.shield(task) for task in tasks.values()], return_exceptions=True
+        )
+        refreshed = 0
+        for key, result in zip(tasks, results):
+            if isinstance(result, OpenWeatherClientError):
+                self._mark_stale(key, result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                refreshed += 1
+        return refreshed
+
+    async def _fetch_cell(self, key: WeatherCellKey) -> WeatherCacheEntry:
+        result = (await self._fetch_cells([key]))[key]
+        if isinstance(result, OpenWeatherClientError):
+            raise result
+        return result
+
+    async def _fetch_cells(
+        self, keys: list[WeatherCellKey], max_age: float | None = None
+    ) -> dict[WeatherCellKey, WeatherCacheEntry | OpenWeatherClientError]:
+        errors: dict[WeatherCellKey, OpenWeatherClientError] = {}
+
+        async def fetch_many(cells: list[WeatherCellKey]) -> dict[WeatherCellKey, WeatherWidgetDto]:
+            locations = [(*self.cell_center(key), key[2]) for key in cells]
+            responses = await self.client.get_current_weather_many(
+                locations, self.settings.WEATHER_BATCH_MAX_CONCURRENCY
             )
-            return dto
-        except OpenWeatherClientError:
-            if cache_entry and coords_match:
-                return cache_entry.dto.model_copy(update={"stale": True})
-            raise
+            fetched = {}
+            for key, response in zip(cells, responses):
+                if isinstance(response, OpenWeatherClientError):
+                    errors[key] = response
+                else:
+                    fetched[key] = self._to_widget_dto(response)
+            return fetched
+
+        if self.shared_cache is None:
+            fetched_at = time.monotonic()
+            loaded = {key: (dto, fetched_at) for key, dto in (await fetch_many(keys)).items()}
+        else:
+            loaded = await self._load_shared(keys, fetch_many, max_age)
+
+        results: dict[WeatherCellKey, WeatherCacheEntry | OpenWeatherClientError] = {}
+        for key in keys:
+            if key in loaded:
+                dto, fetched_at = loaded[key]
+                results[key] = self._store_dto(key, dto, fetched_at)
+            else:
+                results[key] = errors.get(key) or OpenWeatherClientError("Weather unavailable")
+        return results
+
+    async def _load_shared(
+        self, keys: list[WeatherCellKey], fetch_many, max_age: float | None
+    ) -> dict[WeatherCellKey, tuple[WeatherWidgetDto, float]]:
+        cells_by_name = {self._shared_key(key): key for key in keys}
+
+        async def fetch_shared(names: list[str]) -> dict[str, dict]:
+            dtos = await fetch_many([cells_by_name[name] for name in names])
+            return {self._shared_key(key): dto.model_dump(mode="json") for key, dto in dtos.items()}
+
+        entries = await self.shared_cache.get_or_fetch_many(
+            list(cells_by_name),
+            fetch_shared,
+            ttl_seconds=self.settings.WEATHER_REFRESH_SECONDS,
+            max_age=max_age or self.settings.WEATHER_REFRESH_SECONDS,
+        )
+        return {
+            cells_by_name[name]: (WeatherWidgetDto.model_validate(entry.data), entry.monotonic_fetched_at)
+            for name, entry in entries.items()
+        }
+
+    def _shared_key(self, key: WeatherCellKey) -> str:
+        lat_index, lon_index, lang = key
+        return f"weather:{self.settings.WEATHER_CELL_SIZE_DEGREES}:{lat_index}:{lon_index}:{lang}"
+
+    @staticmethod
+    async def _batch_member(batch: asyncio.Task, key: WeatherCellKey) -> WeatherCacheEntry:
+        result = (await batch)[key]
+        if isinstance(result, OpenWeatherClientError):
+            raise result
+        return result
+
+    def _store_dto(self, key: WeatherCellKey, dto: WeatherWidgetDto, fetched_at: float) -> WeatherCacheEntry:
+        lat, lon = self.cell_center(key)
+        previous = self._cache.get(key)
+        entry = WeatherCacheEntry(
+            dto=dto,
+            fetched_at=fetched_at,
+            lat=lat,
+            lon=lon,
+            lang=key[2],
+            last_access=previous.last_access if previous else 0.0,
+        )
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key: WeatherCellKey, entry: WeatherCacheEntry) -> None:
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.settings.WEATHER_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+        self._notify(key)
+
+    def _notify(self, key: WeatherCellKey) -> None:
+        for listener in self._listeners:
+            try:
+                listener(key)
+            except Exception:
+                logger.exception("Weather listener failed for cell %s", key)
 
     @staticmethod
     def _to_widget_dto(response: OpenWeatherResponse) -> WeatherWidgetDto:
@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from httpx import ASGITransport, AsyncClient
+
+from app.main import create_app
+from app.dependencies import get_arrivals_service, get_tenant_service
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from schemas.emt_compact import EmtArrivals
+from services.arrivals_service import ArrivalsService
+from services.emt_madrid_service import EmtMadridService
+from services.tenant_cache import TenantCache
+from services.tenant_service import TenantService
+
+TENANT_STOPS = {
+    "AAA111": ["100", "200"],
+    "BBB222": ["200", "300"],
+    "CCC333": ["100"],
+}
+
+
+def build_tenant_pair(code: str, stops: list[str]) -> tuple[Tenant, TenantConfig]:
+    now = datetime.now(timezone.utc)
+    tenant = Tenant(
+        id=f"tenant-{code}",
+        name=code,
+        short_code=code,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    config = TenantConfig(
+        tenant_id=tenant.id,
+        layout="horizontal",
+        refresh_seconds=10,
+        swap_seconds=10,
+        menu_mode="menuAndImage",
+        theme="purple",
+        board_header_text="Header",
+        stops=stops,
+    )
+    return tenant, config
+
+
+class BatchRepo:
+    def __init__(self):
+        self.batch_queries: list[list[str]] = []
+
+    async def get_many_with_config_by_codes(self, codes: list[str]):
+        self.batch_queries.append(codes)
+        return [build_tenant_pair(code, TENANT_STOPS[code]) for code in codes if code in TENANT_STOPS]
+
+
+class CountingEmtService(EmtMadridService):
+    def __init__(self, settings):
+        super().__init__(None, settings)
+        self.fetched: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _fetch_arrival_bus(self, stop_id: str, line_arrive: str) -> EmtArrivals:
+        self.fetched.append(stop_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return EmtArrivals.from_payload(
+            {
+                "code": "00",
+                "description": "Success",
+                "datetime": datetime.now(timezone.utc).isoformat(),
+                "data": [
+                    {
+                        "Arrive": [
+                            {
+                                "line": "10",
+                                "stop": stop_id,
+                                "isHead": "N",
+                                "destination": "A",
+                                "deviation": 0,
+                                "estimateArrive": int(stop_id),
+                            }
+                        ]
+                    }
+                ],
+            }
+        )
+
+
+@pytest.mark.anyio
+async def test_batch_fetches_each_stop_once_and_fans_out():
+    settings = SimpleNamespace(
+        EMT_ACCESS_TOKEN="token",
+        EMT_ARRIVALS_CACHE_SECONDS=30,
+        EMT_BATCH_MAX_CONCURRENCY=2,
+        ARRIVALS_PAYLOAD_CACHE_MAX_ENTRIES=10,
+    )
+    repo = BatchRepo()
+    emt_service = CountingEmtService(settings)
+    tenant_service = TenantService(repo, settings, TenantCache(max_entries=10, ttl_seconds=60))
+
+    app = create_app()
+    app.dependency_overrides[get_tenant_service] = lambda: tenant_service
+    app.dependency_overrides[get_arrivals_service] = lambda: ArrivalsService(emt_service, settings)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/arrivals:batch",
+            json={"codes": ["AAA111", "BBB222", "CCC333", "aaa111", "ZZZ999"]},
+        )
+        single = await client.get("/api/tenants/aaa111/arrivals")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert repo.batch_queries == [["AAA111", "BBB222", "CCC333", "ZZZ999"]]
+    assert sorted(emt_service.fetched) == ["100", "200", "300"]
+    assert emt_service.max_in_flight <= 2
+    assert data["notFound"] == ["ZZZ999"]
+    assert [item["stop"] for item in data["results"]["AAA111"]["items"]] == ["100", "200"]
+    assert [item["stop"] for item in data["results"]["BBB222"]["items"]] == ["200", "300"]
+    assert [item["stop"] for item in data["results"]["CCC333"]["items"]] == ["100"]
+    assert single.status_code == 200
+    assert single.json()["items"] == data["results"]["AAA111"]["items"]
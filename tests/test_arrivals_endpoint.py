@@ -4,9 +4,12 @@ from datetime import datetime, timezone
 from httpx import ASGITransport, AsyncClient, Response
 
 from app.main import create_app
-from app.dependencies import get_tenant_service
+from app.dependencies import get_arrivals_service, get_settings, get_tenant_service
 from domain.models.tenant import Tenant
 from domain.models.tenant_config import TenantConfig
+from infrastructure.clients.http_client import HttpClient
+from services.arrivals_service import ArrivalsService
+from services.emt_madrid_service import EmtMadridService
 
 
 class StubTenantService:
@@ -42,6 +45,9 @@ async def test_arrivals_merging():
     app.dependency_overrides[get_tenant_service] = lambda: StubTenantService()
 
     base_url = "https://openapi.emtmadrid.es"
+    settings = get_settings()
+    emt_service = EmtMadridService(HttpClient(base_url=base_url, timeout_seconds=10), settings)
+    app.dependency_overrides[get_arrivals_service] = lambda: ArrivalsService(emt_service, settings)
     sample_100 = {
         "code": "00",
         "description": "Success",
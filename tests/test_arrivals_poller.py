@@ -0,0 +1,103 @@
+import time
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from domain.models.tenant_config import TenantConfig
+from schemas.emt_compact import EmtArrivals
+from services.arrivals_poller import ArrivalsPoller
+from services.arrivals_service import ArrivalsService
+from services.emt_madrid_service import EmtMadridService
+
+
+class StubTenantRepo:
+    def __init__(self, stop_keys: set[tuple[str, str]]):
+        self.stop_keys = stop_keys
+
+    async def get_active_stops(self) -> set[tuple[str, str]]:
+        return self.stop_keys
+
+
+class StubEmtService(EmtMadridService):
+    def __init__(self, settings):
+        super().__init__(None, settings)
+        self.fetched: list[tuple[str, str]] = []
+
+    async def _fetch_arrival_bus(self, stop_id: str, line_arrive: str) -> EmtArrivals:
+        self.fetched.append((stop_id, line_arrive))
+        return EmtArrivals.from_payload(
+            {
+                "code": "00",
+                "description": "Success",
+                "datetime": datetime.now(timezone.utc).isoformat(),
+                "data": [
+                    {
+                        "Arrive": [
+                            {
+                                "line": "10",
+                                "stop": stop_id,
+                                "isHead": "N",
+                                "destination": "A",
+                                "deviation": 0,
+                                "estimateArrive": 90,
+                            }
+                        ]
+                    }
+                ],
+            }
+        )
+
+
+def build_settings(max_rps: float = 1000.0) -> SimpleNamespace:
+    return SimpleNamespace(
+        EMT_ACCESS_TOKEN="token",
+        EMT_ARRIVALS_CACHE_SECONDS=60,
+        EMT_POLL_INTERVAL_SECONDS=10,
+        EMT_POLL_MAX_REQUESTS_PER_SECOND=max_rps,
+    )
+
+
+def build_config(stops: list[str]) -> TenantConfig:
+    return TenantConfig(
+        tenant_id="tenant-1",
+        layout="horizontal",
+        refresh_seconds=10,
+        swap_seconds=10,
+        menu_mode="menuAndImage",
+        theme="purple",
+        board_header_text="Header",
+        stops=stops,
+        line_arrive_default=None,
+    )
+
+
+@pytest.mark.anyio
+async def test_poller_prewarms_arrivals_cache():
+    settings = build_settings()
+    emt_service = StubEmtService(settings)
+    poller = ArrivalsPoller(emt_service, StubTenantRepo({("100", "0"), ("200", "0")}), settings)
+
+    refreshed = await poller.refresh_once()
+    assert refreshed == 2
+    warmed_at = datetime.now(timezone.utc)
+
+    response = await ArrivalsService(emt_service, settings).get_arrivals(build_config(["100", "200"]))
+
+    assert sorted(emt_service.fetched) == [("100", "0"), ("200", "0")]
+    assert len(response.items) == 2
+    assert response.updated_at <= warmed_at
+
+
+@pytest.mark.anyio
+async def test_poller_caps_request_rate():
+    settings = build_settings(max_rps=50.0)
+    emt_service = StubEmtService(settings)
+    stop_keys = {(str(stop_id), "0") for stop_id in range(6)}
+    poller = ArrivalsPoller(emt_service, StubTenantRepo(stop_keys), settings)
+
+    started = time.monotonic()
+    await poller.refresh_once()
+    elapsed = time.monotonic() - started
+
+    assert len(emt_service.fetched) == 6
+    assert elapsed >= 5 / 50.0
@@ -0,0 +1,118 @@
+import pytest
+from types import SimpleNamespace
+from pymongo.errors import OperationFailure
+
+from services.cache_invalidator import CacheInvalidator
+
+
+class StubCollection:
+    def __init__(self, latest: dict | None, count: int):
+        self.latest = latest
+        self.count = count
+
+    async def find_one(self, *args, **kwargs):
+        return self.latest
+
+    async def estimated_document_count(self) -> int:
+        return self.count
+
+
+class StubDb:
+    def __init__(self):
+        self.collections = {
+            "tenants": StubCollection({"updated_at": 1}, 1),
+            "tenant_configs": StubCollection({"updated_at": 1}, 1),
+            "daily_menus": StubCollection({"updated_at": 1}, 1),
+            "menu_images": StubCollection({"created_at": 1}, 1),
+        }
+        self.watch_error = OperationFailure(
+            "The $changeStream stage is only supported on replica sets", code=40573
+        )
+        self.watch_calls = 0
+
+    def __getitem__(self, name: str) -> StubCollection:
+        return self.collections[name]
+
+    def watch(self, *args, **kwargs):
+        self.watch_calls += 1
+        raise self.watch_error
+
+
+def build_invalidator(db) -> tuple[CacheInvalidator, list]:
+    settings = SimpleNamespace(CACHE_INVALIDATION_POLL_SECONDS=0)
+    invalidator = CacheInvalidator(db, settings)
+    events: list = []
+    invalidator.subscribe("tenants", lambda tenant_id: events.append(("tenants", tenant_id)))
+    invalidator.subscribe("tenant_configs", lambda tenant_id: events.append(("configs", tenant_id)))
+    return invalidator, events
+
+
+def test_change_events_target_the_tenant():
+    invalidator, events = build_invalidator(StubDb())
+
+    invalidator.handle_change(
+        {"ns": {"coll": "tenants"}, "documentKey": {"_id": "tenant-1"}, "operationType": "update"}
+    )
+    invalidator.handle_change(
+        {
+            "ns": {"coll": "tenant_configs"},
+            "documentKey": {"_id": "config-1"},
+            "fullDocument": {"tenant_id": "tenant-2"},
+            "operationType": "update",
+        }
+    )
+    invalidator.handle_change(
+        {"ns": {"coll": "tenant_configs"}, "documentKey": {"_id": "config-1"}, "operationType": "delete"}
+    )
+
+    assert events == [("tenants", "tenant-1"), ("configs", "tenant-2"), ("configs", None)]
+
+
+@pytest.mark.anyio
+async def test_poll_fallback_detects_version_stamp_changes():
+    db = StubDb()
+    invalidator, events = build_invalidator(db)
+
+    await invalidator.poll_once()
+    assert events == []
+
+    db.collections["tenant_configs"].latest = {"updated_at": 2}
+    await invalidator.poll_once()
+    assert events == [("configs", None)]
+
+
+@pytest.mark.anyio
+async def test_run_falls_back_to_polling_without_change_streams():
+    db = StubDb()
+    invalidator, events = build_invalidator(db)
+    invalidator.subscribe("tenants", lambda tenant_id: invalidator.stop())
+
+    db.collections["tenants"].count = 2
+    polls = {"count": 0}
+    original = invalidator.poll_once
+
+    async def poll_once():
+        polls["count"] += 1
+        if polls["count"] == 2:
+            db.collections["tenants"].count = 3
+        await original()
+
+    invalidator.poll_once = poll_once
+    await invalidator.run()
+
+    assert invalidator.mode == "poll"
+    assert ("tenants", None) in events
+
+
+@pytest.mark.anyio
+async def test_transient_watch_errors_retry_the_change_stream():
+    db = StubDb()
+    db.watch_error = OperationFailure("not primary", code=10107)
+    invalidator, events = build_invalidator(db)
+    invalidator.subscribe("tenants", lambda tenant_id: invalidator.stop() if db.watch_calls > 1 else None)
+
+    await invalidator.run()
+
+    assert invalidator.mode == "change_stream"
+    assert db.watch_calls == 2
+    assert ("tenants", None) in events
@@ -0,0 +1,117 @@
+import pytest
+import respx
+from httpx import Response
+
+from infrastructure.clients.circuit_breaker import CircuitBreaker
+from infrastructure.clients.exceptions import CircuitOpenError, HttpClientResponseError
+from infrastructure.clients.http_client import HttpClient
+from infrastructure.clients.retry_policy import RetryPolicy
+
+BASE_URL = "https://upstream.test"
+
+
+def test_breaker_opens_and_probes_after_reset():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=0)
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_open_breaker_rejects_until_reset_timeout():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=60)
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+@pytest.mark.anyio
+async def test_retries_transient_errors_within_budget():
+    client = HttpClient(
+        base_url=BASE_URL,
+        timeout_seconds=5,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay_seconds=0.001, deadline_seconds=2),
+    )
+
+    with respx.mock:
+        route = respx.get(f"{BASE_URL}/flaky").mock(
+            side_effect=[Response(503), Response(200, json={"ok": True})]
+        )
+        response = await client.get("/flaky")
+
+    assert response.json() == {"ok": True}
+    assert route.call_count == 2
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_client_errors_are_not_retried_and_keep_circuit_closed():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=60)
+    client = HttpClient(
+        base_url=BASE_URL,
+        timeout_seconds=5,
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay_seconds=0.001),
+    )
+
+    with respx.mock:
+        route = respx.get(f"{BASE_URL}/missing").mock(return_value=Response(404))
+        with pytest.raises(HttpClientResponseError):
+            await client.get("/missing")
+
+    assert route.call_count == 1
+    assert breaker.state == "closed"
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_open_circuit_fails_fast_without_calling_upstream():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=60)
+    client = HttpClient(
+        base_url=BASE_URL,
+        timeout_seconds=5,
+        circuit_breaker=breaker,
+        retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0.001),
+    )
+
+    with respx.mock:
+        route = respx.get(f"{BASE_URL}/down").mock(return_value=Response(500))
+        with pytest.raises(HttpClientResponseError):
+            await client.get("/down")
+        with pytest.raises(CircuitOpenError):
+            await client.get("/down")
+
+    assert route.call_count == 2
+    assert client.metrics()["circuit"]["state"] == "open"
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_unexpected_errors_release_the_half_open_probe():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=0)
+    client = HttpClient(base_url=BASE_URL, timeout_seconds=5, circuit_breaker=breaker)
+    breaker.before_call()
+    breaker.record_failure()
+
+    with respx.mock:
+        respx.get(f"{BASE_URL}/boom").mock(side_effect=RuntimeError("client closed"))
+        respx.get(f"{BASE_URL}/ok").mock(return_value=Response(200))
+        with pytest.raises(RuntimeError):
+            await client.get("/boom")
+        await client.get("/ok")
+
+    assert breaker.state == "closed"
+    await client.close()
@@ -0,0 +1,172 @@
+import pytest
+from datetime import datetime, timezone
+from httpx import ASGITransport, AsyncClient
+
+from app.main import create_app
+from app.dependencies import get_menu_service, get_tenant_service
+from app.routes import tenant_api_routes
+from domain.models.daily_menu import DailyMenu
+from domain.models.menu_image import MenuImage
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from services.menu_service import MenuService
+from services.tenant_cache import TenantCache
+from services.tenant_config_utils import build_tenant_config_response
+from services.tenant_service import TenantService
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class StubTenantRepo:
+    board_header_text = "Header"
+
+    async def get_with_config_by_code(self, code: str):
+        tenant = Tenant(
+            id="tenant-1",
+            name="Test",
+            short_code=code,
+            is_active=True,
+            created_at=UPDATED_AT,
+            updated_at=UPDATED_AT,
+        )
+        config = TenantConfig(
+            tenant_id="tenant-1",
+            layout="horizontal",
+            refresh_seconds=10,
+            swap_seconds=10,
+            menu_mode="menuAndImage",
+            theme="purple",
+            board_header_text=self.board_header_text,
+            stops=["100"],
+            updated_at=UPDATED_AT,
+        )
+        return tenant, config
+
+
+class StubMenuRepo:
+    def __init__(self):
+        self.image_id = "image-1"
+
+    async def get_menu_for_date(self, tenant_id: str, date_str: str):
+        return DailyMenu(
+            id="menu-1",
+            tenant_id=tenant_id,
+            valid_for_date=date_str,
+            title="Menu of the day",
+            sections=None,
+            text_raw="Soup",
+            published_at=None,
+            updated_at=UPDATED_AT,
+        )
+
+    async def get_active_image(self, tenant_id: str):
+        return MenuImage(
+            id=self.image_id,
+            tenant_id=tenant_id,
+            url=f"/uploads/ABC123/{self.image_id}.jpg",
+            caption=None,
+            is_active=True,
+            created_at=UPDATED_AT,
+        )
+
+
+def build_tenant_service(repo: StubTenantRepo | None = None) -> TenantService:
+    return TenantService(repo or StubTenantRepo(), None, TenantCache(max_entries=10, ttl_seconds=60))
+
+
+def build_app(menu_repo: StubMenuRepo, tenant_service: TenantService | None = None):
+    tenant_service = tenant_service or build_tenant_service()
+    app = create_app()
+    app.dependency_overrides[get_tenant_service] = lambda: tenant_service
+    app.dependency_overrides[get_menu_service] = lambda: MenuService(menu_repo, None)
+    return app
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/api/tenants/ABC123/menu", "/api/tenants/ABC123/config"])
+async def test_matching_etag_returns_not_modified(path: str):
+    app = build_app(StubMenuRepo())
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get(path)
+        etag = first.headers["ETag"]
+        second = await client.get(path, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.json()
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+
+@pytest.mark.anyio
+async def test_menu_etag_changes_with_active_image():
+    menu_repo = StubMenuRepo()
+    app = build_app(menu_repo)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/tenants/ABC123/menu")
+        menu_repo.image_id = "image-2"
+        second = await client.get(
+            "/api/tenants/ABC123/menu", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["featuredImageUrl"] == "/uploads/ABC123/image-2.jpg"
+
+
+@pytest.mark.anyio
+async def test_config_etag_follows_content_even_without_updated_at_change():
+    repo = StubTenantRepo()
+    tenant_service = build_tenant_service(repo)
+    app = build_app(StubMenuRepo(), tenant_service)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/tenants/ABC123/config")
+        repo.board_header_text = "Edited in the database"
+        tenant_service.cache.evict("tenant-1")
+        second = await client.get(
+            "/api/tenants/ABC123/config", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+    assert second.status_code == 200
+    assert second.json()["boardHeaderText"] == "Edited in the database"
+
+
+@pytest.mark.anyio
+async def test_config_body_is_serialized_once_per_cached_config(monkeypatch):
+    builds = []
+
+    def counting_build(*args):
+        builds.append(args)
+        return build_tenant_config_response(*args)
+
+    monkeypatch.setattr(tenant_api_routes, "build_tenant_config_response", counting_build)
+    app = build_app(StubMenuRepo())
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/tenants/ABC123/config")
+        polls = [
+            await client.get("/api/tenants/ABC123/config", headers={"If-None-Match": first.headers["ETag"]})
+            for _ in range(3)
+        ]
+        full = await client.get("/api/tenants/ABC123/config")
+
+    assert [poll.status_code for poll in polls] == [304, 304, 304]
+    assert full.content == first.content
+    assert len(builds) == 1
+
+
+@pytest.mark.anyio
+async def test_menu_etag_depends_on_requested_width():
+    app = build_app(StubMenuRepo())
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        small = await client.get("/api/tenants/ABC123/menu?width=480")
+        large = await client.get(
+            "/api/tenants/ABC123/menu?width=1920", headers={"If-None-Match": small.headers["ETag"]}
+        )
+
+    assert large.status_code == 200
+    assert large.headers["ETag"] != small.headers["ETag"]
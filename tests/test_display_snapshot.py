@@ -0,0 +1,200 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from httpx import ASGITransport, AsyncClient
+
+from app.dependencies import get_display_snapshot_service
+from app.main import create_app
+from domain.models.daily_menu import DailyMenu
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from schemas.openweather_schemas import OpenWeatherResponse
+from services.display_snapshot import DisplaySnapshotService
+from services.menu_service import MenuService
+from services.weather_service import WeatherService
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+SETTINGS = SimpleNamespace(
+    WEATHER_REFRESH_SECONDS=600,
+    WEATHER_REFRESH_LEAD_SECONDS=0,
+    WEATHER_CELL_SIZE_DEGREES=0.01,
+    WEATHER_CACHE_MAX_ENTRIES=100,
+    WEATHER_BATCH_MAX_CONCURRENCY=2,
+    TENANT_CACHE_TTL_SECONDS=300,
+    MENU_CACHE_TTL_SECONDS=300,
+    SNAPSHOT_MAX_ENTRIES=10,
+)
+
+
+class StubTenantService:
+    def __init__(self):
+        self.lookups = 0
+        self.board_header_text = "Header"
+
+    async def get_tenant_and_config(self, code: str):
+        self.lookups += 1
+        if code != "ABC123":
+            return None, None
+        tenant = Tenant(
+            id="tenant-1",
+            name="Test",
+            short_code=code,
+            is_active=True,
+            created_at=UPDATED_AT,
+            updated_at=UPDATED_AT,
+        )
+        config = TenantConfig(
+            tenant_id="tenant-1",
+            layout="horizontal",
+            refresh_seconds=10,
+            swap_seconds=10,
+            menu_mode="menuAndImage",
+            show_weather=True,
+            weather_lat=40.4,
+            weather_lon=-3.7,
+            theme="purple",
+            board_header_text=self.board_header_text,
+            stops=["100"],
+        )
+        return tenant, config
+
+
+class StubMenuRepo:
+    def __init__(self):
+        self.reads = 0
+        self.text_raw = "Soup"
+
+    async def get_menu_for_date(self, tenant_id: str, date_str: str):
+        self.reads += 1
+        return DailyMenu(
+            id="menu-1",
+            tenant_id=tenant_id,
+            valid_for_date=date_str,
+            title="Menu of the day",
+            sections=None,
+            text_raw=self.text_raw,
+            published_at=None,
+            updated_at=UPDATED_AT,
+        )
+
+    async def get_active_image(self, tenant_id: str):
+        return None
+
+
+class StubOpenWeatherClient:
+    def __init__(self):
+        self.calls = 0
+        self.temp = 18.0
+
+    async def get_current_weather_many(self, locations, max_concurrency: int):
+        self.calls += len(locations)
+        return [
+            OpenWeatherResponse.model_validate(
+                {
+                    "coord": {"lon": lon, "lat": lat},
+                    "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+                    "main": {
+                        "temp": self.temp,
+                        "feels_like": self.temp,
+                        "temp_min": self.temp,
+                        "temp_max": self.temp,
+                        "humidity": 50,
+                        "pressure": 1012,
+                    },
+                    "dt": 1700000000,
+                    "timezone": 3600,
+                    "name": "Madrid",
+                    "cod": 200,
+                }
+            )
+            for lat, lon, _ in locations
+        ]
+
+
+def build_service():
+    tenants = StubTenantService()
+    menus = StubMenuRepo()
+    weather_client = StubOpenWeatherClient()
+    weather_service = WeatherService(weather_client, SETTINGS)
+    service = DisplaySnapshotService(tenants, MenuService(menus, None), weather_service, SETTINGS)
+    return service, tenants, menus, weather_client, weather_service
+
+
+@pytest.mark.anyio
+async def test_steady_state_reads_reuse_the_serialized_snapshot():
+    service, tenants, menus, weather_client, _ = build_service()
+
+    first = await service.get_snapshot("ABC123")
+    second = await service.get_snapshot("ABC123")
+
+    assert second is first
+    body = json.loads(first.body)
+    assert body["config"]["tenantName"] == "Test"
+    assert body["menu"]["textRaw"] == "Soup"
+    assert body["weather"]["tempC"] == 18.0
+    assert (tenants.lookups, menus.reads, weather_client.calls) == (1, 1, 1)
+    assert service.stats()["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_dirty_sections_are_rebuilt_alone():
+    service, tenants, menus, weather_client, _ = build_service()
+    first = await service.get_snapshot("ABC123")
+    first_etag = first.etag
+
+    menus.text_raw = "Lentejas"
+    service.mark_dirty("tenant-1", "menu")
+    snapshot = await service.get_snapshot("ABC123")
+
+    assert json.loads(snapshot.body)["menu"]["textRaw"] == "Lentejas"
+    assert snapshot.etag != first_etag
+    assert (tenants.lookups, menus.reads, weather_client.calls) == (1, 2, 1)
+
+
+@pytest.mark.anyio
+async def test_config_changes_rebuild_every_section():
+    service, tenants, menus, _, _ = build_service()
+    await service.get_snapshot("ABC123")
+
+    tenants.board_header_text = "New header"
+    service.mark_dirty(None, "config")
+    snapshot = await service.get_snapshot("ABC123")
+
+    assert json.loads(snapshot.body)["config"]["boardHeaderText"] == "New header"
+    assert (tenants.lookups, menus.reads) == (2, 2)
+
+
+@pytest.mark.anyio
+async def test_weather_refresh_marks_the_snapshot_dirty():
+    service, _, _, weather_client, weather_service = build_service()
+    await service.get_snapshot("ABC123")
+
+    weather_client.temp = 25.0
+    for entry in weather_service._cache.values():
+        entry.fetched_at -= SETTINGS.WEATHER_REFRESH_SECONDS
+    await weather_service.refresh_due()
+    snapshot = await service.get_snapshot("ABC123")
+
+    assert json.loads(snapshot.body)["weather"]["tempC"] == 25.0
+
+
+@pytest.mark.anyio
+async def test_snapshot_endpoint_serves_bytes_and_not_modified():
+    service, _, _, _, _ = build_service()
+    app = create_app()
+    app.dependency_overrides[get_display_snapshot_service] = lambda: service
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/tenants/ABC123/snapshot")
+        second = await client.get(
+            "/api/tenants/ABC123/snapshot", headers={"If-None-Match": first.headers["etag"]}
+        )
+        missing = await client.get("/api/tenants/NOPE00/snapshot")
+
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    assert first.json()["menu"]["textRaw"] == "Soup"
+    assert second.status_code == 304
+    assert missing.status_code == 404
@@ -0,0 +1,165 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from domain.models.menu_image import ImageVariant, MenuImage
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from schemas.api_schemas import ArrivalItem, ArrivalsResponse, WeatherWidgetDto
+from services.display_stream import DisplayStreamHub
+from services.menu_service import MenuService
+
+UPDATED_AT = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class StubArrivalsService:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_arrivals(self, config) -> ArrivalsResponse:
+        self.calls += 1
+        item = ArrivalItem(stop="100", line="10", destination="A", eta_seconds=120, eta_minutes=2)
+        return ArrivalsResponse(updated_at=UPDATED_AT, items=[item])
+
+
+class StubMenuService:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_menu_with_image(self, tenant_id: str, timezone_name: str | None):
+        self.calls += 1
+        image = MenuImage(
+            id="image-1",
+            tenant_id=tenant_id,
+            url="/uploads/menu.jpg",
+            caption=None,
+            is_active=True,
+            created_at=UPDATED_AT,
+            variants=[
+                ImageVariant(url="/uploads/menu_w1920.webp", width=1920, height=1080, format="webp"),
+                ImageVariant(url="/uploads/menu_w480.webp", width=480, height=270, format="webp"),
+            ],
+        )
+        return None, image
+
+    build_menu_response = staticmethod(MenuService.build_menu_response)
+
+
+class StubWeatherService:
+    async def get_weather(self, tenant_code: str, config) -> WeatherWidgetDto:
+        return WeatherWidgetDto(
+            temp_c=20.0,
+            feels_like_c=19.0,
+            humidity_pct=50,
+            wind_mps=1.0,
+            description="clear sky",
+            icon_code="01d",
+            is_night=False,
+            updated_at=UPDATED_AT,
+        )
+
+
+class StubTenantService:
+    def __init__(self, refresh_seconds: int):
+        now = datetime.now(timezone.utc)
+        self.tenant = Tenant(
+            id="tenant-1",
+            name="Test",
+            short_code="ABC123",
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        self.config = TenantConfig(
+            tenant_id="tenant-1",
+            layout="horizontal",
+            refresh_seconds=refresh_seconds,
+            swap_seconds=10,
+            menu_mode="menuAndImage",
+            show_weather=True,
+            weather_lat=40.4,
+            weather_lon=-3.7,
+            theme="purple",
+            board_header_text="Header",
+            stops=["100"],
+        )
+
+    async def get_tenant_and_config(self, code: str):
+        if self.config is None:
+            return None, None
+        return self.tenant, self.config
+
+
+def build_hub(arrivals_service, refresh_seconds: int = 1) -> tuple[DisplayStreamHub, StubTenantService, StubMenuService]:
+    tenant_service = StubTenantService(refresh_seconds)
+    menu_service = StubMenuService()
+    settings = SimpleNamespace(WEATHER_REFRESH_SECONDS=600, STREAM_HEARTBEAT_SECONDS=15)
+    hub = DisplayStreamHub(
+        tenant_service, arrivals_service, menu_service, StubWeatherService(), settings
+    )
+    return hub, tenant_service, menu_service
+
+
+def disconnect_after(checks: int):
+    state = {"checks": 0}
+
+    async def is_disconnected() -> bool:
+        state["checks"] += 1
+        return state["checks"] > checks
+
+    return is_disconnected
+
+
+@pytest.mark.anyio
+async def test_stream_pushes_each_channel_once_until_it_changes():
+    arrivals_service = StubArrivalsService()
+    hub, _, _ = build_hub(arrivals_service)
+
+    chunks = [chunk async for chunk in hub.stream("ABC123", width=600).events(disconnect_after(2))]
+
+    events = [chunk for chunk in chunks if chunk.startswith("event:")]
+    assert [event.split("\n")[0] for event in events] == [
+        "event: arrivals",
+        "event: menu",
+        "event: weather",
+    ]
+    assert '"etaMinutes":2' in events[0]
+    assert '"featuredImageUrl":"/uploads/menu_w1920.webp"' in events[1]
+    assert '"tempC":20.0' in events[2]
+    assert arrivals_service.calls == 2
+    assert hub.stats() == {"feeds": 0, "subscribers": 0}
+
+
+@pytest.mark.anyio
+async def test_screens_of_a_tenant_share_loads_and_get_their_own_width():
+    arrivals_service = StubArrivalsService()
+    hub, _, menu_service = build_hub(arrivals_service)
+
+    async def collect(width: int) -> list[str]:
+        stream = hub.stream("ABC123", width=width)
+        return [chunk async for chunk in stream.events(disconnect_after(1))]
+
+    small, large = await asyncio.gather(collect(400), collect(1920))
+
+    assert arrivals_service.calls == 1
+    assert menu_service.calls == 1
+    assert any("menu_w480.webp" in chunk for chunk in small)
+    assert any("menu_w1920.webp" in chunk for chunk in large)
+
+
+@pytest.mark.anyio
+async def test_stream_ends_when_the_tenant_config_disappears():
+    hub, tenant_service, _ = build_hub(StubArrivalsService())
+    checks = {"count": 0}
+
+    async def is_disconnected() -> bool:
+        checks["count"] += 1
+        if checks["count"] == 2:
+            tenant_service.config = None
+        return checks["count"] > 10
+
+    chunks = [chunk async for chunk in hub.stream("ABC123").events(is_disconnected)]
+
+    assert checks["count"] == 2
+    assert len([chunk for chunk in chunks if chunk.startswith("event:")]) == 3
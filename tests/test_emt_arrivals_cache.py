@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+
+from services.emt_madrid_service import EmtMadridService
+from services.payload_capture import PayloadCapture
+
+
+def build_payload(stop_id: str) -> dict:
+    return {
+        "code": "00",
+        "description": "Success",
+        "datetime": datetime.utcnow().isoformat(),
+        "data": [
+            {
+                "Arrive": [
+                    {
+                        "line": "10",
+                        "stop": stop_id,
+                        "isHead": "N",
+                        "destination": "A",
+                        "deviation": 0,
+                        "estimateArrive": 300,
+                    }
+                ],
+            }
+        ],
+    }
+
+
+class StubResponse:
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.status_code = 200
+
+    def json(self) -> dict:
+        return self.payload
+
+
+class StubHttpClient:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.paths: list[str] = []
+
+    async def post(self, path: str, **kwargs) -> StubResponse:
+        self.paths.append(path)
+        await asyncio.sleep(self.delay)
+        stop_id = path.split("/stops/")[1].split("/")[0]
+        return StubResponse(build_payload(stop_id))
+
+
+class FailingHttpClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def post(self, path: str, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+
+def build_settings(cache_seconds: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        EMT_ACCESS_TOKEN="token",
+        EMT_ARRIVALS_CACHE_SECONDS=cache_seconds,
+        EMT_FULL_VALIDATION=False,
+        EMT_STALE_MAX_SECONDS=300,
+    )
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_share_one_request():
+    client = StubHttpClient(delay=0.05)
+    service = EmtMadridService(client, build_settings(cache_seconds=30))
+
+    responses = await asyncio.gather(*[service.get_arrival_bus("100", "0") for _ in range(20)])
+
+    assert len(client.paths) == 1
+    assert client.paths[0] == "/v2/transport/busemtmad/stops/100/arrives/0/"
+    assert all(response is responses[0] for response in responses)
+
+
+@pytest.mark.anyio
+async def test_cache_is_keyed_by_stop_and_line():
+    client = StubHttpClient()
+    service = EmtMadridService(client, build_settings(cache_seconds=30))
+
+    await service.get_arrival_bus("100", "0")
+    await service.get_arrival_bus("100", "0")
+    await service.get_arrival_bus("100", "27")
+    await service.get_arrival_bus("200", "0")
+
+    assert len(client.paths) == 3
+
+
+@pytest.mark.anyio
+async def test_expired_entry_is_refetched():
+    client = StubHttpClient()
+    service = EmtMadridService(client, build_settings(cache_seconds=0))
+
+    await service.get_arrival_bus("100", "0")
+    await service.get_arrival_bus("100", "0")
+
+    assert len(client.paths) == 2
+
+
+@pytest.mark.anyio
+async def test_failures_are_shared_and_not_cached():
+    client = FailingHttpClient()
+    service = EmtMadridService(client, build_settings(cache_seconds=30))
+
+    results = await asyncio.gather(
+        *[service.get_arrival_bus("100", "0") for _ in range(5)],
+        return_exceptions=True,
+    )
+    assert client.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    with pytest.raises(RuntimeError):
+        await service.get_arrival_bus("100", "0")
+    assert client.calls == 2
+
+
+@pytest.mark.anyio
+async def test_last_known_good_is_served_stale_when_upstream_fails():
+    client = StubHttpClient()
+    service = EmtMadridService(client, build_settings(cache_seconds=0))
+
+    fresh = await service.get_arrival_entry("100", "0")
+    service.http_client = FailingHttpClient()
+    stale = await service.get_arrival_entry("100", "0")
+
+    assert fresh.stale is False
+    assert stale.stale is True
+    assert stale.response is fresh.response
+
+
+@pytest.mark.anyio
+async def test_fetch_logs_summary_and_captures_payload_only_when_enabled(caplog):
+    capture = PayloadCapture(max_entries=2)
+    service = EmtMadridService(StubHttpClient(), build_settings(cache_seconds=30), payload_capture=capture)
+
+    with caplog.at_level(logging.INFO, logger="emt"):
+        for stop in ("100", "200", "300"):
+            await service.get_arrival_bus(stop, "0")
+
+    record = caplog.records[-1]
+    assert record.getMessage() == "emt arrivals fetched"
+    assert (record.stop, record.status, record.items) == ("300", 200, 1)
+    assert "Arrive" not in caplog.text
+    assert [entry["key"] for entry in capture.entries()] == ["200:0", "300:0"]
+
+    disabled = PayloadCapture(max_entries=0)
+    disabled.record("emt", "100:0", 200, {})
+    assert disabled.entries() == []
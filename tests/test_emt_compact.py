@@ -0,0 +1,54 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from schemas.emt_compact import EmtArrivals, EmtPayloadError
+from schemas.emt_schemas import EmtArrivalResponse
+
+FIXTURE = Path(__file__).parent / "fixtures" / "emt_arrivals_sample.json"
+ROUNDS = 500
+
+
+def load_payload() -> dict:
+    return json.loads(FIXTURE.read_text(encoding="utf-8"))
+
+
+def measure(parse, payload: dict) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse(payload)
+    return time.perf_counter() - started
+
+
+def test_projection_matches_full_schema():
+    payload = load_payload()
+
+    compact = EmtArrivals.from_payload(payload)
+    full = EmtArrivals.from_model(EmtArrivalResponse.model_validate(payload))
+
+    assert compact.code == full.code == "00"
+    assert compact.arrivals == full.arrivals
+    assert len(compact.arrivals) == 12
+    assert EmtArrivals.from_dict(json.loads(json.dumps(compact.to_dict()))).arrivals == compact.arrivals
+
+
+def test_projection_rejects_payloads_missing_required_fields():
+    payload = load_payload()
+    del payload["data"][0]["Arrive"][3]["estimateArrive"]
+
+    with pytest.raises(EmtPayloadError):
+        EmtArrivals.from_payload(payload)
+    with pytest.raises(EmtPayloadError):
+        EmtArrivals.from_payload({"code": "00", "data": None})
+
+
+@pytest.mark.benchmark
+def test_projection_parse_throughput():
+    payload = load_payload()
+
+    full = measure(EmtArrivalResponse.model_validate, payload)
+    compact = measure(EmtArrivals.from_payload, payload)
+
+    assert compact < full
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from infrastructure.clients.http_client import HttpClient
+from services.emt_madrid_service import EmtMadridService
+from services.emt_token_manager import LOGIN_PATH, EmtAuthError, EmtTokenManager
+
+ARRIVALS_PATH = "/v2/transport/busemtmad/stops/72/arrives/27/"
+
+
+def build_settings(margin: float = 300) -> SimpleNamespace:
+    return SimpleNamespace(
+        EMT_ACCESS_TOKEN="",
+        EMT_CLIENT_ID="client",
+        EMT_PASS_KEY="secret",
+        EMT_TOKEN_REFRESH_MARGIN_SECONDS=margin,
+        EMT_TOKEN_RETRY_SECONDS=0.05,
+        EMT_ARRIVALS_CACHE_SECONDS=15,
+        EMT_STALE_MAX_SECONDS=300,
+        EMT_FULL_VALIDATION=False,
+    )
+
+
+class FakeEmt:
+    def __init__(self, stub_server, lifetime: float = 3600, delay: float = 0.0):
+        self.stub_server = stub_server
+        self.lifetime = lifetime
+        self.delay = delay
+        self.issued: list[str] = []
+        self.revoked: set[str] = set()
+        self.rejected_code: str | None = None
+
+    def __call__(self, method, path, query):
+        if path == LOGIN_PATH:
+            time.sleep(self.delay)
+            token = f"token-{len(self.issued) + 1}"
+            self.issued.append(token)
+            return 200, {}, {
+                "code": "01",
+                "description": "Token extended",
+                "data": [{"accessToken": token, "tokenSecExpiration": self.lifetime}],
+            }
+        token = self.stub_server.request_headers[-1].get("accesstoken")
+        if token not in self.issued or token in self.revoked:
+            return 401, {}, {"code": "80", "description": "Token invalid"}
+        if self.rejected_code:
+            return 200, {}, {"code": self.rejected_code, "description": "Rejected", "data": []}
+        return 200, {}, {
+            "code": "00",
+            "data": [
+                {
+                    "Arrive": [
+                        {"line": "27", "stop": "72", "destination": "PLAZA CASTILLA", "estimateArrive": 90}
+                    ]
+                }
+            ],
+        }
+
+    def logins(self) -> int:
+        return sum(1 for _, path, _ in self.stub_server.requests if path == LOGIN_PATH)
+
+
+@pytest.mark.anyio
+async def test_concurrent_callers_share_one_login(stub_server):
+    fake = FakeEmt(stub_server, delay=0.1)
+    stub_server.handler = fake
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    manager = EmtTokenManager(http_client, build_settings())
+
+    tokens = await asyncio.gather(*[manager.get_token() for _ in range(20)])
+
+    assert set(tokens) == {"token-1"}
+    assert fake.logins() == 1
+    assert await manager.get_token() == "token-1"
+    assert fake.logins() == 1
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_token_is_refreshed_before_it_expires(stub_server):
+    fake = FakeEmt(stub_server, lifetime=1.0)
+    stub_server.handler = fake
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    manager = EmtTokenManager(http_client, build_settings(margin=0.6))
+    task = asyncio.create_task(manager.run())
+
+    await asyncio.sleep(0.2)
+    assert await manager.get_token() == "token-1"
+    await asyncio.sleep(0.5)
+    assert await manager.get_token() == "token-2"
+    assert fake.logins() == 2
+
+    manager.stop()
+    await task
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_caller_inside_refresh_margin_is_not_blocked(stub_server):
+    fake = FakeEmt(stub_server, delay=0.2)
+    stub_server.handler = fake
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    manager = EmtTokenManager(http_client, build_settings())
+    await manager.get_token()
+    manager._token.refresh_at = time.monotonic()
+
+    started = time.monotonic()
+    assert await manager.get_token() == "token-1"
+    assert time.monotonic() - started < 0.1
+    await asyncio.sleep(0.4)
+    assert await manager.get_token() == "token-2"
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_rejected_token_triggers_a_single_relogin(stub_server):
+    fake = FakeEmt(stub_server)
+    stub_server.handler = fake
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    settings = build_settings()
+    manager = EmtTokenManager(http_client, settings)
+    service = EmtMadridService(http_client, settings, token_manager=manager)
+
+    first = await service.refresh_arrival_bus("72", "27")
+    fake.revoked.add("token-1")
+    second = await service.refresh_arrival_bus("72", "27", max_age=0)
+
+    assert first.response.arrivals[0].estimate_arrive == 90
+    assert second.response.arrivals[0].estimate_arrive == 90
+    assert [path for _, path, _ in stub_server.requests] == [
+        LOGIN_PATH,
+        ARRIVALS_PATH,
+        ARRIVALS_PATH,
+        LOGIN_PATH,
+        ARRIVALS_PATH,
+    ]
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_error_code_after_relogin_keeps_last_good_arrivals(stub_server):
+    fake = FakeEmt(stub_server)
+    stub_server.handler = fake
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    settings = build_settings()
+    manager = EmtTokenManager(http_client, settings)
+    service = EmtMadridService(http_client, settings, token_manager=manager)
+
+    await service.get_arrival_entry("72", "27")
+    fake.rejected_code = "80"
+    service._cache[("72", "27")].fetched_at -= settings.EMT_ARRIVALS_CACHE_SECONDS
+    entry = await service.get_arrival_entry("72", "27")
+
+    assert entry.stale is True
+    assert entry.response.arrivals[0].estimate_arrive == 90
+    assert [path for _, path, _ in stub_server.requests].count(LOGIN_PATH) == 2
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_failed_login_raises_auth_error(stub_server):
+    stub_server.handler = lambda method, path, query: (200, {}, {"code": "89", "data": []})
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    manager = EmtTokenManager(http_client, build_settings())
+
+    with pytest.raises(EmtAuthError):
+        await manager.get_token()
+    assert manager.stats()["failures"] == 1
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_short_lived_tokens_do_not_cause_a_login_loop(stub_server):
+    fake = FakeEmt(stub_server, lifetime=0.001)
+    stub_server.handler = fake
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    manager = EmtTokenManager(http_client, build_settings())
+    task = asyncio.create_task(manager.run())
+
+    await asyncio.sleep(0.3)
+    manager.stop()
+    await task
+
+    assert 1 <= fake.logins() <= 8
+
+    fake.lifetime = 0
+    manager._token = None
+    with pytest.raises(EmtAuthError):
+        await manager.get_token()
+    await http_client.close()
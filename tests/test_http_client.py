@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+import respx
+from httpx import Response
+
+from infrastructure.clients.exceptions import HttpClientResponseError
+from infrastructure.clients.http_client import HttpClient
+
+BASE_URL = "https://upstream.test"
+
+
+@pytest.mark.anyio
+async def test_concurrency_cap_limits_in_flight_requests():
+    client = HttpClient(base_url=BASE_URL, timeout_seconds=5, max_concurrency=2)
+    observed: list[int] = []
+
+    async def slow_response(request):
+        observed.append(client.in_flight)
+        await asyncio.sleep(0.02)
+        return Response(200, json={"ok": True})
+
+    with respx.mock:
+        respx.get(f"{BASE_URL}/items").mock(side_effect=slow_response)
+        await asyncio.gather(*[client.get("/items") for _ in range(6)])
+
+    metrics = client.metrics()
+    assert max(observed) <= 2
+    assert metrics["requests_total"] == 6
+    assert metrics["in_flight"] == 0
+    assert metrics["waiting"] == 0
+    assert metrics["pool_wait_seconds_max"] > 0
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_error_responses_release_the_slot():
+    client = HttpClient(base_url=BASE_URL, timeout_seconds=5, max_concurrency=1)
+
+    with respx.mock:
+        respx.get(f"{BASE_URL}/broken").mock(return_value=Response(503, text="down"))
+        for _ in range(2):
+            with pytest.raises(HttpClientResponseError):
+                await client.get("/broken")
+
+    assert client.metrics()["in_flight"] == 0
+    await client.close()
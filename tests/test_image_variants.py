@@ -0,0 +1,105 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from domain.models.menu_image import ImageVariant, MenuImage
+from services.image_variants import ImageVariantService, select_image_url
+from services.menu_service import MenuService
+
+SETTINGS = SimpleNamespace(
+    IMAGE_VARIANT_WIDTHS="1920,480",
+    IMAGE_VARIANT_FORMAT="webp",
+    IMAGE_VARIANT_QUALITY=80,
+    IMAGE_PROCESS_WORKERS=1,
+)
+
+
+def build_image(variants: list[ImageVariant]) -> MenuImage:
+    return MenuImage(
+        id="image-1",
+        tenant_id="tenant-1",
+        url="/uploads/ABC/1_a.jpg",
+        caption=None,
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+        variants=variants,
+    )
+
+
+@pytest.mark.anyio
+async def test_variants_are_rendered_in_a_worker_process(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    source = tmp_path / "1_a.jpg"
+    image_module.new("RGB", (4000, 3000), (200, 120, 40)).save(source, format="JPEG")
+    service = ImageVariantService(SETTINGS)
+
+    try:
+        variants = await service.generate(source, "/uploads/ABC")
+        assert service._executor._mp_context.get_start_method() == "spawn"
+    finally:
+        service.close()
+
+    assert [(variant.url, variant.width, variant.height) for variant in variants] == [
+        ("/uploads/ABC/1_a_w1920.webp", 1920, 1440),
+        ("/uploads/ABC/1_a_w480.webp", 480, 360),
+    ]
+    with image_module.open(tmp_path / "1_a_w1920.webp") as rendered:
+        assert rendered.format == "WEBP"
+        assert rendered.size == (1920, 1440)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "1_a.jpg",
+        "1_a_w1920.webp",
+        "1_a_w480.webp",
+    ]
+
+
+@pytest.mark.anyio
+async def test_small_sources_are_not_upscaled(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    source = tmp_path / "2_b.png"
+    image_module.new("RGBA", (800, 600)).save(source, format="PNG")
+    service = ImageVariantService(SETTINGS, ProcessPoolExecutor(max_workers=1))
+
+    try:
+        variants = await service.generate(source, "/uploads/ABC")
+    finally:
+        service.close()
+
+    assert [variant.width for variant in variants] == [800, 480]
+
+
+def test_best_variant_is_selected_for_the_screen_width():
+    image = build_image(
+        [
+            ImageVariant(url="/uploads/ABC/1_a_w480.webp", width=480, height=360, format="webp"),
+            ImageVariant(url="/uploads/ABC/1_a_w1920.webp", width=1920, height=1440, format="webp"),
+        ]
+    )
+
+    assert select_image_url(image, 320) == "/uploads/ABC/1_a_w480.webp"
+    assert select_image_url(image, 1280) == "/uploads/ABC/1_a_w1920.webp"
+    assert select_image_url(image, 3840) == "/uploads/ABC/1_a_w1920.webp"
+    assert select_image_url(image) == "/uploads/ABC/1_a.jpg"
+    assert select_image_url(build_image([])) == "/uploads/ABC/1_a.jpg"
+    assert MenuService.build_menu_response(None, image, 320).featured_image_url.endswith("_w480.webp")
+
+
+@pytest.mark.anyio
+async def test_described_variants_match_the_rendered_ones_for_rotated_photos(tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    source = tmp_path / "3_c.jpg"
+    exif = image_module.Exif()
+    exif[0x0112] = 6
+    image_module.new("RGB", (1600, 1200)).save(source, format="JPEG", exif=exif)
+    service = ImageVariantService(SETTINGS, ProcessPoolExecutor(max_workers=1))
+
+    try:
+        described = await service.describe(source, "/uploads/ABC")
+        rendered = await service.generate(source, "/uploads/ABC")
+    finally:
+        service.close()
+
+    assert described == rendered
+    assert [(variant.width, variant.height) for variant in described] == [(1200, 1600), (480, 640)]
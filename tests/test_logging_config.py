@@ -0,0 +1,59 @@
+import io
+import json
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from app.logging_config import SamplingFilter, StructuredFormatter, configure_logging
+
+
+def build_settings(sample_rate: float = 1.0, log_format: str = "json") -> SimpleNamespace:
+    return SimpleNamespace(LOG_LEVEL="INFO", LOG_FORMAT=log_format, LOG_SAMPLE_RATE=sample_rate)
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    root.handlers = handlers
+    root.setLevel(level)
+
+
+def test_sampling_keeps_warnings_and_drops_sampled_info():
+    sampler = SamplingFilter(0.0)
+    info = logging.makeLogRecord({"levelno": logging.INFO, "msg": "fetched"})
+    warning = logging.makeLogRecord({"levelno": logging.WARNING, "msg": "failed"})
+
+    assert sampler.filter(info) is False
+    assert sampler.filter(warning) is True
+    assert SamplingFilter(1.0).filter(info) is True
+
+
+def test_structured_formatter_includes_extra_fields():
+    record = logging.makeLogRecord(
+        {"name": "emt", "levelname": "INFO", "msg": "emt arrivals fetched", "status": 200, "items": 3}
+    )
+
+    event = json.loads(StructuredFormatter().format(record))
+    text = StructuredFormatter(json_output=False).format(record)
+
+    assert event["msg"] == "emt arrivals fetched"
+    assert event["status"] == 200
+    assert event["items"] == 3
+    assert text.endswith("emt arrivals fetched status=200 items=3")
+
+
+def test_records_are_written_by_the_queue_listener(restore_root_logger):
+    stream = io.StringIO()
+    listener = configure_logging(build_settings(), stream)
+    try:
+        logging.getLogger("emt").info("emt arrivals fetched", extra={"stop": "72", "latency_ms": 12.5})
+    finally:
+        listener.stop()
+
+    event = json.loads(stream.getvalue().strip())
+    assert event["logger"] == "emt"
+    assert event["stop"] == "72"
+    assert event["latency_ms"] == 12.5
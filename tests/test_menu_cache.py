@@ -0,0 +1,163 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from domain.models.daily_menu import DailyMenu
+from domain.models.menu_image import MenuImage
+from infrastructure.cache.memory_backend import MemoryCacheBackend
+from infrastructure.repositories.menu_repository_cached import CachedMenuRepository
+from services.menu_service import MenuService
+from services.shared_cache import SharedCache
+
+SETTINGS = SimpleNamespace(
+    MENU_CACHE_TTL_SECONDS=300,
+    CACHE_KEY_PREFIX="test:",
+    CACHE_LOCK_TTL_SECONDS=5.0,
+    CACHE_LOCK_WAIT_SECONDS=1.0,
+)
+
+
+class StubMenuRepo:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.menu: DailyMenu | None = None
+        self.image: MenuImage | None = None
+        self.reads = 0
+        self.active_reads = 0
+        self.max_active_reads = 0
+
+    async def _read(self, value):
+        self.reads += 1
+        self.active_reads += 1
+        self.max_active_reads = max(self.max_active_reads, self.active_reads)
+        await asyncio.sleep(self.delay)
+        self.active_reads -= 1
+        return value
+
+    async def get_menu_for_date(self, tenant_id: str, date_str: str):
+        return await self._read(self.menu)
+
+    async def get_active_image(self, tenant_id: str):
+        return await self._read(self.image)
+
+    async def upsert_menu(self, tenant_id, date_str, title, text_raw, sections, published_at):
+        now = datetime.now(timezone.utc)
+        self.menu = DailyMenu(
+            id="menu-1",
+            tenant_id=tenant_id,
+            valid_for_date=date_str,
+            title=title,
+            sections=sections,
+            text_raw=text_raw,
+            published_at=published_at,
+            updated_at=now,
+        )
+        return self.menu
+
+    async def publish_menu(self, tenant_id, date_str):
+        self.menu = self.menu.model_copy(update={"published_at": datetime.now(timezone.utc)})
+        return self.menu
+
+    async def upsert_image(self, tenant_id, url, caption, variants=None, update_id=None):
+        self.image = MenuImage(
+            id="image-1",
+            tenant_id=tenant_id,
+            url=url,
+            caption=caption,
+            is_active=True,
+            created_at=datetime.now(timezone.utc),
+            variants=variants or [],
+        )
+        return self.image
+
+
+def build_service(inner: StubMenuRepo) -> tuple[MenuService, CachedMenuRepository]:
+    repo = CachedMenuRepository(inner, SharedCache(MemoryCacheBackend(), SETTINGS), SETTINGS)
+    return MenuService(repo, None), repo
+
+
+@pytest.mark.anyio
+async def test_reads_are_cached_including_missing_menus():
+    inner = StubMenuRepo()
+    service, _ = build_service(inner)
+
+    first = await service.get_menu_with_image("tenant-1", None)
+    second = await service.get_menu_with_image("tenant-1", None)
+
+    assert first == (None, None)
+    assert second == (None, None)
+    assert inner.reads == 2
+
+
+@pytest.mark.anyio
+async def test_writes_invalidate_cached_reads():
+    inner = StubMenuRepo()
+    service, _ = build_service(inner)
+    await service.get_menu_with_image("tenant-1", None)
+
+    await service.update_menu_text("tenant-1", "Lentejas", "Menu", None)
+    await service.update_featured_image("tenant-1", "https://img.test/a.jpg", None)
+    menu, image = await service.get_menu_with_image("tenant-1", None)
+    assert menu.text_raw == "Lentejas"
+    assert image.url == "https://img.test/a.jpg"
+
+    await service.publish_today("tenant-1", None)
+    menu, _ = await service.get_menu_with_image("tenant-1", None)
+    assert menu.published_at is not None
+    assert inner.reads == 5
+
+
+@pytest.mark.anyio
+async def test_writes_notify_subscribers():
+    inner = StubMenuRepo()
+    service, repo = build_service(inner)
+    changed = []
+    repo.subscribe(changed.append)
+
+    await service.update_menu_text("tenant-1", "Lentejas", "Menu", None)
+    await service.update_featured_image("tenant-2", "https://img.test/a.jpg", None)
+    await service.publish_today("tenant-1", None)
+
+    assert changed == ["tenant-1", "tenant-2", "tenant-1"]
+
+
+@pytest.mark.anyio
+async def test_evict_drops_only_the_tenant_entries():
+    inner = StubMenuRepo()
+    service, repo = build_service(inner)
+    await service.get_menu_with_image("tenant-1", None)
+    await service.get_menu_with_image("tenant-2", None)
+
+    await repo.evict("tenant-1")
+    await service.get_menu_with_image("tenant-1", None)
+    await service.get_menu_with_image("tenant-2", None)
+
+    assert inner.reads == 6
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("timezone_name", ["Pacific/Kiritimati", "Pacific/Pago_Pago"])
+async def test_evict_reaches_today_in_any_timezone_without_a_prefix_scan(timezone_name, monkeypatch):
+    inner = StubMenuRepo()
+    service, repo = build_service(inner)
+    await service.get_menu_with_image("tenant-1", timezone_name)
+
+    async def no_scan(prefix):
+        raise AssertionError("evict must not scan by prefix")
+
+    monkeypatch.setattr(repo.shared_cache, "delete_prefix", no_scan)
+    await repo.evict("tenant-1")
+    await service.get_menu_with_image("tenant-1", timezone_name)
+
+    assert inner.reads == 4
+
+
+@pytest.mark.anyio
+async def test_cache_misses_read_menu_and_image_concurrently():
+    inner = StubMenuRepo(delay=0.05)
+    service, _ = build_service(inner)
+
+    await service.get_menu_with_image("tenant-1", None)
+
+    assert inner.max_active_reads == 2
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from infrastructure.clients.http_client import HttpClient
+from infrastructure.clients.openweather_client import OpenWeatherClient, OpenWeatherClientError
+from services.weather_service import WeatherService
+
+
+class StubSettings:
+    OPENWEATHER_API_KEY = "test-key"
+    OPENWEATHER_UNITS = "metric"
+    WEATHER_REFRESH_SECONDS = 600
+    WEATHER_REFRESH_LEAD_SECONDS = 0
+    WEATHER_CELL_SIZE_DEGREES = 0.01
+    WEATHER_CACHE_MAX_ENTRIES = 100
+    WEATHER_BATCH_MAX_CONCURRENCY = 2
+
+
+def weather_payload(lat: float, lon: float) -> dict:
+    return {
+        "coord": {"lon": lon, "lat": lat},
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "main": {
+            "temp": 20.0,
+            "feels_like": 19.5,
+            "temp_min": 18.0,
+            "temp_max": 22.0,
+            "humidity": 40,
+            "pressure": 1012,
+        },
+        "wind": {"speed": 2.0},
+        "dt": 1700000000,
+        "timezone": 3600,
+        "name": "Madrid",
+        "cod": 200,
+    }
+
+
+def build_service(stub_server) -> tuple[WeatherService, HttpClient]:
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    client = OpenWeatherClient(http_client, StubSettings())
+    return WeatherService(client, StubSettings()), http_client
+
+
+@pytest.mark.anyio
+async def test_get_weather_many_fetches_each_cell_once(stub_server):
+    def handler(method, path, query):
+        time.sleep(0.05)
+        return 200, {}, weather_payload(float(query["lat"]), float(query["lon"]))
+
+    stub_server.handler = handler
+    service, http_client = build_service(stub_server)
+    locations = {
+        (40.4001, -3.7001, "es"),
+        (40.4002, -3.7002, "es"),
+        (40.4201, -3.7001, "es"),
+        (40.4001, -3.7001, "en"),
+        (40.4301, -3.6801, "es"),
+    }
+
+    results = await service.get_weather_many(locations)
+
+    assert set(results) == locations
+    assert all(dto is not None and dto.temp_c == 20.0 for dto in results.values())
+    assert len(stub_server.requests) == 4
+    assert stub_server.max_in_flight <= StubSettings.WEATHER_BATCH_MAX_CONCURRENCY
+
+    await service.get_weather_many(locations)
+    assert len(stub_server.requests) == 4
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_get_current_weather_many_returns_errors_in_place(stub_server):
+    def handler(method, path, query):
+        if query["lat"] == "41.0":
+            return 503, {}, {"message": "unavailable"}
+        return 200, {}, weather_payload(float(query["lat"]), float(query["lon"]))
+
+    stub_server.handler = handler
+    http_client = HttpClient(base_url=stub_server.base_url, timeout_seconds=5)
+    client = OpenWeatherClient(http_client, StubSettings())
+
+    results = await client.get_current_weather_many(
+        [(40.0, -3.0, "es"), (41.0, -3.0, "es"), (42.0, -3.0, "es")], max_concurrency=2
+    )
+
+    assert not isinstance(results[0], OpenWeatherClientError)
+    assert isinstance(results[1], OpenWeatherClientError)
+    assert results[2].coord.lat == 42.0
+    assert all(query["appid"] == "test-key" for _, _, query in stub_server.requests)
+    await http_client.close()
+
+
+@pytest.mark.anyio
+async def test_refresh_due_marks_failed_cells_stale(stub_server):
+    failing = set()
+
+    def handler(method, path, query):
+        if query["lat"] in failing:
+            return 500, {}, {"message": "boom"}
+        return 200, {}, weather_payload(float(query["lat"]), float(query["lon"]))
+
+    stub_server.handler = handler
+    service, http_client = build_service(stub_server)
+    locations = {(40.4001, -3.7001, "es"), (40.4201, -3.7001, "es")}
+    await service.get_weather_many(locations)
+
+    for entry in service._cache.values():
+        entry.fetched_at -= StubSettings.WEATHER_REFRESH_SECONDS
+    failing.add(str(service.cell_center(service.cell_key(40.4201, -3.7001, "es"))[0]))
+
+    refreshed = await service.refresh_due()
+
+    assert refreshed == 1
+    stale_flags = {key[0]: entry.dto.stale for key, entry in service._cache.items()}
+    assert stale_flags == {4040: False, 4042: True}
+    await http_client.close()
@@ -0,0 +1,122 @@
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.responses import FastJSONResponse
+from domain.models.tenant_config import TenantConfig
+from schemas.api_schemas import ArrivalItem, ArrivalsResponse
+from schemas.emt_compact import EmtArrivals
+from services.arrivals_service import ArrivalsService
+from services.emt_madrid_service import ArrivalsCacheEntry
+
+ITEMS = 200
+ROUNDS = 200
+
+
+def build_payload() -> ArrivalsResponse:
+    return ArrivalsResponse(
+        updated_at=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+        items=[
+            ArrivalItem(
+                stop=str(1000 + index),
+                line=str(index % 40),
+                destination=f"Destination {index}",
+                eta_seconds=index * 15,
+                eta_minutes=max(1, index // 4),
+            )
+            for index in range(ITEMS)
+        ],
+    )
+
+
+def response_model_path(payload: ArrivalsResponse) -> bytes:
+    validated = ArrivalsResponse.model_validate(payload.model_dump())
+    content = jsonable_encoder(validated, by_alias=True)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def measure(render, payload) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        render(payload)
+    return time.perf_counter() - started
+
+
+def test_fast_response_matches_response_model_output():
+    payload = build_payload()
+
+    assert json.loads(FastJSONResponse(payload).body) == json.loads(response_model_path(payload))
+
+
+@pytest.mark.benchmark
+def test_arrivals_serialization_throughput():
+    payload = build_payload()
+    cached = FastJSONResponse(payload).body
+
+    baseline = measure(response_model_path, payload)
+    fast = measure(lambda model: FastJSONResponse(model).body, payload)
+    reused = measure(lambda _: FastJSONResponse(cached).body, payload)
+
+    assert fast < baseline
+    assert reused < fast
+
+
+class StubEmtService:
+    def __init__(self, entry: ArrivalsCacheEntry):
+        self.entry = entry
+
+    async def get_arrival_entry(self, stop_id: str, line_arrive: str) -> ArrivalsCacheEntry:
+        return self.entry
+
+
+@pytest.mark.anyio
+async def test_arrivals_payload_is_reused_until_entries_change():
+    response = EmtArrivals.from_payload(
+        {
+            "code": "00",
+            "description": "Success",
+            "datetime": "2024-01-01T12:00:00+00:00",
+            "data": [
+                {
+                    "Arrive": [
+                        {
+                            "line": "27",
+                            "stop": "100",
+                            "isHead": "N",
+                            "destination": "Plaza",
+                            "deviation": 0,
+                            "estimateArrive": 120,
+                        }
+                    ]
+                }
+            ],
+        }
+    )
+    entry = ArrivalsCacheEntry(response=response, fetched_at=1.0, updated_at=datetime.now(timezone.utc))
+    emt_service = StubEmtService(entry)
+    service = ArrivalsService(emt_service, SimpleNamespace(ARRIVALS_PAYLOAD_CACHE_MAX_ENTRIES=10))
+    config = TenantConfig(
+        tenant_id="tenant-1",
+        layout="horizontal",
+        refresh_seconds=10,
+        swap_seconds=10,
+        menu_mode="menuAndImage",
+        theme="purple",
+        board_header_text="Header",
+        stops=["100"],
+    )
+
+    first = await service.get_arrivals_payload(config)
+    second = await service.get_arrivals_payload(config)
+    emt_service.entry = ArrivalsCacheEntry(
+        response=response, fetched_at=2.0, updated_at=datetime.now(timezone.utc), stale=True
+    )
+    third = await service.get_arrivals_payload(config)
+
+    assert second is first
+    assert third is not first
+    assert json.loads(third)["stale"] is True
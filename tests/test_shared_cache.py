@@ -0,0 +1,236 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from infrastructure.cache.memory_backend import MemoryCacheBackend
+from schemas.api_schemas import ArrivalItem, ArrivalsResponse, WeatherWidgetDto
+from schemas.emt_compact import EmtArrivals
+from schemas.openweather_schemas import OpenWeatherResponse
+from services.emt_madrid_service import EmtMadridService
+from services.shared_cache import SharedCache
+from services.weather_service import WeatherService
+
+CACHE_SETTINGS = SimpleNamespace(
+    CACHE_KEY_PREFIX="test:",
+    CACHE_LOCK_TTL_SECONDS=5.0,
+    CACHE_LOCK_WAIT_SECONDS=2.0,
+)
+
+
+class StubOpenWeatherClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_current_weather_many(self, locations, max_concurrency: int):
+        self.calls += len(locations)
+        await asyncio.sleep(0.05)
+        return [
+            OpenWeatherResponse.model_validate(
+                {
+                    "coord": {"lon": lon, "lat": lat},
+                    "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+                    "main": {
+                        "temp": 21.0,
+                        "feels_like": 20.0,
+                        "temp_min": 19.0,
+                        "temp_max": 23.0,
+                        "humidity": 40,
+                        "pressure": 1012,
+                    },
+                    "dt": 1700000000,
+                    "timezone": 3600,
+                    "name": "Madrid",
+                    "cod": 200,
+                }
+            )
+            for lat, lon, _ in locations
+        ]
+
+
+class StubEmtService(EmtMadridService):
+    calls = 0
+
+    async def _fetch_arrival_bus(self, stop_id: str, line_arrive: str) -> EmtArrivals:
+        StubEmtService.calls += 1
+        await asyncio.sleep(0.05)
+        return EmtArrivals.from_payload(
+            {
+                "code": "00",
+                "description": "Success",
+                "datetime": datetime.now(timezone.utc).isoformat(),
+                "data": [
+                    {
+                        "Arrive": [
+                            {
+                                "line": "27",
+                                "stop": stop_id,
+                                "isHead": "N",
+                                "destination": "Plaza",
+                                "deviation": 0,
+                                "estimateArrive": 120,
+                            }
+                        ]
+                    }
+                ],
+            }
+        )
+
+
+def build_redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    from infrastructure.cache.redis_backend import RedisCacheBackend
+
+    return RedisCacheBackend(fakeredis.FakeAsyncRedis())
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryCacheBackend()
+    return build_redis_backend()
+
+
+@pytest.mark.anyio
+async def test_models_round_trip_through_the_backend(backend):
+    cache = SharedCache(backend, CACHE_SETTINGS)
+    weather = WeatherWidgetDto(
+        temp_c=17.5,
+        feels_like_c=16.0,
+        humidity_pct=60,
+        wind_mps=3.0,
+        description="clear sky",
+        icon_code="01d",
+        is_night=False,
+        updated_at=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+        stale=False,
+    )
+    arrivals = ArrivalsResponse(
+        updated_at=datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+        items=[ArrivalItem(stop="100", line="27", destination="Plaza", eta_seconds=90, eta_minutes=2)],
+    )
+
+    await cache.set("weather", weather.model_dump(mode="json"), ttl_seconds=60)
+    await cache.set("arrivals", arrivals.model_dump(mode="json"), ttl_seconds=60)
+    entries = await cache.get_many(["weather", "arrivals", "missing"])
+
+    assert WeatherWidgetDto.model_validate(entries["weather"].data) == weather
+    assert ArrivalsResponse.model_validate(entries["arrivals"].data) == arrivals
+    assert "missing" not in entries
+    await backend.close()
+
+
+@pytest.mark.anyio
+async def test_concurrent_workers_fetch_once(backend):
+    workers = [SharedCache(backend, CACHE_SETTINGS) for _ in range(4)]
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"value": 42}
+
+    entries = await asyncio.gather(
+        *[worker.get_or_fetch("key", fetch, ttl_seconds=60) for worker in workers]
+    )
+
+    assert calls == 1
+    assert all(entry.data == {"value": 42} for entry in entries)
+    await backend.close()
+
+
+@pytest.mark.anyio
+async def test_waiters_take_over_when_the_lock_holder_fails(backend):
+    first = SharedCache(backend, CACHE_SETTINGS)
+    second = SharedCache(backend, CACHE_SETTINGS)
+
+    async def failing_fetch():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    async def working_fetch():
+        return {"value": "ok"}
+
+    results = await asyncio.gather(
+        first.get_or_fetch("key", failing_fetch, ttl_seconds=60),
+        second.get_or_fetch("key", working_fetch, ttl_seconds=60),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1].data == {"value": "ok"}
+    await backend.close()
+
+
+@pytest.mark.anyio
+async def test_max_age_forces_a_refetch(backend):
+    cache = SharedCache(backend, CACHE_SETTINGS)
+    await cache.set("key", {"value": 1}, ttl_seconds=60)
+    await asyncio.sleep(0.02)
+
+    async def fetch():
+        return {"value": 2}
+
+    cached = await cache.get_or_fetch("key", fetch, ttl_seconds=60)
+    refreshed = await cache.get_or_fetch("key", fetch, ttl_seconds=60, max_age=0.01)
+
+    assert cached.data == {"value": 1}
+    assert refreshed.data == {"value": 2}
+    assert refreshed.fetched_at <= time.time()
+    await backend.close()
+
+
+@pytest.mark.anyio
+async def test_delete_prefix_only_removes_matching_keys(backend):
+    cache = SharedCache(backend, CACHE_SETTINGS)
+    await cache.set("tenant:code:ABC", {"value": 1}, ttl_seconds=60)
+    await cache.set("tenant:id:1", {"code": "ABC"}, ttl_seconds=60)
+    await cache.set("weather:1", {"value": 2}, ttl_seconds=60)
+
+    await cache.delete_prefix("tenant:")
+    entries = await cache.get_many(["tenant:code:ABC", "tenant:id:1", "weather:1"])
+
+    assert list(entries) == ["weather:1"]
+    await backend.close()
+
+
+@pytest.mark.anyio
+async def test_weather_workers_share_one_upstream_fetch():
+    backend = build_redis_backend()
+    client = StubOpenWeatherClient()
+    settings = SimpleNamespace(
+        WEATHER_REFRESH_SECONDS=600,
+        WEATHER_CELL_SIZE_DEGREES=0.01,
+        WEATHER_CACHE_MAX_ENTRIES=100,
+        WEATHER_BATCH_MAX_CONCURRENCY=2,
+    )
+    workers = [
+        WeatherService(client, settings, SharedCache(backend, CACHE_SETTINGS)) for _ in range(3)
+    ]
+    locations = {(40.4001, -3.7001, "es"), (40.4201, -3.7001, "es")}
+
+    results = await asyncio.gather(*[worker.get_weather_many(locations) for worker in workers])
+
+    assert client.calls == 2
+    assert all(dto.temp_c == 21.0 for result in results for dto in result.values())
+    await backend.close()
+
+
+@pytest.mark.anyio
+async def test_arrivals_workers_share_one_upstream_fetch():
+    backend = build_redis_backend()
+    settings = SimpleNamespace(EMT_ARRIVALS_CACHE_SECONDS=30, EMT_STALE_MAX_SECONDS=300)
+    StubEmtService.calls = 0
+    workers = [
+        StubEmtService(None, settings, SharedCache(backend, CACHE_SETTINGS)) for _ in range(3)
+    ]
+
+    entries = await asyncio.gather(*[worker.get_arrival_entry("100", "0") for worker in workers])
+
+    assert StubEmtService.calls == 1
+    assert {entry.response.arrivals[0].estimate_arrive for entry in entries} == {120}
+    assert len({entry.updated_at for entry in entries}) == 1
+    await backend.close()
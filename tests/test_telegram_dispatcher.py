@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from infrastructure.clients.retry_policy import RetryPolicy
+from schemas.telegram_schemas import TelegramUpdate
+from services.telegram_dispatcher import TelegramDispatcher
+from services.telegram_service import TelegramService
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay_seconds=0.01, max_delay_seconds=0.02)
+
+
+def build_update(update_id: int, chat_id: int, text: str = "hi") -> TelegramUpdate:
+    return TelegramUpdate.model_validate(
+        {
+            "update_id": update_id,
+            "message": {"message_id": update_id, "chat": {"id": chat_id}, "text": text},
+        }
+    )
+
+
+async def wait_until_idle(dispatcher: TelegramDispatcher) -> None:
+    while dispatcher.busy:
+        await dispatcher.wait_for_progress(dispatcher.completed, 1.0)
+
+
+@pytest.mark.anyio
+async def test_chats_run_concurrently_but_stay_ordered():
+    events: list[tuple[str, int]] = []
+
+    async def handle(update: TelegramUpdate) -> None:
+        events.append(("start", update.update_id))
+        await asyncio.sleep(0.2 if update.update_id == 1 else 0.01)
+        events.append(("end", update.update_id))
+
+    dispatcher = TelegramDispatcher(handle, max_workers=4, retry_policy=FAST_RETRY)
+    for update_id, chat_id in [(1, 100), (2, 100), (3, 200), (4, 200)]:
+        dispatcher.submit(build_update(update_id, chat_id))
+
+    await asyncio.sleep(0.1)
+    assert ("end", 3) in events and ("end", 4) in events
+    assert ("start", 2) not in events
+    assert dispatcher.next_offset == 1
+
+    await wait_until_idle(dispatcher)
+    assert events.index(("end", 1)) < events.index(("start", 2))
+    assert dispatcher.next_offset == 5
+
+
+@pytest.mark.anyio
+async def test_worker_pool_bounds_concurrency_and_duplicates_are_skipped():
+    running = 0
+    peak = 0
+    calls: list[int] = []
+
+    async def handle(update: TelegramUpdate) -> None:
+        nonlocal running, peak
+        calls.append(update.update_id)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    dispatcher = TelegramDispatcher(handle, max_workers=2, retry_policy=FAST_RETRY)
+    updates = [build_update(update_id, chat_id=update_id) for update_id in range(10, 16)]
+    assert all(dispatcher.submit(update) for update in updates)
+    assert not any(dispatcher.submit(update) for update in updates)
+
+    await wait_until_idle(dispatcher)
+    assert not dispatcher.submit(updates[0])
+    assert sorted(calls) == list(range(10, 16))
+    assert peak == 2
+
+
+@pytest.mark.anyio
+async def test_failed_updates_are_retried_then_dropped():
+    attempts: dict[int, int] = {}
+
+    async def handle(update: TelegramUpdate) -> None:
+        attempts[update.update_id] = attempts.get(update.update_id, 0) + 1
+        if update.update_id == 1 and attempts[1] < 3:
+            raise RuntimeError("flaky")
+        if update.update_id == 2:
+            raise RuntimeError("poison")
+
+    dispatcher = TelegramDispatcher(handle, max_workers=2, retry_policy=FAST_RETRY)
+    dispatcher.submit(build_update(1, 100))
+    dispatcher.submit(build_update(2, 200))
+
+    await wait_until_idle(dispatcher)
+    assert attempts == {1: 3, 2: 3}
+    assert (dispatcher.handled, dispatcher.dropped) == (1, 1)
+    assert dispatcher.next_offset == 3
+
+
+class FlakyTelegramClient:
+    def __init__(self, service_ref: list):
+        self.service_ref = service_ref
+        self.offsets: list[int] = []
+        self.failures = 2
+
+    async def get_updates(self, offset: int, timeout: int, allowed_updates: list[str]) -> list[dict]:
+        self.offsets.append(offset)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("network down")
+        if offset >= 3:
+            self.service_ref[0].stop_polling()
+            return []
+        return [
+            {"update_id": update_id, "message": {"message_id": update_id, "chat": {"id": 1}, "text": "x"}}
+            for update_id in range(offset or 1, 3)
+        ]
+
+
+@pytest.mark.anyio
+async def test_polling_survives_errors_and_acknowledges_after_handling():
+    handled: list[int] = []
+    settings = SimpleNamespace(
+        TELEGRAM_ALLOWED_UPDATE_TYPES="message",
+        TELEGRAM_MAX_IMAGE_MB=1,
+        TELEGRAM_POLL_TIMEOUT_SECONDS=1,
+        TELEGRAM_DISPATCH_WORKERS=2,
+        TELEGRAM_RETRY_MAX_ATTEMPTS=3,
+        TELEGRAM_RETRY_BASE_SECONDS=0.01,
+        TELEGRAM_RETRY_MAX_SECONDS=0.02,
+    )
+    service_ref: list = []
+    client = FlakyTelegramClient(service_ref)
+    service = TelegramService(client, None, None, None, settings, None)
+    service_ref.append(service)
+
+    async def handle_update(update: TelegramUpdate) -> None:
+        await asyncio.sleep(0.05)
+        handled.append(update.update_id)
+
+    service.handle_update = handle_update
+    await asyncio.wait_for(service.poll_updates(), timeout=5)
+
+    assert handled == [1, 2]
+    assert client.offsets[:3] == [0, 0, 0]
+    assert client.offsets[-1] == 3
+    assert all(offset <= 3 for offset in client.offsets)
@@ -0,0 +1,136 @@
+import hashlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from infrastructure.clients.telegram_client import TelegramClient
+from infrastructure.storage.atomic_file import write_stream_atomic
+from infrastructure.storage.local_storage import LocalUploadStorage
+from schemas.telegram_schemas import TelegramChat, TelegramMessage, TelegramPhotoSize
+from services.telegram_service import TelegramService
+from services.upload_service import UploadService
+
+MB = 1024 * 1024
+
+
+class RecordingTelegramClient(TelegramClient):
+    def __init__(self, api_url: str):
+        super().__init__("TOKEN", api_url=api_url)
+        self.sent: list[str] = []
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        self.sent.append(text)
+
+
+class StubTenantService:
+    async def get_tenant_by_id(self, tenant_id: str):
+        return SimpleNamespace(id=tenant_id, short_code="ABC123")
+
+
+class StubMenuService:
+    def __init__(self):
+        self.images: list[str] = []
+
+    async def update_featured_image(self, tenant_id, url, caption, variants=None, update_id=None) -> None:
+        self.images.append(url)
+
+
+def build_service(stub_server, uploads_dir: Path) -> tuple[TelegramService, RecordingTelegramClient, StubMenuService]:
+    client = RecordingTelegramClient(stub_server.base_url)
+    menu_service = StubMenuService()
+    settings = SimpleNamespace(
+        TELEGRAM_ALLOWED_UPDATE_TYPES="message",
+        TELEGRAM_MAX_IMAGE_MB=1,
+        TELEGRAM_UPLOADS_DIR=str(uploads_dir),
+    )
+    upload_service = UploadService(LocalUploadStorage(uploads_dir, "/uploads"))
+    service = TelegramService(client, StubTenantService(), menu_service, None, settings, upload_service)
+    return service, client, menu_service
+
+
+def serve_file(stub_server, body: bytes, reported_size: int | None = None) -> None:
+    def handler(method, path, query):
+        if path.endswith("/getFile"):
+            result = {"file_path": "photos/file_1.jpg", "file_size": reported_size}
+            return 200, {}, {"ok": True, "result": result}
+        return 200, {"Content-Type": "image/jpeg"}, body
+
+    stub_server.handler = handler
+
+
+def photo_message(*sizes: int) -> TelegramMessage:
+    return TelegramMessage(
+        message_id=7,
+        chat=TelegramChat(id=1),
+        photo=[
+            TelegramPhotoSize(file_id=f"id-{index}", file_unique_id=f"u{index}", file_size=size)
+            for index, size in enumerate(sizes)
+        ],
+    )
+
+
+def downloads(stub_server) -> list[str]:
+    return [path for _, path, _ in stub_server.requests if path.startswith("/file/")]
+
+
+@pytest.mark.anyio
+async def test_photo_is_streamed_to_uploads(stub_server, tmp_path):
+    body = b"\xff\xd8" + b"x" * 300_000
+    serve_file(stub_server, body, len(body))
+    service, client, menu_service = build_service(stub_server, tmp_path)
+
+    await service._handle_photo(1, photo_message(20_000, len(body)), SimpleNamespace(tenant_id="t1"))
+
+    digest = hashlib.sha256(body).hexdigest()
+    stored = tmp_path / "images" / digest[:2] / f"{digest}.jpg"
+    assert stored.read_bytes() == body
+    assert menu_service.images == [f"/uploads/images/{digest[:2]}/{digest}.jpg"]
+    assert list(stored.parent.iterdir()) == [stored]
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_reported_file_size_skips_oversized_variants(stub_server, tmp_path):
+    serve_file(stub_server, b"small", 5)
+    service, client, menu_service = build_service(stub_server, tmp_path)
+
+    await service._handle_photo(1, photo_message(80_000, 3 * MB), SimpleNamespace(tenant_id="t1"))
+    digest = hashlib.sha256(b"small").hexdigest()
+    assert menu_service.images == [f"/uploads/images/{digest[:2]}/{digest}.jpg"]
+
+    stub_server.requests.clear()
+    await service._handle_photo(1, photo_message(2 * MB, 3 * MB), SimpleNamespace(tenant_id="t1"))
+    assert stub_server.requests == []
+    assert client.sent[-1] == "Image too large."
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_download_stops_when_content_exceeds_the_limit(stub_server, tmp_path):
+    serve_file(stub_server, b"x" * (2 * MB))
+    service, client, menu_service = build_service(stub_server, tmp_path)
+
+    await service._handle_photo(1, photo_message(None), SimpleNamespace(tenant_id="t1"))
+
+    assert downloads(stub_server) == ["/file/botTOKEN/photos/file_1.jpg"]
+    assert client.sent == ["Image too large."]
+    assert menu_service.images == []
+    assert list(tmp_path.iterdir()) == []
+    await client.close()
+
+
+@pytest.mark.anyio
+async def test_failed_stream_leaves_no_partial_file(tmp_path):
+    destination = tmp_path / "photo.jpg"
+    destination.write_bytes(b"previous")
+
+    async def chunks():
+        yield b"partial"
+        raise ConnectionError("dropped")
+
+    with pytest.raises(ConnectionError):
+        await write_stream_atomic(chunks(), destination)
+
+    assert destination.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [destination]
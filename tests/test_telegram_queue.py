@@ -0,0 +1,216 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.dependencies import get_settings, get_telegram_update_queue
+from app.main import create_app
+from domain.models.telegram_update_job import TelegramUpdateJob
+from schemas.telegram_schemas import TelegramUpdate
+from services.telegram_service import TelegramService
+from services.telegram_update_worker import TelegramUpdateWorker
+
+
+class MemoryUpdateQueue:
+    def __init__(self):
+        self.jobs: dict[int, TelegramUpdateJob] = {}
+        self.errors: dict[int, str] = {}
+        self.effects: dict[int, set[str]] = {}
+
+    async def enqueue(self, update_id: int, payload: dict) -> bool:
+        if update_id in self.jobs:
+            return False
+        self.jobs[update_id] = TelegramUpdateJob(
+            update_id=update_id,
+            payload=payload,
+            status="pending",
+            attempts=0,
+            created_at=datetime.now(timezone.utc),
+        )
+        return True
+
+    async def claim(self, lease_seconds: float, max_attempts: int) -> TelegramUpdateJob | None:
+        now = datetime.now(timezone.utc)
+        for update_id in sorted(self.jobs):
+            job = self.jobs[update_id]
+            expired = job.status == "processing" and job.lease_until < now
+            if expired and job.attempts >= max_attempts:
+                await self.fail(update_id, "lease expired")
+                continue
+            if job.status == "pending" or expired:
+                job.status = "processing"
+                job.attempts += 1
+                job.lease_until = now + timedelta(seconds=lease_seconds)
+                return job
+        return None
+
+    async def extend(self, update_ids: list[int], lease_seconds: float) -> None:
+        lease_until = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+        for update_id in update_ids:
+            if self.jobs[update_id].status == "processing":
+                self.jobs[update_id].lease_until = lease_until
+
+    async def has_effect(self, update_id: int, effect: str) -> bool:
+        return effect in self.effects.get(update_id, set())
+
+    async def record_effect(self, update_id: int, effect: str) -> None:
+        self.effects.setdefault(update_id, set()).add(effect)
+
+    async def complete(self, update_id: int) -> None:
+        self.jobs[update_id].status = "done"
+
+    async def fail(self, update_id: int, error: str) -> None:
+        self.jobs[update_id].status = "failed"
+        self.errors[update_id] = error
+
+    def statuses(self) -> dict[int, str]:
+        return {update_id: job.status for update_id, job in self.jobs.items()}
+
+
+def update_payload(update_id: int, chat_id: int, text: str = "menu") -> dict:
+    return {
+        "update_id": update_id,
+        "message": {"message_id": update_id, "chat": {"id": chat_id}, "text": text},
+    }
+
+
+def build_settings(**overrides) -> SimpleNamespace:
+    values = dict(
+        TELEGRAM_WEBHOOK_SECRET="secret",
+        TELEGRAM_ALLOWED_UPDATE_TYPES="message",
+        TELEGRAM_MAX_IMAGE_MB=1,
+        TELEGRAM_DISPATCH_WORKERS=2,
+        TELEGRAM_RETRY_MAX_ATTEMPTS=2,
+        TELEGRAM_RETRY_BASE_SECONDS=0.01,
+        TELEGRAM_RETRY_MAX_SECONDS=0.02,
+        TELEGRAM_QUEUE_POLL_SECONDS=0.02,
+        TELEGRAM_QUEUE_LEASE_SECONDS=60,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+async def wait_until_finished(queue: MemoryUpdateQueue) -> None:
+    for _ in range(100):
+        if all(status in ("done", "failed") for status in queue.statuses().values()):
+            return
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.anyio
+async def test_webhook_enqueues_once_and_acknowledges_immediately():
+    queue = MemoryUpdateQueue()
+    app = create_app()
+    app.dependency_overrides[get_settings] = lambda: build_settings()
+    app.dependency_overrides[get_telegram_update_queue] = lambda: queue
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/api/telegram/webhook/secret", json=update_payload(10, 1))
+        retry = await client.post("/api/telegram/webhook/secret", json=update_payload(10, 1))
+        invalid = await client.post("/api/telegram/webhook/secret", json={"message": {}})
+        unauthorized = await client.post("/api/telegram/webhook/wrong", json=update_payload(11, 1))
+
+    assert (first.status_code, retry.status_code) == (200, 200)
+    assert first.json() == {"ok": True}
+    assert invalid.status_code == 400
+    assert unauthorized.status_code == 401
+    assert queue.statuses() == {10: "pending"}
+
+
+class RecordingTelegramService:
+    def __init__(self):
+        self.handled: list[int] = []
+        self.attempts: dict[int, int] = {}
+
+    async def handle_update(self, update) -> None:
+        self.attempts[update.update_id] = self.attempts.get(update.update_id, 0) + 1
+        if update.message.text == "poison":
+            raise RuntimeError("cannot handle")
+        await asyncio.sleep(0.05 if update.update_id == 1 else 0.01)
+        self.handled.append(update.update_id)
+
+
+@pytest.mark.anyio
+async def test_worker_drains_queue_in_chat_order_and_records_failures():
+    queue = MemoryUpdateQueue()
+    for update_id, chat_id, text in [(1, 100, "a"), (2, 200, "b"), (3, 100, "c"), (4, 300, "poison")]:
+        await queue.enqueue(update_id, update_payload(update_id, chat_id, text))
+    await queue.enqueue(5, {"update_id": 5, "message": {"chat": "broken"}})
+    service = RecordingTelegramService()
+    worker = TelegramUpdateWorker(queue, service, build_settings())
+
+    task = asyncio.create_task(worker.run())
+    await wait_until_finished(queue)
+    worker.stop()
+    await task
+
+    assert queue.statuses() == {1: "done", 2: "done", 3: "done", 4: "failed", 5: "failed"}
+    assert service.handled.index(1) < service.handled.index(3)
+    assert service.handled.index(2) < service.handled.index(1)
+    assert service.attempts[4] == 2
+    assert all(job.attempts == 1 for job in queue.jobs.values())
+
+
+@pytest.mark.anyio
+async def test_leases_are_renewed_so_slow_updates_are_not_handled_twice():
+    queue = MemoryUpdateQueue()
+    await queue.enqueue(1, update_payload(1, 100))
+    handled: list[int] = []
+
+    class SlowTelegramService:
+        async def handle_update(self, update) -> None:
+            await asyncio.sleep(0.3)
+            handled.append(update.update_id)
+
+    settings = build_settings(TELEGRAM_QUEUE_LEASE_SECONDS=0.1)
+    workers = [TelegramUpdateWorker(queue, SlowTelegramService(), settings) for _ in range(2)]
+    tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    await wait_until_finished(queue)
+    for worker in workers:
+        worker.stop()
+    await asyncio.gather(*tasks)
+
+    assert handled == [1]
+    assert queue.jobs[1].attempts == 1
+    assert queue.statuses() == {1: "done"}
+
+
+@pytest.mark.anyio
+async def test_expired_jobs_are_failed_once_attempts_are_exhausted():
+    queue = MemoryUpdateQueue()
+    await queue.enqueue(1, update_payload(1, 100))
+    job = await queue.claim(lease_seconds=-1, max_attempts=2)
+    job.attempts = 2
+
+    assert await queue.claim(lease_seconds=60, max_attempts=2) is None
+    assert queue.statuses() == {1: "failed"}
+
+
+class RecordingClient:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        self.sent.append(text)
+
+
+class UnboundChats:
+    async def get_by_chat_id(self, chat_id: int):
+        return None
+
+
+@pytest.mark.anyio
+async def test_replies_are_sent_once_per_update():
+    queue = MemoryUpdateQueue()
+    client = RecordingClient()
+    service = TelegramService(client, None, None, UnboundChats(), build_settings(), None, queue)
+    update = TelegramUpdate.model_validate(update_payload(1, 100))
+    await queue.enqueue(1, update_payload(1, 100))
+
+    await service.handle_update(update)
+    await service.handle_update(update)
+
+    assert client.sent == ["Please link this chat with /link <TENANT_CODE> first."]
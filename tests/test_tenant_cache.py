@@ -0,0 +1,174 @@
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from domain.models.tenant import Tenant
+from domain.models.tenant_config import TenantConfig
+from infrastructure.cache.memory_backend import MemoryCacheBackend
+from services.shared_cache import SharedCache
+from services.tenant_cache import TenantCache
+from services.tenant_service import TenantService, evict_shared_tenant
+
+
+def build_tenant(tenant_id: str, code: str) -> Tenant:
+    now = datetime.now(timezone.utc)
+    return Tenant(
+        id=tenant_id,
+        name=f"Bar {code}",
+        short_code=code,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def build_config(tenant_id: str) -> TenantConfig:
+    return TenantConfig(
+        tenant_id=tenant_id,
+        layout="horizontal",
+        refresh_seconds=10,
+        swap_seconds=10,
+        menu_mode="menuAndImage",
+        theme="purple",
+        board_header_text="Header",
+        stops=["100"],
+    )
+
+
+class CountingRepo:
+    def __init__(self):
+        self.tenants = {
+            "ABC123": build_tenant("tenant-1", "ABC123"),
+            "XYZ789": build_tenant("tenant-2", "XYZ789"),
+        }
+        self.queries = 0
+
+    async def get_with_config_by_code(self, code: str):
+        self.queries += 1
+        tenant = self.tenants.get(code)
+        if not tenant:
+            return None, None
+        return tenant, build_config(tenant.id)
+
+    async def get_by_id(self, tenant_id: str):
+        self.queries += 1
+        return next((tenant for tenant in self.tenants.values() if tenant.id == tenant_id), None)
+
+    async def get_config(self, tenant_id: str):
+        self.queries += 1
+        return build_config(tenant_id)
+
+
+def build_service(repo, cache: TenantCache) -> TenantService:
+    return TenantService(repo, SimpleNamespace(), cache)
+
+
+@pytest.mark.anyio
+async def test_cache_serves_repeat_lookups_by_code_and_id():
+    repo = CountingRepo()
+    cache = TenantCache(max_entries=10, ttl_seconds=60)
+    service = build_service(repo, cache)
+
+    first = await service.get_tenant_and_config("ABC123")
+    second = await service.get_tenant_and_config("ABC123")
+    tenant = await service.get_tenant_by_id("tenant-1")
+    config = await service.get_config_for_tenant("tenant-1")
+
+    assert repo.queries == 1
+    assert first == second
+    assert tenant.short_code == "ABC123"
+    assert config.tenant_id == "tenant-1"
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.anyio
+async def test_invalidation_forces_reload():
+    repo = CountingRepo()
+    cache = TenantCache(max_entries=10, ttl_seconds=60)
+    service = build_service(repo, cache)
+
+    await service.get_tenant_and_config("ABC123")
+    cache.evict("tenant-1")
+    await service.get_tenant_and_config("ABC123")
+
+    assert repo.queries == 2
+
+
+@pytest.mark.anyio
+async def test_expired_entries_are_reloaded():
+    repo = CountingRepo()
+    service = build_service(repo, TenantCache(max_entries=10, ttl_seconds=0))
+
+    await service.get_tenant_and_config("ABC123")
+    await service.get_tenant_and_config("ABC123")
+
+    assert repo.queries == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TenantCache(max_entries=1, ttl_seconds=60)
+    cache.put(build_tenant("tenant-1", "ABC123"), build_config("tenant-1"))
+    cache.put(build_tenant("tenant-2", "XYZ789"), build_config("tenant-2"))
+
+    assert cache.get_by_code("ABC123") is None
+    assert cache.get_by_id("tenant-1") is None
+    assert cache.get_by_code("XYZ789").tenant.id == "tenant-2"
+    assert cache.stats()["entries"] == 1
+
+
+class MissingConfigRepo:
+    def __init__(self):
+        self.created: list[str] = []
+
+    async def get_with_config_by_code(self, code: str):
+        return build_tenant("tenant-1", code), None
+
+    async def create_default_config(self, tenant_id: str, defaults: dict):
+        self.created.append(tenant_id)
+        return build_config(tenant_id)
+
+
+@pytest.mark.anyio
+async def test_missing_config_is_created_once_per_load():
+    repo = MissingConfigRepo()
+    settings = SimpleNamespace(
+        DEFAULT_LAYOUT="horizontal",
+        DEFAULT_REFRESH_SECONDS=60,
+        DEFAULT_SWAP_SECONDS=30,
+        DEFAULT_THEME="purple",
+        DEFAULT_BOARD_HEADER_TEXT="Header",
+    )
+    service = TenantService(repo, settings, TenantCache(max_entries=10, ttl_seconds=60))
+
+    tenant, config = await service.get_tenant_and_config("ABC123")
+    await service.get_tenant_and_config("ABC123")
+
+    assert tenant.id == config.tenant_id
+    assert repo.created == ["tenant-1"]
+
+
+@pytest.mark.anyio
+async def test_shared_cache_serves_other_workers_until_evicted():
+    repo = CountingRepo()
+    settings = SimpleNamespace(
+        TENANT_CACHE_TTL_SECONDS=60,
+        CACHE_KEY_PREFIX="test:",
+        CACHE_LOCK_TTL_SECONDS=5.0,
+        CACHE_LOCK_WAIT_SECONDS=1.0,
+    )
+    shared_cache = SharedCache(MemoryCacheBackend(), settings)
+    workers = [
+        TenantService(repo, settings, TenantCache(max_entries=10, ttl_seconds=60), shared_cache)
+        for _ in range(2)
+    ]
+
+    first_tenant, first_config = await workers[0].get_tenant_and_config("ABC123")
+    second_tenant, second_config = await workers[1].get_tenant_and_config("ABC123")
+    assert repo.queries == 1
+    assert (first_tenant, first_config) == (second_tenant, second_config)
+
+    await evict_shared_tenant(shared_cache, "tenant-1")
+    workers[1].cache.evict("tenant-1")
+    await workers[1].get_tenant_and_config("ABC123")
+    assert repo.queries == 2
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 
 from domain.models.tenant_config import TenantConfig
@@ -7,19 +8,30 @@ from services.weather_service import WeatherService
 
 
 class StubSettings:
-    def __init__(self, refresh_seconds: int):
+    def __init__(self, refresh_seconds: int, max_entries: int = 100, lead_seconds: int = 0):
         self.WEATHER_REFRESH_SECONDS = refresh_seconds
+        self.WEATHER_REFRESH_LEAD_SECONDS = lead_seconds
+        self.WEATHER_CELL_SIZE_DEGREES = 0.01
+        self.WEATHER_CACHE_MAX_ENTRIES = max_entries
+        self.WEATHER_BATCH_MAX_CONCURRENCY = 2
 
 
 class StubOpenWeatherClient:
-    def __init__(self, response: OpenWeatherResponse):
+    def __init__(self, response: OpenWeatherResponse, delay: float = 0.0):
         self.response = response
+        self.delay = delay
         self.calls = 0
+        self.requested: list[tuple[float, float, str]] = []
 
     async def get_current_weather(self, lat: float, lon: float, lang: str) -> OpenWeatherResponse:
         self.calls += 1
+        self.requested.append((lat, lon, lang))
+        await asyncio.sleep(self.delay)
         return self.response
 
+    async def get_current_weather_many(self, locations, max_concurrency: int):
+        return [await self.get_current_weather(*location) for location in locations]
+
 
 class FlakyOpenWeatherClient:
     def __init__(self, response: OpenWeatherResponse):
@@ -32,6 +44,15 @@ class FlakyOpenWeatherClient:
             raise OpenWeatherClientError("boom")
         return self.response
 
+    async def get_current_weather_many(self, locations, max_concurrency: int):
+        results = []
+        for location in locations:
+            try:
+                results.append(await self.get_current_weather(*location))
+            except OpenWeatherClientError as exc:
+                results.append(exc)
+        return results
+
 
 def build_sample_response() -> OpenWeatherResponse:
     payload = {
@@ -58,7 +79,7 @@ def build_sample_response() -> OpenWeatherResponse:
     return OpenWeatherResponse.model_validate(payload)
 
 
-def build_sample_config() -> TenantConfig:
+def build_sample_config(lat: float = 40.4, lon: float = -3.7, lang: str = "es") -> TenantConfig:
     return TenantConfig(
         tenant_id="tenant-1",
         layout="horizontal",
@@ -68,9 +89,9 @@ def build_sample_config() -> TenantConfig:
         show_youtube=False,
         youtube_url=None,
         show_weather=True,
-        weather_lang="es",
-        weather_lat=40.4,
-        weather_lon=-3.7,
+        weather_lang=lang,
+        weather_lat=lat,
+        weather_lon=lon,
         theme="purple",
         board_header_text="Header",
         stops=["100"],
@@ -114,7 +135,72 @@ async def test_weather_stale_on_error():
 
     first = await service.get_weather("ABC123", config)
     second = await service.get_weather("ABC123", config)
+    await service.wait_for_background_refreshes()
+    third = await service.get_weather("ABC123", config)
+    await service.wait_for_background_refreshes()
 
-    assert client.calls == 2
+    assert client.calls == 3
     assert first.stale is False
-    assert second.stale is True
+    assert second.stale is False
+    assert third.stale is True
+
+
+@pytest.mark.anyio
+async def test_nearby_tenants_share_one_weather_cell():
+    client = StubOpenWeatherClient(build_sample_response(), delay=0.02)
+    service = WeatherService(client, StubSettings(refresh_seconds=600))
+
+    await asyncio.gather(
+        service.get_weather("ABC123", build_sample_config(lat=40.4161, lon=-3.7031)),
+        service.get_weather("DEF456", build_sample_config(lat=40.4169, lon=-3.7038)),
+        service.get_weather("GHI789", build_sample_config(lat=40.4163, lon=-3.7035)),
+    )
+    await service.get_weather("JKL012", build_sample_config(lat=40.4165, lon=-3.7032))
+
+    assert client.calls == 1
+    assert client.requested == [(40.415, -3.705, "es")]
+
+
+@pytest.mark.anyio
+async def test_weather_cells_are_split_by_language_and_bounded():
+    client = StubOpenWeatherClient(build_sample_response())
+    service = WeatherService(client, StubSettings(refresh_seconds=600, max_entries=2))
+
+    await service.get_weather("ABC123", build_sample_config(lang="es"))
+    await service.get_weather("ABC123", build_sample_config(lang="en"))
+    await service.get_weather("ABC123", build_sample_config(lat=41.4, lon=2.17))
+    assert client.calls == 3
+    assert len(service._cache) == 2
+
+    await service.get_weather("ABC123", build_sample_config(lang="es"))
+    assert client.calls == 4
+
+
+@pytest.mark.anyio
+async def test_expired_weather_is_served_while_revalidating():
+    client = StubOpenWeatherClient(build_sample_response(), delay=0.05)
+    service = WeatherService(client, StubSettings(refresh_seconds=0))
+    config = build_sample_config()
+
+    await service.get_weather("ABC123", config)
+    served = await asyncio.wait_for(service.get_weather("ABC123", config), timeout=0.01)
+    await service.get_weather("ABC123", config)
+    await service.wait_for_background_refreshes()
+
+    assert served.stale is False
+    assert client.calls == 2
+
+
+@pytest.mark.anyio
+async def test_refresh_due_only_refreshes_active_cells_near_expiry():
+    client = StubOpenWeatherClient(build_sample_response())
+    service = WeatherService(client, StubSettings(refresh_seconds=600, lead_seconds=600))
+
+    await service.get_weather("ABC123", build_sample_config())
+    refreshed = await service.refresh_due()
+    assert refreshed == 1
+    assert client.calls == 2
+
+    service.settings.WEATHER_REFRESH_LEAD_SECONDS = 0
+    assert await service.refresh_due() == 0
+    assert client.calls == 2
@@ -5,6 +5,7 @@ const state = {
   arrivals: new Map(),
   currentYoutubeEmbedSrc: null,
   weatherTimerId: null,
+  eventSource: null,
 };
 
 const appEl = document.getElementById("app");
@@ -162,12 +163,24 @@ function updateYoutubePanel() {
   }
 }
 
+const etagCache = new Map();
+
 async function fetchJson(url) {
-  const response = await fetch(url, { cache: "no-store" });
+  const cached = etagCache.get(url);
+  const headers = cached ? { "If-None-Match": cached.etag } : {};
+  const response = await fetch(url, { cache: "no-store", headers });
+  if (response.status === 304 && cached) {
+    return cached.data;
+  }
   if (!response.ok) {
     throw new Error(`Request failed: ${response.status}`);
   }
-  return await response.json();
+  const data = await response.json();
+  const etag = response.headers.get("ETag");
+  if (etag) {
+    etagCache.set(url, { etag, data });
+  }
+  return data;
 }
 
 async function fetchWeatherJson(url) {
@@ -449,11 +462,47 @@ function renderMenu(menu) {
   }
 }
 
+function screenWidth() {
+  return Math.round(window.screen.width * (window.devicePixelRatio || 1));
+}
+
 async function loadMenu(code) {
-  const menu = await fetchJson(`/api/tenants/${code}/menu`);
+  const menu = await fetchJson(`/api/tenants/${code}/menu?width=${screenWidth()}`);
   renderMenu(menu);
 }
 
+function openStream(code) {
+  if (!window.EventSource) {
+    return false;
+  }
+
+  const source = new EventSource(`/api/tenants/${code}/stream?width=${screenWidth()}`);
+  source.addEventListener("arrivals", (event) => {
+    const arrivals = JSON.parse(event.data);
+    updateArrivals(arrivals.items || []);
+  });
+  source.addEventListener("menu", (event) => {
+    renderMenu(JSON.parse(event.data));
+  });
+  source.addEventListener("weather", (event) => {
+    updateWeatherWidget(JSON.parse(event.data));
+  });
+  source.addEventListener("error", () => {
+    console.warn("Display stream interrupted, reconnecting.");
+  });
+  state.eventSource = source;
+  return true;
+}
+
+function startPolling(code, config) {
+  setInterval(() => loadArrivals(code), config.refreshSeconds * 1000);
+  setInterval(() => loadMenu(code), config.refreshSeconds * 1000);
+  if (config.showWeather) {
+    const refreshMs = (config.weatherRefreshSeconds || 600) * 1000;
+    state.weatherTimerId = setInterval(() => loadWeather(code), refreshMs);
+  }
+}
+
 function swapMenuView() {
   if (!state.config || state.config.showYoutube || state.config.menuMode !== "menuAndImage") {
     menuViewEl.classList.add("is-active");
@@ -486,21 +535,18 @@ async function init() {
 
   try {
     const config = await loadConfig(code);
-    await Promise.all([loadArrivals(code), loadMenu(code)]);
     updateClock();
-    if (config.showWeather) {
-      await loadWeather(code);
+    if (!openStream(code)) {
+      await Promise.all([loadArrivals(code), loadMenu(code)]);
+      if (config.showWeather) {
+        await loadWeather(code);
+      }
+      startPolling(code, config);
     }
 
     setInterval(() => updateClock(), 1000 * 30);
-    setInterval(() => loadArrivals(code), config.refreshSeconds * 1000);
-    setInterval(() => loadMenu(code), config.refreshSeconds * 1000);
     setInterval(() => swapMenuView(), config.swapSeconds * 1000);
     setInterval(() => tickEtaCountdown(), 1000 * 10);
-    if (config.showWeather) {
-      const refreshMs = (config.weatherRefreshSeconds || 600) * 1000;
-      state.weatherTimerId = setInterval(() => loadWeather(code), refreshMs);
-    }
   } catch (error) {
     menuTextEl.textContent = "Failed to load tenant data.";
   }